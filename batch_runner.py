@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+
+# RUNNING THIS SCRIPT:
+
+# python batch_runner.py <sweepFile> [<gurobiThreads>] [<numWorkers>]
+
+# sweepFile: A CSV file that describes the runs of main.py we want.  Each row has the same inputs as main.py:
+#		problemName, vehicleFileID, cutoffTime, problemType, numUAVs, numTrucks, requireTruckAtDepot, requireDriver, Etype, ITER [, TSPtype [, P3type]]
+#	Each field may hold several values (separated by spaces), and problemName may be * (every problem in the Problems directory).
+#	Every combination of the values in a row is one job.  Lines that start with % are comments.  For example:
+#		% Heuristic, every problem, 1-4 UAVs, nonlinear and constant endurance:
+#		*, 101, 5, 2, 1 2 3 4, -1, 1, 1, 1 3, 1
+# gurobiThreads: (Optional) Number of threads each Gurobi model may use (default 1)
+# numWorkers: (Optional) Number of worker processes (default:  the number of cores / gurobiThreads)
+
+
+# The jobs are run by a pool of worker processes.  Each worker imports the solvers once, and runs
+# its jobs with missionControl (in main.py).  Each worker keeps the last few problems (with the same
+# vehicleFileID and numUAVs) it read in memory, so it doesn't read and build them again.
+# The jobs are sent to the workers one at a time, as each worker becomes free, so a sweep over a single
+# problem still uses every worker.  The jobs are sorted by problem, so a worker usually gets several jobs
+# on the same problem in a row (and the workers that read a problem for the first time usually just load
+# its instance file, see instance_file.py).
+#
+# Every job writes its results to performance_summary.csv and its solution file (just like main.py),
+# but the workers share a lock, so their lines don't get mixed up.
+#
+# Jobs that already appear in performance_summary.csv (with the same inputs) are skipped, so a batch
+# that crashed (or was stopped) can be resumed by running it again.
+
+import sys
+import os
+import time
+import itertools
+import multiprocessing
+import traceback
+from collections import OrderedDict
+
+from parseCSVstring import *
+from gurobipy import *
+
+import solve_mfstsp_heuristic
+from main import *
+
+
+# Each worker keeps (at most) this many problems in memory:
+BATCH_INSTANCE_CACHE_SIZE = 4
+
+
+def listProblems():
+	# Names of all of the problems in the Problems directory
+	problemNames = []
+	for problemName in sorted(os.listdir('Problems')):
+		if (os.path.isfile('Problems/%s/tbl_locations.csv' % (problemName))):
+			problemNames.append(problemName)
+
+	return problemNames
+
+
+def readSweep(sweepFile):
+	# Returns the list of jobs in sweepFile.  Each job is an argv for missionControl (['main.py', problemName, ...]).
+	jobs = []
+	rawData = parseCSVstring(sweepFile, returnJagged=True, fillerValue=-1, delimiter=',', commentChar='%')
+	for i in range(0,len(rawData)):
+		fields = [str(field).split() for field in rawData[i]]
+		if (len(fields) == 0) or (all([len(values) == 0 for values in fields])):
+			continue
+
+		if (fields[0] == ['*']):
+			fields[0] = listProblems()
+
+		for values in itertools.product(*fields):
+			argv = ['main.py'] + list(values)
+			if (parseArguments(argv) is None):
+				print('ERROR: Row %d of %s has %d inputs.' % (i+1, sweepFile, len(argv)-1))
+				quit()
+			jobs.append(argv)
+
+	return jobs
+
+
+def finishedRuns(summaryFile='performance_summary.csv'):
+	# The inputs of every run in summaryFile (from its runString column)
+	runs = set()
+	if (not os.path.isfile(summaryFile)):
+		return runs
+
+	rawData = parseCSVstring(summaryFile, returnJagged=True, fillerValue=-1, delimiter=',', commentChar='%')
+	for i in range(0,len(rawData)):
+		if (len(rawData[i]) < 12):
+			continue
+		try:
+			inputs = parseArguments(str(rawData[i][11]).split())
+		except ValueError:
+			# This is the header (or a line we can't read)
+			inputs = None
+		if (inputs is not None):
+			runs.add(tuple(inputs))
+
+	return runs
+
+
+# Each worker process has its own cache of problems, and shares the lock for the output files:
+batchWorker = {}
+
+def initBatchWorker(fileLock, gurobiThreads):
+	batchWorker['fileLock'] 		= fileLock
+	batchWorker['instanceCache'] 	= OrderedDict()
+
+	setParam('Threads', gurobiThreads)
+
+	# The pool's workers can't start their own processes:
+	solve_mfstsp_heuristic.LTL_PROCESSES = 1
+
+def runBatchJob(argv):
+	# Run one job in this worker.
+	# Returns [argv, runTime, errorMessage], where errorMessage is None if the job worked.
+	jobStartTime = time.time()
+	try:
+		missionControl(argv, batchWorker['instanceCache'], batchWorker['fileLock'])
+		errorMessage = None
+	except (Exception, SystemExit):
+		errorMessage = traceback.format_exc()
+
+	# Keep the most recently used problems:
+	inputs = parseArguments(argv)
+	instanceKey = (inputs[0], inputs[1], inputs[4])
+	if (instanceKey in batchWorker['instanceCache']):
+		batchWorker['instanceCache'].move_to_end(instanceKey)
+	while (len(batchWorker['instanceCache']) > BATCH_INSTANCE_CACHE_SIZE):
+		batchWorker['instanceCache'].popitem(last=False)
+
+	return (argv, time.time() - jobStartTime, errorMessage)
+
+
+def runBatch(sweepFile, gurobiThreads=1, numWorkers=None):
+	jobs = readSweep(sweepFile)
+
+	# Skip the jobs we've already done:
+	doneRuns = finishedRuns()
+	todo = []
+	for argv in jobs:
+		if (tuple(parseArguments(argv)) not in doneRuns):
+			todo.append(argv)
+	print('%d jobs (%d already in performance_summary.csv)' % (len(jobs), len(jobs) - len(todo)))
+
+	# Sort the jobs by problem (problemName, vehicleFileID, numUAVs), in the order the problems first appear:
+	groups = OrderedDict()
+	for argv in todo:
+		inputs = parseArguments(argv)
+		instanceKey = (inputs[0], inputs[1], inputs[4])
+		if (instanceKey not in groups):
+			groups[instanceKey] = []
+		groups[instanceKey].append(argv)
+	todo = [argv for instanceKey in groups for argv in groups[instanceKey]]
+
+	if (numWorkers is None):
+		numWorkers = max(1, multiprocessing.cpu_count() // gurobiThreads)
+
+	fileLock = multiprocessing.Lock()
+	pool = multiprocessing.Pool(numWorkers, initBatchWorker, (fileLock, gurobiThreads))
+
+	numDone = 0
+	numFailed = 0
+	for [argv, runTime, errorMessage] in pool.imap_unordered(runBatchJob, todo, chunksize=1):
+		numDone += 1
+		if (errorMessage is None):
+			print('[%d/%d] %s (%f seconds)' % (numDone, len(todo), ' '.join(argv), runTime))
+		else:
+			numFailed += 1
+			print('[%d/%d] FAILED: %s\n%s' % (numDone, len(todo), ' '.join(argv), errorMessage))
+
+	pool.close()
+	pool.join()
+
+	print('Batch is done:  %d jobs ran, %d failed.' % (numDone, numFailed))
+
+
+if __name__ == '__main__':
+	if (len(sys.argv) in [2, 3, 4]):
+		sweepFile = sys.argv[1]
+		if (len(sys.argv) >= 3):
+			gurobiThreads = int(sys.argv[2])
+		else:
+			gurobiThreads = 1
+		if (len(sys.argv) == 4):
+			numWorkers = int(sys.argv[3])
+		else:
+			numWorkers = None
+
+		runBatch(sweepFile, gurobiThreads, numWorkers)
+
+	else:
+		print('ERROR: You passed %d input parameters.' % (len(sys.argv)-1))
+		quit()
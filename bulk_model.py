@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+
+import numpy as np
+import scipy.sparse
+from gurobipy import *
+
+
+# This file contains helpers for building Gurobi models in bulk.
+#
+# Calling m.addVar() and m.addConstr() once per variable (or constraint) is slow for large models, since each call
+# builds Python objects (Var, LinExpr, TempConstr) that Gurobi then copies.  Instead:
+#	- bulkVars queues up the definition of each variable (in the order we want the variables to appear in the model),
+#	  and then creates all of them with a single call to m.addMVar().  Each variable is then stored in the (nested)
+#	  dictionary we would have stored it in had we called m.addVar() directly.
+#	- bulkRows queues up linear constraints as the rows of a sparse coefficient matrix (one column per variable of
+#	  the model), and then adds them with m.addMConstr().  A family of constraints can also be queued all at once,
+#	  as NumPy arrays in compressed sparse row (CSR) form.  The rows are added in the order they were queued, so the
+#	  model is the same as if we had called m.addConstr() for each row.
+#	  NOTE:  A row must not list the same variable twice.
+
+# bulkRows adds its queued rows to the model whenever it has queued this many nonzero coefficients
+# (so the queue doesn't take up too much memory for large models):
+BULK_ROWS_MAX_NONZEROS = 2000000
+
+
+class bulkVars:
+	def __init__(self):
+		self.reset()
+
+	def reset(self):
+		# Forget the queued variables
+		self.home 	= []	# home[n] = [dictionary, key], where variable n will be stored
+		self.lb 	= []
+		self.ub 	= []
+		self.obj 	= []
+		self.vtype 	= []
+		self.name 	= []
+
+	def add(self, home, key, lb=0.0, ub=GRB.INFINITY, obj=0.0, vtype=GRB.CONTINUOUS, name=""):
+		# Same arguments as m.addVar(), except that the new variable will be stored in home[key]
+		self.home.append([home, key])
+		self.lb.append(lb)
+		self.ub.append(ub)
+		self.obj.append(obj)
+		self.vtype.append(vtype)
+		self.name.append(name)
+
+	def create(self, m):
+		# Add all of the queued variables to model m:
+		newVars = m.addMVar(len(self.name), lb=np.array(self.lb, dtype=float), ub=np.array(self.ub, dtype=float), obj=np.array(self.obj, dtype=float), vtype=np.array(self.vtype), name=np.array(self.name)).tolist()
+
+		for n in range(0,len(self.name)):
+			[home, key] = self.home[n]
+			home[key] = newVars[n]
+
+		self.reset()
+
+
+class bulkRows:
+	def __init__(self, m, maxNonzeros=BULK_ROWS_MAX_NONZEROS):
+		# NOTE:  Call m.update() after adding the model's variables, and before queueing any rows.
+		self.m = m
+		self.numVars = m.NumVars
+		self.maxNonzeros = maxNonzeros
+		self.reset()
+
+	def reset(self):
+		# Forget the queued rows
+		self.blocks 		= []	# blocks[b] = [rowStart, columns, coefs] (NumPy arrays), for the rows queued before the current rows
+		self.numNonzeros 	= 0		# number of nonzeros in blocks
+		self.rowStart 		= [0]	# The current rows:  row r has coefficients coefs[rowStart[r]:rowStart[r+1]]
+		self.columns 		= []	# in columns columns[rowStart[r]:rowStart[r+1]]
+		self.coefs 			= []
+		self.sense 			= []	# sense, rhs, and name of every queued row (in blocks or not)
+		self.rhs 			= []
+		self.name 			= []
+
+	def add(self, coefs, variables, sense, rhs, name):
+		# Queue the row  sum_n coefs[n]*variables[n]  (sense)  rhs
+		self.columns.extend([var.index for var in variables])
+		self.coefs.extend(coefs)
+		self.rowStart.append(len(self.columns))
+		self.sense.append(sense)
+		self.rhs.append(rhs)
+		self.name.append(name)
+
+		if (self.numNonzeros + len(self.columns) >= self.maxNonzeros):
+			self.create()
+
+	def addRows(self, rowStart, columns, coefs, sense, rhs, names):
+		# Queue a block of rows in CSR form:  row r has coefficients coefs[rowStart[r]:rowStart[r+1]]
+		# in columns columns[rowStart[r]:rowStart[r+1]] (the column of a variable is var.index).
+		# Every row has the same sense.
+		self.endBlock()
+		self.blocks.append([np.asarray(rowStart, dtype=np.int64), np.asarray(columns, dtype=np.int64), np.asarray(coefs, dtype=float)])
+		self.numNonzeros += len(columns)
+		self.sense.extend([sense]*(len(rowStart)-1))
+		self.rhs.extend(rhs)
+		self.name.extend(names)
+
+		if (self.numNonzeros >= self.maxNonzeros):
+			self.create()
+
+	def endBlock(self):
+		# Move the current rows into a block of their own
+		if (len(self.rowStart) > 1):
+			self.blocks.append([np.array(self.rowStart, dtype=np.int64), np.array(self.columns, dtype=np.int64), np.array(self.coefs, dtype=float)])
+			self.numNonzeros += len(self.columns)
+			self.rowStart = [0]
+			self.columns = []
+			self.coefs = []
+
+	def create(self):
+		# Add all of the queued rows to the model, as one sparse matrix:
+		self.endBlock()
+		if (len(self.blocks) > 0):
+			rowStart = [np.zeros(1, dtype=np.int64)]
+			offset = 0
+			for [blockStart, columns, coefs] in self.blocks:
+				rowStart.append(blockStart[1:] + offset)
+				offset += len(columns)
+
+			A = scipy.sparse.csr_matrix((np.concatenate([coefs for [blockStart, columns, coefs] in self.blocks]), np.concatenate([columns for [blockStart, columns, coefs] in self.blocks]), np.concatenate(rowStart)), shape=(len(self.sense), self.numVars))
+			self.m.addMConstr(A, None, np.array(self.sense), np.array(self.rhs, dtype=float), self.name)
+
+		self.reset()
@@ -1,77 +1,130 @@
-from gurobipy import *
-
-def checkP2Feasibility(UAVPossibleCust, TSP, V, Pprime):
-
-	if len(UAVPossibleCust) == 0:
-		myStatus = 1
-		infeasibleUAVcust = []
-
-	else:
-		launch_points = {}
-		launch_uav_cust = {}
-
+#!/usr/bin/env python
+
+# This file checks whether Phase II can assign every UAV customer to a launch point on a truck tour.
+#
+# Customer j can be launched from truck node i if some UAV can fly i --> j --> k, where k follows i in the tour
+# ([i,k] in Pprime[v][j], see reachability_index.py).  Each launch point can launch at most |V| customers, and
+# each customer needs one launch point.  This is a bipartite (b-)matching problem, so rather than solving a MIP,
+# we find a maximum matching with augmenting paths:
+#	- The problem is feasible if every customer is matched.
+#	- Otherwise, the customers that can reach an unmatched customer by an alternating path share too few
+#	  launch points (|V| * |launch points| < |customers|).  We shrink this set to a minimal one, which is the set
+#	  of customers in an irreducible infeasible subsystem (IIS) of the MIP.
+#
+# p2FeasibilityChecker keeps the matching from its last check.  The heuristic checks many tours that differ
+# from each other by one or two nodes, so most of the old matching is still valid, and only the customers
+# that lost their launch points need new augmenting paths.
+
+
+from reachability_index import *
+
+
+class p2FeasibilityChecker:
+	def __init__(self, V, reach):
+		self.capacity = len(V)
+		self.reach = reach	# a reachabilityIndex
+		self.match = {}		# match[j] = launch point of customer j, in the last check
+
+	def check(self, UAVPossibleCust, TSP):
+		# Returns [myStatus, infeasibleUAVcust], where myStatus is 1 if every customer in UAVPossibleCust
+		# can be assigned a launch point on TSP (otherwise 0), and infeasibleUAVcust is a minimal set of
+		# customers that can't all be assigned.
+		if len(UAVPossibleCust) == 0:
+			return [1, []]
+
+		# Find the launch points of each customer (in the order of the tour):
+		launchPoints = {}
 		for j in UAVPossibleCust:
-			launch_points[j] = []
-
+			launchPoints[j] = []
 		for iii in range(0, len(TSP)-1):
 			i = TSP[iii]
-			launch_uav_cust[i] = []
-		
-		for j in UAVPossibleCust:
-
-			for iii in range(0, len(TSP)-1):
-				i = TSP[iii]
-				k = TSP[iii+1]
-
-				for v in V:
-
-					if ([i,k] in Pprime[v][j]):
-						if i not in launch_points[j]:
-							launch_points[j].append(i)
-						if j not in launch_uav_cust[i]:
-							launch_uav_cust[i].append(j)
-
-		m = Model("Check_Feas")
-
-		# Tell Gurobi not to print to a log file
-		m.params.OutputFlag = 0
-
-		x = {} #DecVar
+			for j in self.reach.customersOn(i, TSP[iii+1]):
+				if (j in launchPoints):
+					launchPoints[j].append(i)
 
-		for i in launch_uav_cust:
-			for j in launch_uav_cust[i]:
-				x[i,j] = m.addVar(lb=0, ub=1, obj=1, vtype=GRB.BINARY, name="x.%d.%d" % (i,j))
-
-		m.modelSense = GRB.MINIMIZE
-
-		m.params.SolutionLimit = 1
-
-		m.update()
-
-		for i in launch_uav_cust:
-			m.addConstr(quicksum(x[i,j] for j in launch_uav_cust[i]) <= len(V), name="Constr.1.%d.%d" % (i,j))
-
-		for j in launch_points:
-			m.addConstr(quicksum(x[i,j] for i in launch_points[j]) == 1, name="Constr.2.%d.%d" % (i,j))
-
-		m.optimize()
-
-		infeasibleUAVcust = []
-
-		if (m.Status == GRB.INFEASIBLE):
-			myStatus = 0
+		# A customer with no launch points is infeasible by itself:
+		for j in UAVPossibleCust:
+			if (len(launchPoints[j]) == 0):
+				return [0, [j]]
 
-			# print('The model is infeasible; computing IIS')
-			m.computeIIS()
+		# Start from the last matching (where it's still valid), and match the rest of the customers:
+		match = {}
+		assigned = {}		# assigned[i] = [customers launched from i]
+		for j in UAVPossibleCust:
+			i = self.match.get(j)
+			if (i is not None) and (i in launchPoints[j]) and (len(assigned.get(i, [])) < self.capacity):
+				match[j] = i
+				assigned.setdefault(i, []).append(j)
 
-			for q in m.getConstrs():
-				if q.IISConstr:
-					tmp = q.constrName.split('.')
-					if (tmp[1] == '2'):
-						j = int(tmp[3])
-						infeasibleUAVcust.append(j)
+		deficientSet = None
+		for j in UAVPossibleCust:
+			if (j not in match):
+				deficientSet = self.augment(j, launchPoints, match, assigned)
+				if (deficientSet is not None):
+					break
+
+		self.match = match
+
+		if (deficientSet is None):
+			return [1, []]
+
+		# Shrink the set of customers until removing any one of them would make it feasible:
+		for j in list(deficientSet):
+			if (j in deficientSet):
+				smallerSet = self.findDeficientSet([x for x in deficientSet if x != j], launchPoints)
+				if (smallerSet is not None):
+					deficientSet = smallerSet
+
+		infeasibleUAVcust = [j for j in UAVPossibleCust if j in deficientSet]
+
+		return [0, infeasibleUAVcust]
+
+	def augment(self, j, launchPoints, match, assigned):
+		# Look for an alternating path from customer j to a launch point with room for one more customer.
+		# If we find one, we update match and assigned and return None.
+		# Otherwise, we return the set of customers we reached (which can't all be matched).
+		reachedCust = [j]
+		isReached = set([j])
+		prevCust = {}		# prevCust[i] = customer we reached launch point i from
+		q = 0
+		while (q < len(reachedCust)):
+			x = reachedCust[q]
+			q += 1
+			for i in launchPoints[x]:
+				if (i in prevCust):
+					continue
+				prevCust[i] = x
+				if (len(assigned.get(i, [])) < self.capacity):
+					# Shift each customer on the path to the next launch point
+					while True:
+						x = prevCust[i]
+						oldI = match.get(x)
+						match[x] = i
+						assigned.setdefault(i, []).append(x)
+						if (oldI is None):
+							return None
+						assigned[oldI].remove(x)
+						i = oldI
+
+				for y in assigned[i]:
+					if (y not in isReached):
+						isReached.add(y)
+						reachedCust.append(y)
+
+		return isReached
+
+	def findDeficientSet(self, customers, launchPoints):
+		# Returns a set of customers (from customers) that can't all be matched, or None if they all can be.
+		match = {}
+		assigned = {}
+		for j in customers:
+			deficientSet = self.augment(j, launchPoints, match, assigned)
+			if (deficientSet is not None):
+				return deficientSet
+
+		return None
 
-		else:
-			myStatus = 1
 
-	return [myStatus, infeasibleUAVcust]
\ No newline at end of file
+def checkP2Feasibility(UAVPossibleCust, TSP, V, Pprime):
+	# Check one tour (without keeping a p2FeasibilityChecker)
+	return p2FeasibilityChecker(V, reachabilityIndex(V, Pprime)).check(UAVPossibleCust, TSP)
\ No newline at end of file
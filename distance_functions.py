@@ -4,6 +4,7 @@ from __future__ import division
 from math import *
 from collections import defaultdict
 import os
+import numpy as np
 
 
 # =================================================================
@@ -21,7 +22,7 @@ METERS_PER_MILE = 1609.34
 # =================================================================
 
 
-# This file contains a function for calculating UAV travel time.
+# This file contains functions for calculating UAV travel time.
 
 
 def calcMultirotorTravelTime(takeoffSpeed, cruiseSpeed, landSpeed, yawRateDeg, initAlt, flightAlt, goalAlt, initLatDeg, initLongDeg, goalLatDeg, goalLongDeg, initHeadingDeg, goalHeadingDeg):
@@ -185,3 +186,87 @@ def groundDistanceStraight(lat1, long1, lat2, long2):
 	distance = 2*radius_of_earth*asin( sqrt( pow(sin((lat2 - lat1)/2),2) + cos(lat1)*cos(lat2)*pow(sin((long2-long1)/2),2) ))
 
 	return (distance)
+
+
+
+def calcMultirotorTravelMatrix(takeoffSpeed, cruiseSpeed, landSpeed, yawRateDeg, altMeters, flightAlt, latDeg, lonDeg):
+
+	# Vectorized version of calcMultirotorTravelTime().
+	# Calculates the travel components for ALL (i,j) pairs of nodes at once.
+
+	# Example:
+	# calcMultirotorTravelMatrix(15.6464, 31.2928, 7.8232, 360.0, [0.0, 0.0], 50.0, [42.90, 42.92], [-78.87, -78.85])
+
+	# NOTES:
+	#	* altMeters, latDeg and lonDeg are vectors (one entry per node).  Node positions are
+	#	  used as the row/column indices of the returned matrices.
+	#	* This is equivalent to calling calcMultirotorTravelTime() with
+	#	  initHeadingDeg == goalHeadingDeg == -361 (which is how we always call it).
+	#	* Returns [takeoffTime, flyTime, landTime, totalTime, takeoffDistance, flyDistance, landDistance, totalDistance],
+	#	  where each element is an NxN numpy array.
+
+	# Convert units to radians:
+	yawRateRad = yawRateDeg*(pi/180)
+	latRad = np.asarray(latDeg, dtype=float)*(pi/180)
+	lonRad = np.asarray(lonDeg, dtype=float)*(pi/180)
+	alt = np.asarray(altMeters, dtype=float)
+
+	initLatRad = latRad[:, np.newaxis]
+	initLongRad = lonRad[:, np.newaxis]
+	goalLatRad = latRad[np.newaxis, :]
+	goalLongRad = lonRad[np.newaxis, :]
+
+	initAlt = np.repeat(alt[:, np.newaxis], len(alt), axis=1)
+	goalAlt = np.repeat(alt[np.newaxis, :], len(alt), axis=0)
+
+	# See if we're actually "close enough" to the destination.
+	# If so, the initial and goal lat/long values are treated as identical (and the ground distance is zero).
+	myDistance = groundDistanceMatrix(initLatRad, initLongRad, goalLatRad, goalLongRad)
+	samePosition = (myDistance <= DIST_TOL)
+	myDistance[samePosition] = 0.0
+
+	# Go ahead and treat the initial and goal altitudes to be identical, if they're close enough:
+	closeAlt = (np.abs(initAlt - goalAlt) <= ALT_TOL)
+	initAlt[closeAlt] = goalAlt[closeAlt]
+
+	# If our initial and goal locations are the same, we don't need any travel:
+	noTravel = samePosition & (initAlt == goalAlt)
+	moving = ~samePosition
+
+	# 1) Adjust altitude (e.g., Take off) -- only if our init/goal coordinates differ
+	deltaAltTakeoff = np.where(moving, np.abs(flightAlt - initAlt), 0.0)
+
+	# 2) Rotate towards target (yaw) -- we assume we'll have to turn 180-degrees (worst case)
+	yawTime = np.where(moving, pi/yawRateRad, 0.0)
+
+	# 5) Adjust altitude (e.g., Land)
+	#	 If we haven't reached the destination we'll change from flightAlt to goalAlt.
+	#	 Otherwise, initAlt describes the "current" altitude.
+	deltaAltLand = np.where(moving, np.abs(flightAlt - goalAlt), np.abs(initAlt - goalAlt))
+
+	# NOTE: The components are summed in the same order as in calcMultirotorTravelTime(),
+	#		so the results are identical to the scalar version.
+	takeoffTime = (0.0 + deltaAltTakeoff/takeoffSpeed) + yawTime
+	flyTime = 0.0 + myDistance/cruiseSpeed
+	landTime = (0.0 + 0.0) + deltaAltLand/landSpeed
+	totalTime = (((0.0 + deltaAltTakeoff/takeoffSpeed) + yawTime) + myDistance/cruiseSpeed + 0.0) + deltaAltLand/landSpeed
+
+	takeoffDistance = 0.0 + deltaAltTakeoff
+	flyDistance = 0.0 + myDistance
+	landDistance = 0.0 + deltaAltLand
+	totalDistance = ((0.0 + deltaAltTakeoff) + myDistance) + deltaAltLand
+
+	myMatrices = [takeoffTime, flyTime, landTime, totalTime, takeoffDistance, flyDistance, landDistance, totalDistance]
+	for myMatrix in myMatrices:
+		myMatrix[noTravel] = 0.0
+
+	return myMatrices
+
+
+def groundDistanceMatrix(lat1, long1, lat2, long2):
+	# Vectorized version of groundDistanceStraight().
+	# Inputs are numpy arrays (in [RADIANS]) that broadcast against each other.
+
+	distance = 2*radius_of_earth*np.arcsin( np.sqrt( np.power(np.sin((lat2 - lat1)/2),2) + np.cos(lat1)*np.cos(lat2)*np.power(np.sin((long2-long1)/2),2) ))
+
+	return (distance)
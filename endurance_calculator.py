@@ -1,5 +1,7 @@
 from collections import defaultdict
 import math
+import numpy as np
+import distance_functions
 
 def make_dict():
 	return defaultdict(make_dict)
@@ -126,4 +128,163 @@ def give_endurance(node, vehicle, travel, v, i, j, k, Etype):
 		exit()
 	
 	return endurance
-	# return 1200
\ No newline at end of file
+	# return 1200
+
+
+def give_linear_coefficients(q):
+
+	# Power [watts] = A*(payload [kg]) + B, for the linear endurance model (Etype 2):
+	if q == 31.2928:
+		A = 24.2368
+		B = 1391.9916
+
+	elif q == 15.6464:
+		A = 210.8011
+		B = 181.2141
+
+	else:
+		print("ERROR: Choose the right vehicle speed")
+		exit()
+
+	return [A, B]
+
+
+def give_fixed_endurance(E):
+
+	# Endurance [seconds] for the fixed endurance model (Etype 3):
+	fixedEndurance = {291094: 700, 562990: 1400, 457503: 350, 904033: 700}
+	if int(E) not in fixedEndurance:
+		print('ERROR: Sorry! No fixed endurance for a battery of %f joules.' % (E))
+		exit()
+
+	return fixedEndurance[int(E)]
+
+
+def give_endurance_tensor(node, vehicle, travel, v, nodeIDs, Etype):
+
+	# Calculates the endurance of vehicle v for every sortie at once.
+	# Returns a numpy array, where endurance[a][b][g] is the same value that
+	# give_endurance(node, vehicle, travel, v, nodeIDs[a], nodeIDs[b], nodeIDs[g], Etype) returns.
+	# NOTE:  Entries with repeated nodes (e.g., a == b) are calculated, but are not meaningful.
+	n = len(nodeIDs)
+	E = vehicle[v].batteryPower
+
+	if Etype in [3,4,5]:
+		# The endurance doesn't depend on the sortie:
+		if Etype == 3:	# Fixed endurance (time)
+			endurance = give_fixed_endurance(E)
+		else:	# Unlimited endurance in terms of time
+			endurance = 24*3600		# 1 Day
+
+		return np.full((n, n, n), endurance)
+
+	elif Etype not in [1,2]:
+		print('ERROR: Sorry! Wrong endurance type.')
+		exit()
+
+	p = vehicle[v].takeoffSpeed
+	q = vehicle[v].cruiseSpeed
+	r = vehicle[v].landingSpeed
+
+	# Takeoff/fly/land times between every pair of nodes (see travelMatrix in node_matrix.py):
+	myNodes = np.ix_(list(nodeIDs), list(nodeIDs))
+	TT = travel[v].takeoffTime[myNodes]
+	FT = travel[v].flyTime[myNodes]
+	LT = travel[v].landTime[myNodes]
+
+	s = np.array([node[j].serviceTimeUAV for j in nodeIDs])
+	m = [(node[j].parcelWtLbs)*0.453592 for j in nodeIDs]   # Weight in Kg
+
+	# minimum_time_required[i][j][k] (summed in the same order as give_endurance):
+	minimum_time_required = ((((TT + FT) + LT) + s[np.newaxis,:])[:,:,np.newaxis] + TT[np.newaxis,:,:]) + FT[np.newaxis,:,:]
+	minimum_time_required = minimum_time_required + LT[np.newaxis,:,:]
+
+	if Etype == 1:	# Non-linear endurance model
+		# The power drawn in each phase of the sortie only depends on the payload (and the speeds of v).
+		# The i->j leg carries the parcel of j, the j->k leg is empty.
+		# a) Takeoff from customer i, b) fly to customer j, c) land at customer j:
+		PaLoaded = np.array([Pi(Thrust(mj, 0), p) + Pp(Thrust(mj, 0)) for mj in m])
+		PbLoaded = np.array([Pi(Thrust(mj, q), 0) + Pp(Thrust(mj, q)) + Ppar(q) for mj in m])
+		PcLoaded = np.array([Pi(Thrust(mj, 0), r) + Pp(Thrust(mj, 0)) for mj in m])
+
+		# d) Takeoff from customer j, e) fly to customer k, f) land at customer k:
+		PdEmpty = Pi(Thrust(0, 0), p) + Pp(Thrust(0, 0))
+		PeEmpty = Pi(Thrust(0, q), 0) + Pp(Thrust(0, q)) + Ppar(q)
+		PfEmpty = Pi(Thrust(0, 0), r) + Pp(Thrust(0, 0))
+
+		Eabc = (TT*PaLoaded[np.newaxis,:] + FT*PbLoaded[np.newaxis,:]) + LT*PcLoaded[np.newaxis,:]
+		minimum_energy_required = ((Eabc[:,:,np.newaxis] + (TT*PdEmpty)[np.newaxis,:,:]) + (FT*PeEmpty)[np.newaxis,:,:]) + (LT*PfEmpty)[np.newaxis,:,:]
+
+		energy_left = E - minimum_energy_required
+
+		PHover = Pi(Thrust(0, 0), 0) + Pp(Thrust(0, 0))
+
+	else:	# Linear endurance model
+		[A, B] = give_linear_coefficients(q)
+
+		# Energy required to travel from i to j:
+		Eij = ((TT + FT) + LT)*np.array([A*mj + B for mj in m])[np.newaxis,:]
+
+		# Energy required to travel from j to k:
+		Ejk = ((TT + FT) + LT)*(A*0 + B)
+
+		energy_left = E - (Eij[:,:,np.newaxis] + Ejk[np.newaxis,:,:])
+
+		PHover = A*0 + B
+
+	return np.where(energy_left >= 0, minimum_time_required + energy_left/PHover, -1)
+
+
+def give_max_endurance(endurance, canCarry):
+
+	# Given endurance[i][j][k] from give_endurance_tensor(), returns maxEndurance[i][k],
+	# which is the largest endurance[i][j][k] over all customers j != i, k with canCarry[j] == True.
+	# maxEndurance[i][k] is 0 if there is no such j (or if all of them have negative endurance).
+	n = endurance.shape[0]
+	maskedEndurance = np.where(np.asarray(canCarry)[np.newaxis,:,np.newaxis], endurance, -np.inf)
+	idx = np.arange(n)
+	maskedEndurance[idx,idx,:] = -np.inf	# j == i
+	maskedEndurance[:,idx,idx] = -np.inf	# j == k
+
+	return np.maximum(maskedEndurance.max(axis=1), 0)
+
+
+def give_max_radius(node, vehicle, v, C, Etype):
+
+	# Returns an upper bound [meters] on the ground distance of either leg (i->j or j->k) of
+	# any feasible sortie of vehicle v, where j is a customer in C that v can carry.
+	# The bound only needs to be valid, not tight; sorties are still checked individually.
+	q = vehicle[v].cruiseSpeed
+	E = vehicle[v].batteryPower
+	m = [(node[j].parcelWtLbs)*0.453592 for j in C if node[j].parcelWtLbs <= vehicle[v].capacityLbs]
+
+	if Etype == 1:	# Non-linear endurance model
+		# A feasible sortie can't use more than E joules while flying at cruise speed, and
+		# the lightest load (an empty UAV) draws the least power.
+		PFly = min([Pi(Thrust(mj, q), 0) + Pp(Thrust(mj, q)) + Ppar(q) for mj in m + [0]])
+		maxRadius = q*E/PFly
+
+	elif Etype == 2:	# Linear endurance model
+		[A, B] = give_linear_coefficients(q)
+		maxRadius = q*E/min([A*mj + B for mj in m + [0]])
+
+	elif Etype == 3:	# Fixed endurance (time)
+		maxRadius = q*give_fixed_endurance(E)
+
+	elif Etype == 4:	# Unlimited endurance in terms of time
+		maxRadius = q*24*3600
+
+	elif Etype == 5:	# Fixed distance
+		if vehicle[v].flightRange == 'low':
+			maxRadius = 6*distance_functions.METERS_PER_MILE
+		elif vehicle[v].flightRange == 'high':
+			maxRadius = 12*distance_functions.METERS_PER_MILE
+		else:
+			maxRadius = 0
+
+	else:
+		print('ERROR: Sorry! Wrong endurance type.')
+		exit()
+
+	# Allow for rounding, and for nodes that are treated as co-located (see calcMultirotorTravelMatrix):
+	return max(maxRadius, 0)*(1 + 1e-6) + distance_functions.DIST_TOL
\ No newline at end of file
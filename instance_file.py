@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+import os
+import zipfile
+import numpy as np
+
+
+# This file reads and writes "instance files", which hold a problem after main.py has read
+# its CSV files and built its travel matrices, so later runs on the same problem can skip that work.
+#
+# An instance file is a NumPy .npz file (Problems/<problemName>/tbl_instance_<vehicleFileID>_<numUAVs>.npz)
+# that holds arrays of the node and vehicle data, the truck's travel time and distance matrices, and the
+# UAVs' travel matrices (see missionControl.packInstance() and missionControl.unpackInstance() in main.py).
+#
+# The file also stores the modification time and size of each CSV file it was built from.
+# If any of them changed (or the file was written by a different version of this code), the file is
+# ignored, and main.py rebuilds it from the CSV files.
+
+# Change this whenever the contents of instance files change:
+INSTANCE_FILE_VERSION = 1
+
+
+def instanceFileName(problemName, vehicleFileID, numUAVs):
+	return 'Problems/%s/tbl_instance_%d_%d.npz' % (problemName, vehicleFileID, numUAVs)
+
+
+def sourceStamps(sourceFiles):
+	# [[modification time (ns), size (bytes)], ...] for each file in sourceFiles, or None if one is missing
+	stamps = []
+	for filename in sourceFiles:
+		if (not os.path.isfile(filename)):
+			return None
+		fileInfo = os.stat(filename)
+		stamps.append([fileInfo.st_mtime_ns, fileInfo.st_size])
+
+	return np.array(stamps, dtype=np.int64)
+
+
+def readInstanceFile(filename, sourceFiles):
+	# Returns a dictionary of the arrays in filename, or None if there's no up-to-date instance file.
+	if (not os.path.isfile(filename)):
+		return None
+
+	stamps = sourceStamps(sourceFiles)
+	if (stamps is None):
+		return None
+
+	try:
+		with np.load(filename, allow_pickle=False) as myFile:
+			arrays = {}
+			for key in myFile.files:
+				arrays[key] = myFile[key]
+	except (OSError, ValueError, zipfile.BadZipFile):
+		# The file is damaged (e.g., a run was stopped while writing it)
+		return None
+
+	if (('version' not in arrays) or (int(arrays['version']) != INSTANCE_FILE_VERSION)):
+		return None
+	if (('sourceStamps' not in arrays) or (not np.array_equal(arrays['sourceStamps'], stamps))):
+		return None
+
+	return arrays
+
+
+def writeInstanceFile(filename, sourceFiles, arrays):
+	# Write arrays (a dictionary of NumPy arrays) to filename.
+	# We write to a temporary file first, so another run never reads a partially written file.
+	stamps = sourceStamps(sourceFiles)
+	if (stamps is None):
+		return
+
+	tmpFile = '%s.%d.tmp' % (filename, os.getpid())
+	myFile = open(tmpFile, 'wb')
+	np.savez(myFile, version=np.array(INSTANCE_FILE_VERSION), sourceStamps=stamps, **arrays)
+	myFile.close()
+	os.replace(tmpFile, filename)
@@ -1,34 +1,147 @@
+#!/usr/bin/env python
+
+# This file contains the local search that the heuristic runs after Phase III:  if the truck waits for a UAV
+# at a recovery node, we try to recover that UAV at the next node of the tour instead.
+#
+# localSearchState keeps the sorties (tmp_y) of one pass of the local search, so that each change is cheap:
+#	- position[i] is the position of node i in the truck tour (instead of calling TSPtour.index(i)),
+#	- the sorties are kept in a dictionary (in the order of tmp_y), so a sortie is shifted in O(1) time,
+#	- byVehicle[v] holds the sorties of UAV v, so swapping two UAVs only looks at their sorties,
+#	- availUAVs[i] (the UAVs on the truck when it leaves i) is built from each UAV's busy intervals in one pass.
+#
+# neighbourhoodMoves() is a larger neighbourhood over the same (fixed) truck tour.  Each move replaces one sortie
+# [v,i,j,k] whose UAV makes the truck wait at k with another sortie for the same customer:
+#	- recovery shift:			[v,i,j,k'], where k' is the node after k,
+#	- launch shift:				[v,i',j,k], where i' is the node before or after i,
+#	- UAV swap:					[v',i,j,k], with another UAV v' that is on the truck from i until k,
+#	- customer reassignment:	[v',i',j,k'], from any other arc (i',k') of the tour.
+# Only sorties in P are used (P leaves out the sorties that are too long for the UAV, even if eee doesn't).
+# The moves are scored with a quick estimate of how long the truck would wait (from the times of the last
+# Phase III solution), and only the best few are returned, so the caller re-solves Phase III for those alone
+# (one at a time, along with the shifts of local_search(), which move every UAV the truck waits for at once).
+# The caller only starts on these moves once the shifts of local_search() stop helping.
+
+
+class localSearchState:
+	def __init__(self, TSPtour, y, V):
+		self.tour = TSPtour
+		self.position = {}
+		for p in range(0,len(TSPtour)):
+			self.position[TSPtour[p]] = p
+
+		self.sorties = {}		# sorties[(v,i,j,k)] = order, for the sorties in tmp_y
+		self.byVehicle = {}		# byVehicle[v] = {(v,i,j,k), ...}
+		self.launchLoc = {}		# launchLoc[v,k] = launch node of the sortie of UAV v that lands at k
+		self.custLoc = {}		# custLoc[v,k] = customer of the sortie of UAV v that lands at k
+		self.numAdded = 0
+		for v in V:
+			self.byVehicle[v] = set()
+		for [v,i,j,k] in y:
+			self.add(v, i, j, k)
+			self.launchLoc[v,k] = i
+			self.custLoc[v,k] = j
+
+		# UAV v is away from the truck from the position of its launch node until the position before its recovery node:
+		numLeaving = {}
+		for v in V:
+			numLeaving[v] = [0]*len(TSPtour)
+		for [v,i,j,k] in y:
+			numLeaving[v][self.position[i]] += 1
+			numLeaving[v][self.position[k]] -= 1
+
+		self.availUAVs = {}
+		numAway = dict([(v, 0) for v in V])
+		for tmpIndex in range(0, len(TSPtour)-1):
+			for v in V:
+				numAway[v] += numLeaving[v][tmpIndex]
+			self.availUAVs[TSPtour[tmpIndex]] = [v for v in V if numAway[v] == 0]
+
+	def add(self, v, i, j, k):
+		# Add a sortie at the end of tmp_y
+		self.sorties[(v,i,j,k)] = self.numAdded
+		self.byVehicle.setdefault(v, set()).add((v,i,j,k))
+		self.numAdded += 1
+
+	def remove(self, v, i, j, k):
+		del self.sorties[(v,i,j,k)]
+		self.byVehicle[v].remove((v,i,j,k))
+
+	def shift(self, v, i, j, k, newK):
+		# UAV v now lands at newK (instead of k).  The sortie moves to the end of tmp_y.
+		self.remove(v, i, j, k)
+		self.add(v, i, j, newK)
+
+	def swapVehicles(self, tmpv, new_v, truckCust, launchesfrom, landsat, ls_checktprime):
+		# UAVs tmpv and new_v trade the sorties they launch from truckCust or later.
+		# The traded sorties move to the end of tmp_y (in the same order), and launchesfrom, landsat,
+		# and ls_checktprime are updated for them.
+		startPosition = self.position[truckCust]
+		traded = []
+		for [v,i,j,k] in list(self.byVehicle[tmpv]) + list(self.byVehicle[new_v]):
+			if (self.position[i] >= startPosition):
+				traded.append([v,i,j,k])
+		traded.sort(key=lambda sortie: self.sorties[tuple(sortie)])
+
+		launchesfrom_temp = {}
+		landsat_temp = {}
+		ls_checktprime_temp = {}
+		for [v,i,j,k] in traded:
+			if (v == tmpv):
+				other_v = new_v
+			else:
+				other_v = tmpv
+			self.remove(v, i, j, k)
+			launchesfrom[i].remove(v)
+			launchesfrom_temp.setdefault(i, []).append(other_v)
+			landsat[k].remove(v)
+			landsat_temp.setdefault(k, []).append(other_v)
+			ls_checktprime_temp[other_v,k] = ls_checktprime[v,k]
+			del ls_checktprime[v,k]
+
+		for [v,i,j,k] in traded:
+			if (v == tmpv):
+				other_v = new_v
+			else:
+				other_v = tmpv
+			self.add(other_v, i, j, k)
+			self.launchLoc[other_v,k] = i
+			self.custLoc[other_v,k] = j
+
+		for i in launchesfrom_temp:
+			launchesfrom[i] = launchesfrom[i] + launchesfrom_temp[i]
+		for k in landsat_temp:
+			landsat[k] = landsat[k] + landsat_temp[k]
+
+		for [v,k] in ls_checktprime_temp:
+			ls_checktprime[v,k] = ls_checktprime_temp[v,k]
+
+		# After truckCust, each UAV is available wherever the other one was:
+		for tmpIndex in range(startPosition+1, len(self.tour)-1):
+			i = self.tour[tmpIndex]
+			if (tmpv in self.availUAVs[i]) and (new_v not in self.availUAVs[i]):
+				self.availUAVs[i].append(new_v)
+				self.availUAVs[i].remove(tmpv)
+			elif (tmpv not in self.availUAVs[i]) and (new_v in self.availUAVs[i]):
+				self.availUAVs[i].append(tmpv)
+				self.availUAVs[i].remove(new_v)
+
+	def sortieList(self):
+		# tmp_y = [[v,i,j,k], ...]
+		return [list(sortie) for sortie in self.sorties]
+
+
 def local_search(x, y, c, waitingArray, landsat, launchesfrom, ls_checktprime, eee, tau, tauprime, sigma, sigmaprime, ls_checkt, ls_hatt, V, sL, sR):
 
 	tmpWaitingArray = {}
 	for i in waitingArray:
 		tmpWaitingArray[i] = float(waitingArray[i])
 
-	tmp_y = []
-	launchLoc = {}
-	custLoc = {}
-	for [v,i,j,k] in y:
-		tmp_y.append([v,i,j,k])
-		launchLoc[v,k] = i
-		custLoc[v,k] = j
-
 	TSPtour = []
 	for [i,j] in x:
 		TSPtour.append(i)
 	TSPtour.append(c+1)
 
-	availUAVs = {}
-
-	for tmpIndex in range(0, len(TSPtour)-1):
-		i_launch = TSPtour[tmpIndex]
-		availUAVs[i_launch] = list(V)
-
-		for [v,i,j,k] in y:
-			p = TSPtour.index(i)
-			q = TSPtour.index(k) - 1
-
-			if tmpIndex >= p and tmpIndex <= q:
-				availUAVs[i_launch].remove(v)
+	state = localSearchState(TSPtour, y, V)
 
 	shift_happened = False
 
@@ -51,9 +164,9 @@ def local_search(x, y, c, waitingArray, landsat, launchesfrom, ls_checktprime, e
 						tmp_waiting = ls_checktprime[v,truckCust]
 						tmpv_2 = v
 
-			tmpi = launchLoc[tmpv,truckCust]
-			tmpj = custLoc[tmpv,truckCust]
-			tmpk = TSPtour[TSPtour.index(truckCust)+1]
+			tmpi = state.launchLoc[tmpv,truckCust]
+			tmpj = state.custLoc[tmpv,truckCust]
+			tmpk = TSPtour[state.position[truckCust]+1]
 
 			if (tauprime[tmpv][tmpi][tmpj] + sigmaprime[tmpj] + tauprime[tmpv][tmpj][tmpk] <= eee[tmpv][tmpi][tmpj][tmpk]):
 				if len(landsat[truckCust]) > 1:
@@ -63,92 +176,113 @@ def local_search(x, y, c, waitingArray, landsat, launchesfrom, ls_checktprime, e
 
 				if truck_duration_from_i_to_k <= eee[tmpv][tmpi][tmpj][tmpk]:
 					if (tmpv not in launchesfrom[truckCust]):
-						tmp_y.remove([tmpv,tmpi,tmpj,truckCust])
-						tmp_y.append([tmpv,tmpi,tmpj,tmpk])
-						# del launchLoc[tmpv,truckCust]
-						# del custLoc[tmpv,truckCust]
-						# launchLoc[tmpv,tmpk] = tmpi
-						# custLoc[tmpv,tmpk] = tmpj
+						state.shift(tmpv, tmpi, tmpj, truckCust, tmpk)
 						if tmpk != c+1:
 							tmpWaitingArray[tmpk] -= sR[tmpv][tmpk]
 						shift_happened = True
 
-					elif (tmpv in launchesfrom[truckCust]) and (len(availUAVs[truckCust]) >= 1):
-						tmp_y.remove([tmpv,tmpi,tmpj,truckCust])
-						tmp_y.append([tmpv,tmpi,tmpj,tmpk])
-						# del launchLoc[tmpv,truckCust]
-						# del custLoc[tmpv,truckCust]
-						# launchLoc[tmpv,tmpk] = tmpi
-						# custLoc[tmpv,tmpk] = tmpj
+					elif (tmpv in launchesfrom[truckCust]) and (len(state.availUAVs[truckCust]) >= 1):
+						state.shift(tmpv, tmpi, tmpj, truckCust, tmpk)
 						if tmpk != c+1:
 							tmpWaitingArray[tmpk] -= sR[tmpv][tmpk]
 						shift_happened = True
 
-						tmp_again_y = []
-						for [v,i,j,k] in tmp_y:
-							tmp_again_y.append([v,i,j,k])
-
-						tmp_again_y_1 = []
-
-						launchesfrom_temp = {}
-						landsat_temp = {}
-						for i in launchesfrom:
-							launchesfrom_temp[i] = []
-							landsat_temp[i] = []
-
-						ls_checktprime_temp = {}
-
-						new_v = availUAVs[truckCust][0]
-
-						for [v,i,j,k] in tmp_y:
-							if (v == tmpv) and (TSPtour.index(i) >= TSPtour.index(truckCust)):
-								tmp_again_y.remove([v,i,j,k])
-								tmp_again_y_1.append([new_v,i,j,k])
-								launchesfrom[i].remove(v)
-								launchesfrom_temp[i].append(new_v)
-								landsat[k].remove(v)
-								landsat_temp[k].append(new_v)
-								ls_checktprime_temp[new_v,k] = ls_checktprime[v,k]
-								del ls_checktprime[v,k]
-
-							if (v == new_v) and (TSPtour.index(i) >= TSPtour.index(truckCust)):
-								tmp_again_y.remove([v,i,j,k])
-								tmp_again_y_1.append([tmpv,i,j,k])
-								launchesfrom[i].remove(v)
-								launchesfrom_temp[i].append(tmpv)
-								landsat[k].remove(v)
-								landsat_temp[k].append(tmpv)
-								ls_checktprime_temp[tmpv,k] = ls_checktprime[v,k]
-								del ls_checktprime[v,k]
-
-						tmp_y = []
-						launchLoc = {}
-						custLoc = {}
-						for [v,i,j,k] in tmp_again_y:
-							tmp_y.append([v,i,j,k])
-							launchLoc[v,k] = i
-							custLoc[v,k] = j
-						for [v,i,j,k] in tmp_again_y_1:
-							tmp_y.append([v,i,j,k])
-							launchLoc[v,k] = i
-							custLoc[v,k] = j
-
-						for i in launchesfrom_temp:
-							launchesfrom[i] = launchesfrom[i] + launchesfrom_temp[i]
-							landsat[i] = landsat[i] + landsat_temp[i]
-
-						for [v,k] in ls_checktprime_temp:
-							ls_checktprime[v,k] = ls_checktprime_temp[v,k]
-
-						for tmpIndex in range(0, len(TSPtour)-1):
-							i = TSPtour[tmpIndex]
-							if tmpIndex > TSPtour.index(truckCust):
-								if (tmpv in availUAVs[i]) and (new_v not in availUAVs[i]):
-									availUAVs[i].append(new_v)
-									availUAVs[i].remove(tmpv)
-								elif (tmpv not in availUAVs[i]) and (new_v in availUAVs[i]):
-									availUAVs[i].append(tmpv)
-									availUAVs[i].remove(new_v)															
-
-
-	return [shift_happened, tmp_y]
\ No newline at end of file
+						# tmpv now stays away until tmpk, so it can't make its next sorties (from truckCust on).
+						# Trade them with a UAV that is available at truckCust:
+						new_v = state.availUAVs[truckCust][0]
+						state.swapVehicles(tmpv, new_v, truckCust, launchesfrom, landsat, ls_checktprime)
+
+
+	return [shift_happened, state.sortieList()]
+
+
+def neighbourhoodMoves(x, y, c, waitingArray, ls_checktprime, eee, tau, tauprime, sigma, sigmaprime, ls_checkt, ls_hatt, V, sL, sR, Pset, numMoves):
+	# Returns a list of (at most numMoves) new versions of y, each with one sortie replaced, best estimate first.
+	# Pset = {(v,i,j,k), ...} holds the sorties of P; a new sortie must be one of them.
+	TSPtour = []
+	for [i,j] in x:
+		TSPtour.append(i)
+	TSPtour.append(c+1)
+
+	state = localSearchState(TSPtour, y, V)
+	position = state.position
+
+	def isFree(v, i, k, skipSortie):
+		# Is UAV v on the truck from i until k (ignoring skipSortie)?
+		for sortie in state.byVehicle[v]:
+			if (sortie != skipSortie) and (position[sortie[1]] < position[k]) and (position[i] < position[sortie[3]]):
+				return False
+		return True
+
+	moves = []		# moves = [[estimated savings, order, oldSortie, newSortie], ...]
+	for [v,i,j,k] in y:
+		oldSortie = (v,i,j,k)
+
+		# How long the truck waits at k for UAV v (after serving k):
+		lateness = ls_checktprime[v,k] - sR[v][k] - ls_checkt[k] - sigma[k]
+		if (k != c+1):
+			lateness = min(lateness, waitingArray[k])
+		if (lateness <= 0):
+			continue
+
+		candidates = []
+		if (k != c+1):
+			candidates.append([v, i, TSPtour[position[k]+1]])						# recovery shift
+		if (i != 0):
+			candidates.append([v, TSPtour[position[i]-1], k])						# launch shift (earlier)
+		if (TSPtour[position[i]+1] != k):
+			candidates.append([v, TSPtour[position[i]+1], k])						# launch shift (later)
+		for otherV in V:
+			if (otherV != v):
+				candidates.append([otherV, i, k])									# UAV swap
+		for p in range(0, len(TSPtour)-1):
+			if (TSPtour[p] != i):
+				for newV in V:
+					candidates.append([newV, TSPtour[p], TSPtour[p+1]])			# customer reassignment
+
+		for [newV, newI, newK] in candidates:
+			if ((newV, newI, j, newK) not in Pset):
+				# Not a sortie of P (e.g., beyond the UAV's range)
+				continue
+			if ((newV, newI, j, newK) in state.sorties) or (not isFree(newV, newI, newK, oldSortie)):
+				continue
+
+			flightTime = tauprime[newV][newI][j] + sigmaprime[j] + tauprime[newV][j][newK]
+			if not (flightTime <= eee[newV][newI][j][newK]):
+				# Can't fly this sortie (NaN if newV can't carry j's parcel)
+				continue
+
+			# If the truck used to wait at k before getting to newK, it doesn't any more:
+			truckAtK = ls_checkt[newK]
+			truckLeaves = ls_hatt[newI]
+			if (position[k] < position[newK]):
+				truckAtK -= lateness
+			if (position[k] < position[newI]):
+				truckLeaves -= lateness
+			if (truckAtK - truckLeaves > eee[newV][newI][j][newK]):
+				# The UAV would run out of battery before the truck gets to newK
+				continue
+
+			# The UAV is launched (at the earliest) when the truck gets to newI:
+			uavAtK = truckLeaves - (ls_hatt[newI] - ls_checkt[newI]) + sL[newV][newI] + flightTime
+			newLateness = max(0, uavAtK - truckAtK - sigma[newK])
+			savings = lateness - newLateness - (sL[newV][newI] - sL[v][i]) - (sR[newV][newK] - sR[v][k])
+			if (savings > 0):
+				moves.append([savings, len(moves), oldSortie, (newV, newI, j, newK)])
+
+	# The best numMoves moves (for each old sortie, only its best move):
+	moves.sort(key=lambda move: (-move[0], move[1]))
+	newYs = []
+	usedSorties = set()
+	for [savings, order, oldSortie, newSortie] in moves:
+		if (len(newYs) >= numMoves):
+			break
+		if (oldSortie in usedSorties):
+			continue
+		usedSorties.add(oldSortie)
+
+		tmp_y = [list(sortie) for sortie in y if tuple(sortie) != oldSortie]
+		tmp_y.append(list(newSortie))
+		newYs.append(tmp_y)
+
+	return newYs
@@ -9,7 +9,7 @@
 
 # RUNNING THIS SCRIPT:
 
-# python main.py <problemName> <vehicleFileID> <cutoffTime> <problemType> <numUAVs> <numTrucks> <requireTruckAtDepot> <requireDriver> <Etype> <ITER>
+# python main.py <problemName> <vehicleFileID> <cutoffTime> <problemType> <numUAVs> <numTrucks> <requireTruckAtDepot> <requireDriver> <Etype> <ITER> [<TSPtype>] [<P3type>]
 
 # problemName: Name of the folder containing the data for a particular problem instance
 # vehicleFileID: 101, 102, 103, 104 (Chooses a particular UAV type depending on the file ID)
@@ -21,6 +21,8 @@
 # requireDriver: 0 (false) or 1 (true). False --> UAVs can launch/land without driver (so driver can serve customer).
 # Etype: Endurance type --> 1 (NON-LINEAR), 2 (LINEAR), 3 (CONSTANT), 4 (UNLIMITED), 5 (CONSTANT DISTANCE)
 # ITER: Number of iterations the heuristic runs at each LTL (Not applicable when running the IP model, therefore it can be assigned any value when running the IP)
+# TSPtype: (Optional) How the heuristic finds truck TSP tours --> 1 (Gurobi, the default), 2 (2-opt/Or-opt local search).  Ignored by the IP.
+# P3type: (Optional) How the heuristic solves Phase III --> 1 (MIP, the default), 2 (combinatorial, with the MIP as a fallback).  Ignored by the IP.  Requires TSPtype.
 
 
 # 1) Solving the mFSTSP optimally:
@@ -36,11 +38,13 @@
 
 
 import sys
+import copy
 import datetime
 import time
 import math
 from collections import defaultdict
 import pandas as pd
+import numpy as np
 
 from parseCSV import *
 from parseCSVstring import *
@@ -54,6 +58,10 @@ from solve_mfstsp_IP import *
 from solve_mfstsp_heuristic import *
 
 import distance_functions
+from vehicle_classes import *
+from records import *
+from instance_file import *
+from node_matrix import *
 
 # =============================================================
 startTime 		= time.time()
@@ -65,6 +73,48 @@ METERS_PER_MILE = 1609.34
 # 2 --> mFSTSP heuristic (will need other parameters)
 problemTypeString = {1: 'mFSTSP IP', 2: 'mFSTSP Heuristic'}
 
+# TSP_TYPE (only used by the heuristic)
+# 1 --> Gurobi
+# 2 --> 2-opt/Or-opt local search
+TSP_TYPE_GUROBI 		= 1
+TSP_TYPE_LOCAL_SEARCH 	= 2
+
+# Set to False to always read problems from their CSV files, instead of from their instance files (see instance_file.py):
+INSTANCE_FILE_CACHE = True
+
+# P3_TYPE (only used by the heuristic)
+# 1 --> MIP (Gurobi)
+# 2 --> Combinatorial (falls back to the MIP if there are too many launch/recovery orders)
+P3_TYPE_MIP 			= 1
+P3_TYPE_COMBINATORIAL 	= 2
+
+# The assignments are also written to their own file (one per run) in this format, for analysis with pandas (etc.):
+# None --> no file (the assignments are only in the solution file)
+# 'parquet' or 'feather' --> Problems/<problemName>/tbl_assignments_<vehicleFileID>_<numUAVs>_<indicator>_<run time>.<format>
+#							 (pandas needs the pyarrow module to write these files)
+ASSIGNMENT_TABLE_FORMAT = None
+
+# Text that describes each statusID and ganttStatus of an assignment (in the solution file):
+ASSIGNMENT_STATUS_STRING = {
+	TRAVEL_UAV_PACKAGE:		'UAV travels with parcel',
+	TRAVEL_UAV_EMPTY:		'UAV travels empty',
+	TRAVEL_TRUCK_W_UAV:		'Truck travels with UAV(s) on board',
+	TRAVEL_TRUCK_EMPTY:		'Truck travels with no UAVs on board',
+	VERTICAL_UAV_EMPTY:		'UAV taking off or landing with no parcels',
+	VERTICAL_UAV_PACKAGE:	'UAV taking off or landing with a parcel',
+	STATIONARY_UAV_EMPTY:	'UAV is stationary without a parcel',
+	STATIONARY_UAV_PACKAGE:	'UAV is stationary with a parcel',
+	STATIONARY_TRUCK_W_UAV:	'Truck is stationary with UAV(s) on board',
+	STATIONARY_TRUCK_EMPTY:	'Truck is stationary with no UAVs on board'}
+
+GANTT_STATUS_STRING = {
+	GANTT_IDLE:			'Idle',
+	GANTT_TRAVEL:		'Traveling',
+	GANTT_DELIVER:		'Making Delivery',
+	GANTT_RECOVER:		'UAV Recovery',
+	GANTT_LAUNCH:		'UAV Launch',
+	GANTT_FINISHED:		'Vehicle Tasks Complete'}
+
 
 NODE_TYPE_DEPOT	= 0
 NODE_TYPE_CUST	= 1
@@ -93,69 +143,81 @@ def make_dict():
 	# j = 12
 	# tau[v][i][j] = 44
 
-class make_node:
-	def __init__(self, nodeType, latDeg, lonDeg, altMeters, parcelWtLbs, serviceTimeTruck, serviceTimeUAV, address):
-		# Set node[nodeID]
-		self.nodeType 			= nodeType
-		self.latDeg 			= latDeg
-		self.lonDeg				= lonDeg
-		self.altMeters			= altMeters
-		self.parcelWtLbs 		= parcelWtLbs
-		self.serviceTimeTruck	= serviceTimeTruck	# [seconds]
-		self.serviceTimeUAV 	= serviceTimeUAV	# [seconds]
-		self.address 			= address			# Might be None
-
-class make_vehicle:
-	def __init__(self, vehicleType, takeoffSpeed, cruiseSpeed, landingSpeed, yawRateDeg, cruiseAlt, capacityLbs, launchTime, recoveryTime, serviceTime, batteryPower, flightRange):
-		# Set vehicle[vehicleID]
-		self.vehicleType	= vehicleType
-		self.takeoffSpeed	= takeoffSpeed
-		self.cruiseSpeed	= cruiseSpeed
-		self.landingSpeed	= landingSpeed
-		self.yawRateDeg		= yawRateDeg
-		self.cruiseAlt		= cruiseAlt
-		self.capacityLbs	= capacityLbs
-		self.launchTime		= launchTime	# [seconds].
-		self.recoveryTime	= recoveryTime	# [seconds].
-		self.serviceTime	= serviceTime
-		self.batteryPower	= batteryPower	# [joules].
-		self.flightRange	= flightRange	# 'high' or 'low'
-
-class make_travel:
-	def __init__(self, takeoffTime, flyTime, landTime, totalTime, takeoffDistance, flyDistance, landDistance, totalDistance):
-		# Set travel[vehicleID][fromID][toID]
-		self.takeoffTime 	 = takeoffTime
-		self.flyTime 		 = flyTime
-		self.landTime 		 = landTime
-		self.totalTime 		 = totalTime
-		self.takeoffDistance = takeoffDistance
-		self.flyDistance	 = flyDistance
-		self.landDistance	 = landDistance
-		self.totalDistance	 = totalDistance
+def truckTravelMatrix(truckTime, truckDist):
+	# The truck doesn't take off or land, so its travel matrix only has travel times and distances:
+	noTime = np.zeros(np.shape(truckTime))
+	return travelMatrix([noTime, truckTime, noTime, truckTime, noTime, truckDist, noTime, truckDist], make_travel)
+
+
+def parseArguments(argv):
+	# Read the inputs to main.py from argv (in the same format as sys.argv).
+	# Returns [problemName, vehicleFileID, cutoffTime, problemType, numUAVs, numTrucks, requireTruckAtDepot, requireDriver, Etype, ITER, TSPtype, P3type],
+	# or None if argv has the wrong number of inputs.
+
+	# python main.py 20170608T121632668184 101 3600 1 3 -1 1 1 1 -1
+	# Capture 10 inputs from the command line
+	# NOTE: argv[0] is the name of the python file
+	# Try "print sys.argv" (without the quotes) to see the sys.argv list
+	# 10 inputs --> the argv list should have 11 elements.
+	# An optional 11th input (TSPtype) chooses how the heuristic solves TSPs,
+	# and an optional 12th input (P3type) chooses how it solves Phase III.
+	if (len(argv) not in [11, 12, 13]):
+		return None
+
+	problemName 		= argv[1]
+	vehicleFileID		= int(argv[2])
+	cutoffTime 			= float(argv[3])
+	problemType 		= int(argv[4])
+	numUAVs				= int(argv[5])
+	numTrucks			= int(argv[6])
+	requireTruckAtDepot = bool(int(argv[7]))
+	requireDriver 		= bool(int(argv[8]))
+	Etype				= int(argv[9])
+	ITER 				= int(argv[10])
+	if (len(argv) >= 12):
+		TSPtype			= int(argv[11])
+	else:
+		TSPtype			= TSP_TYPE_GUROBI
+	if (len(argv) == 13):
+		P3type			= int(argv[12])
+	else:
+		P3type			= P3_TYPE_MIP
+
+	return [problemName, vehicleFileID, cutoffTime, problemType, numUAVs, numTrucks, requireTruckAtDepot, requireDriver, Etype, ITER, TSPtype, P3type]
+
+
+def appendToFile(filename, text, fileLock=None):
+	# Append text to filename.  If several processes write to the same files (e.g., in batch_runner.py),
+	# they should share a fileLock, so their lines don't get mixed up.
+	if (fileLock is not None):
+		fileLock.acquire()
+	try:
+		myFile = open(filename, 'a')
+		myFile.write(text)
+		myFile.close()
+	finally:
+		if (fileLock is not None):
+			fileLock.release()
 
 
 class missionControl():
-	def __init__(self):
+	def __init__(self, argv=None, instanceCache=None, fileLock=None):
+		# By default, the inputs come from the command line (sys.argv).
+		# batch_runner.py runs many problems in one process, so it passes argv itself, along with:
+		#	- instanceCache:  A dictionary of the problems (node, vehicle, and travel) that this process has already read.
+		#	- fileLock:  A lock for writing to performance_summary.csv and the solution files.
+
+		if (argv is None):
+			argv = sys.argv
+			runStartTime = startTime
+		else:
+			runStartTime = time.time()
 
 		timestamp = datetime.datetime.strftime(datetime.datetime.now(), '%Y-%m-%d %H:%M:%S')
 
-		# python main.py 20170608T121632668184 101 3600 1 3 -1 1 1 1 -1
-		# Capture 10 inputs from the command line
-		# NOTE: sys.argv[0] is the name of the python file
-		# Try "print sys.argv" (without the quotes) to see the sys.argv list
-		# 10 inputs --> the sys.argv list should have 11 elements.
-		if (len(sys.argv) == 11):
-			problemName 		= sys.argv[1]
-			vehicleFileID		= int(sys.argv[2])			
-			cutoffTime 			= float(sys.argv[3])
-			problemType 		= int(sys.argv[4])
-			numUAVs				= int(sys.argv[5])
-			numTrucks			= int(sys.argv[6])
-			requireTruckAtDepot = bool(int(sys.argv[7]))
-			requireDriver 		= bool(int(sys.argv[8]))
-			Etype				= int(sys.argv[9])
-			ITER 				= int(sys.argv[10])
-			
+		inputs = parseArguments(argv)
+		if (inputs is not None):
+			[problemName, vehicleFileID, cutoffTime, problemType, numUAVs, numTrucks, requireTruckAtDepot, requireDriver, Etype, ITER, TSPtype, P3type] = inputs
 
 			self.locationsFile = 'Problems/%s/tbl_locations.csv' % (problemName)
 			self.vehiclesFile = 'Problems/tbl_vehicles_%d.csv' % (vehicleFileID)
@@ -165,34 +227,26 @@ class missionControl():
 				indicator = 'Heuristic'
 			self.solutionSummaryFile = 'Problems/%s/tbl_solutions_%d_%d_%s.csv' % (problemName, vehicleFileID, numUAVs, indicator)
 			self.distmatrixFile = 'Problems/%s/tbl_truck_travel_data_PG.csv' % (problemName)
+			self.instanceFile = instanceFileName(problemName, vehicleFileID, numUAVs)
 
 		else:
-			print('ERROR: You passed %d input parameters.' % (len(sys.argv)-1))
+			print('ERROR: You passed %d input parameters.' % (len(argv)-1))
 			quit()
 
 
-		# Define data structures
-		self.node = {}
-		self.vehicle = {}
-		self.travel = defaultdict(make_dict)
-
-		# Read data for node locations, vehicle properties, and travel time matrix of truck:
-		self.readData(numUAVs)
-
-		# Calculate travel times of UAVs (travel times of truck has already been read when we called the readData function)
-		# NOTE:  For each vehicle we're going to get a matrix of travel times from i to j,
-		#		 where i is in [0, # of customers] and j is in [0, # of customers].
-		#		 However, tau and tauPrime let node c+1 represent a copy of the depot.
-		for vehicleID in self.vehicle:
-			if (self.vehicle[vehicleID].vehicleType == TYPE_UAV):
-				# We have a UAV (Note:  In some problems we only have a truck)
-				for i in self.node:
-					for j in self.node:
-						if (j == i):
-							self.travel[vehicleID][i][j] = make_travel(0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
-						else:
-							[takeoffTime, flyTime, landTime, totalTime, takeoffDistance, flyDistance, landDistance, totalDistance] = distance_functions.calcMultirotorTravelTime(self.vehicle[vehicleID].takeoffSpeed, self.vehicle[vehicleID].cruiseSpeed, self.vehicle[vehicleID].landingSpeed, self.vehicle[vehicleID].yawRateDeg, self.node[i].altMeters, self.vehicle[vehicleID].cruiseAlt, self.node[j].altMeters, self.node[i].latDeg, self.node[i].lonDeg, self.node[j].latDeg, self.node[j].lonDeg, -361, -361)
-							self.travel[vehicleID][i][j] = make_travel(takeoffTime, flyTime, landTime, totalTime, takeoffDistance, flyDistance, landDistance, totalDistance)
+		# Read the problem (or re-use a copy of one this process has already read).
+		# NOTE:  The solvers add node c+1 to self.node, so each run gets its own copy of node and vehicle.
+		#		 travel is only read by the solvers, so it is shared.
+		instanceKey = (problemName, vehicleFileID, numUAVs)
+		if ((instanceCache is not None) and (instanceKey in instanceCache)):
+			[node, vehicle, travel] = instanceCache[instanceKey]
+			self.node = copy.deepcopy(node)
+			self.vehicle = copy.deepcopy(vehicle)
+			self.travel = travel
+		else:
+			self.loadData(numUAVs)
+			if (instanceCache is not None):
+				instanceCache[instanceKey] = [copy.deepcopy(self.node), copy.deepcopy(self.vehicle), self.travel]
 
 
 		# Now, call the IP / Heuristic model:
@@ -203,7 +257,7 @@ class missionControl():
 			print('Gubori is Done.  It returned something')
 		elif (problemType == 2):
 			print('Calling a Heuristic to solve mFSTSP...')
-			[objVal, assignments, packages, waitingTruck, waitingUAV] = solve_mfstsp_heuristic(self.node, self.vehicle, self.travel, cutoffTime, problemName, problemType, requireTruckAtDepot, requireDriver, Etype, ITER)
+			[objVal, assignments, packages, waitingTruck, waitingUAV] = solve_mfstsp_heuristic(self.node, self.vehicle, self.travel, cutoffTime, problemName, problemType, requireTruckAtDepot, requireDriver, Etype, ITER, TSPtype, P3type)
 			bestBound = -1
 			print('The mFSTSP Heuristic is Done.  It returned something')
 		else:
@@ -221,99 +275,220 @@ class missionControl():
 
 			
 		# Write in the performance_summary file:
-		total_time = time.time() - startTime
+		total_time = time.time() - runStartTime
 		print("Total time for the whole process: %f" % (total_time))
 		print("Objective Function Value: %f" % (objVal))
 
-		runString = ' '.join(sys.argv[0:])
+		runString = ' '.join(argv[0:])
 
-		myFile = open('performance_summary.csv','a')
 		str = '%s, %d, %f, %d, %s, %d, %d, %s, %s, %d, %d, %s,' % (problemName, vehicleFileID, cutoffTime, problemType, problemTypeString[problemType], numUAVs, numTrucks, requireTruckAtDepot, requireDriver, Etype, ITER, runString)
-		myFile.write(str)
 
 		numCustomers = len(self.node) - 2
-		str = '%d, %s, %f, %f, %f, %s, %d, %d, %f, %f \n' % (numCustomers, timestamp, objVal, bestBound, total_time, isOptimal, numUAVcust, numTruckCust, waitingTruck, waitingUAV)
-		myFile.write(str)
-					
-		myFile.close()
+		str += '%d, %s, %f, %f, %f, %s, %d, %d, %f, %f \n' % (numCustomers, timestamp, objVal, bestBound, total_time, isOptimal, numUAVcust, numTruckCust, waitingTruck, waitingUAV)
+
+		appendToFile('performance_summary.csv', str, fileLock)
 		print("\nSee 'performance_summary.csv' for statistics.\n")
 
 
 		# Write in the solution file:
-		myFile = open(self.solutionSummaryFile, 'a')
-		myFile.write('problemName, vehicleFileID, cutoffTime, problemTypeString, numUAVs, numTrucks, requireTruckAtDepot, requireDriver, Etype, ITER \n')
-		str = '%s, %d, %f, %s, %d, %d, %s, %s, %d, %d \n\n' % (problemName, vehicleFileID, cutoffTime, problemTypeString[problemType], numUAVs, numTrucks, requireTruckAtDepot, requireDriver, Etype, ITER)
-		myFile.write(str)
+		# (The header and the assignments are written at once, since another process may be writing to the same file.)
+		solutionText = 'problemName, vehicleFileID, cutoffTime, problemTypeString, numUAVs, numTrucks, requireTruckAtDepot, requireDriver, Etype, ITER \n'
+		solutionText += '%s, %d, %f, %s, %d, %d, %s, %s, %d, %d \n\n' % (problemName, vehicleFileID, cutoffTime, problemTypeString[problemType], numUAVs, numTrucks, requireTruckAtDepot, requireDriver, Etype, ITER)
+
+		solutionText += 'Objective Function Value: %f \n\n' % (objVal)
+		solutionText += 'Assignments: \n'
+
+		# Create a dataframe to sort assignments according to their start times.
+		# NOTE:  assignments is an assignmentTable (see records.py), so we build each column of the dataframe at once.
+		rows = assignments.grouped()
+		for row in rows:
+			if (assignments.statusID[row] not in ASSIGNMENT_STATUS_STRING):
+				print('UNKNOWN statusID.')
+				quit()
+			if (assignments.ganttStatus[row] not in GANTT_STATUS_STRING):
+				print('UNKNOWN ganttStatus')
+				quit()
+
+		assignDF = pd.DataFrame({
+			'vehicleID':		[assignments.vehicleID[row] for row in rows],
+			'vehicleType':		['Truck' if (assignments.vehicleType[row] == TYPE_TRUCK) else 'UAV' for row in rows],
+			'activityType':		[ASSIGNMENT_STATUS_STRING[assignments.statusID[row]] for row in rows],
+			'startTime':		[assignments.startTime[row] for row in rows],
+			'startNode':		[assignments.startNodeID[row] for row in rows],
+			'endTime':			[assignments.endTime[row] for row in rows],
+			'endNode':			[assignments.endNodeID[row] for row in rows],
+			'Description':		[assignments.description[row] for row in rows],
+			'Status':			[GANTT_STATUS_STRING[assignments.ganttStatus[row]] for row in rows]})
 
-		myFile.write('Objective Function Value: %f \n\n' % (objVal))
-		myFile.write('Assignments: \n')
-
-		myFile.close()
-
-		# Create a dataframe to sort assignments according to their start times:
-		assignDF = pd.DataFrame(columns=['vehicleID', 'vehicleType', 'activityType', 'startTime', 'startNode', 'endTime', 'endNode', 'Description', 'Status'])
-		indexDF = 1
-
-		for v in assignments:
-			for statusID in assignments[v]:
-				for statusIndex in assignments[v][statusID]:
-					if (assignments[v][statusID][statusIndex].vehicleType == TYPE_TRUCK):
-						vehicleType = 'Truck'
-					else:
-						vehicleType = 'UAV'
-					if (statusID == TRAVEL_UAV_PACKAGE):
-						status = 'UAV travels with parcel'
-					elif (statusID == TRAVEL_UAV_EMPTY):
-						status = 'UAV travels empty'
-					elif (statusID == TRAVEL_TRUCK_W_UAV):
-						status = 'Truck travels with UAV(s) on board'
-					elif (statusID == TRAVEL_TRUCK_EMPTY):
-						status = 'Truck travels with no UAVs on board'
-					elif (statusID == VERTICAL_UAV_EMPTY):
-						status = 'UAV taking off or landing with no parcels'
-					elif (statusID == VERTICAL_UAV_PACKAGE):
-						status = 'UAV taking off or landing with a parcel'
-					elif (statusID == STATIONARY_UAV_EMPTY):
-						status = 'UAV is stationary without a parcel'
-					elif (statusID == STATIONARY_UAV_PACKAGE):
-						status = 'UAV is stationary with a parcel'
-					elif (statusID == STATIONARY_TRUCK_W_UAV):
-						status = 'Truck is stationary with UAV(s) on board'
-					elif (statusID == STATIONARY_TRUCK_EMPTY):
-						status = 'Truck is stationary with no UAVs on board'
-					else:
-						print('UNKNOWN statusID.')
-						quit()
-
-					
-					if (assignments[v][statusID][statusIndex].ganttStatus == GANTT_IDLE):
-						ganttStr = 'Idle'
-					elif (assignments[v][statusID][statusIndex].ganttStatus == GANTT_TRAVEL):
-						ganttStr = 'Traveling'
-					elif (assignments[v][statusID][statusIndex].ganttStatus == GANTT_DELIVER):
-						ganttStr = 'Making Delivery'
-					elif (assignments[v][statusID][statusIndex].ganttStatus == GANTT_RECOVER):
-						ganttStr = 'UAV Recovery'
-					elif (assignments[v][statusID][statusIndex].ganttStatus == GANTT_LAUNCH):
-						ganttStr = 'UAV Launch'
-					elif (assignments[v][statusID][statusIndex].ganttStatus == GANTT_FINISHED):
-						ganttStr = 'Vehicle Tasks Complete'
-					else:
-						print('UNKNOWN ganttStatus')
-						quit()
-					
-					assignDF.loc[indexDF] = [v, vehicleType, status, assignments[v][statusID][statusIndex].startTime, assignments[v][statusID][statusIndex].startNodeID, assignments[v][statusID][statusIndex].endTime, assignments[v][statusID][statusIndex].endNodeID, assignments[v][statusID][statusIndex].description, ganttStr]	
-					indexDF += 1
-		
 		assignDF = assignDF.sort_values(by=['vehicleID', 'startTime'])
 
 		# Add this assignment dataframe to the solution file:
-		assignDF.to_csv(self.solutionSummaryFile, mode='a', header=True, index=False)
+		solutionText += assignDF.to_csv(header=True, index=False)
+		appendToFile(self.solutionSummaryFile, solutionText, fileLock)
 		
 		print("\nSee '%s' for solution summary.\n" % (self.solutionSummaryFile))
+
+		if (ASSIGNMENT_TABLE_FORMAT is not None):
+			self.writeAssignmentTable(assignDF, timestamp)
 		
 
 
+	def writeAssignmentTable(self, assignDF, timestamp):
+		# Write the assignments of this run to their own file (see ASSIGNMENT_TABLE_FORMAT).
+		# Unlike the solution file, each column of this file has a single type.
+		runTime = timestamp.replace('-', '').replace(':', '').replace(' ', 'T')
+		filename = '%s_%s.%s' % (self.solutionSummaryFile[:-len('.csv')].replace('tbl_solutions_', 'tbl_assignments_'), runTime, ASSIGNMENT_TABLE_FORMAT)
+
+		tableDF = assignDF.reset_index(drop=True).astype({'vehicleID': np.int64, 'vehicleType': str, 'activityType': str, 'startTime': np.float64, 'startNode': np.int64, 'endTime': np.float64, 'endNode': np.int64, 'Description': str, 'Status': str})
+		try:
+			if (ASSIGNMENT_TABLE_FORMAT == 'parquet'):
+				tableDF.to_parquet(filename, index=False)
+			elif (ASSIGNMENT_TABLE_FORMAT == 'feather'):
+				tableDF.to_feather(filename)
+			else:
+				print('WARNING: Unknown ASSIGNMENT_TABLE_FORMAT (%s).  No assignment table was written.' % (ASSIGNMENT_TABLE_FORMAT))
+				return
+		except ImportError:
+			print('WARNING: pandas needs the pyarrow module to write %s files.  No assignment table was written.' % (ASSIGNMENT_TABLE_FORMAT))
+			return
+
+		print("See '%s' for the assignment table.\n" % (filename))
+
+
+	def loadData(self, numUAVs):
+		# If this problem's instance file is up to date, read the problem from it (see instance_file.py):
+		sourceFiles = [self.locationsFile, self.vehiclesFile, self.distmatrixFile]
+		if (INSTANCE_FILE_CACHE):
+			arrays = readInstanceFile(self.instanceFile, sourceFiles)
+			if (arrays is not None):
+				self.unpackInstance(arrays, numUAVs)
+				return
+
+		# Define data structures
+		# NOTE:  travel[vehicleID] is a travelMatrix (see node_matrix.py), so travel[vehicleID][i][j] is a make_travel object.
+		self.node = {}
+		self.vehicle = {}
+		self.travel = {}
+
+		# Read data for node locations, vehicle properties, and travel time matrix of truck:
+		self.readData(numUAVs)
+
+		# Calculate travel times of UAVs (travel times of truck has already been read when we called the readData function)
+		# NOTE:  For each vehicle we're going to get a matrix of travel times from i to j,
+		#		 where i is in [0, # of customers] and j is in [0, # of customers].
+		#		 However, tau and tauPrime let node c+1 represent a copy of the depot.
+		# NOTE:  The travel matrices are calculated for all (i,j) pairs at once (see calcMultirotorTravelMatrix).
+		#		 UAVs with identical kinematic parameters share a single (read-only) travel matrix.
+		# NOTE:  Node IDs are 0, 1, ..., # of customers, so the position of each node in nodeIDs is its ID.
+		nodeIDs = sorted(self.node)
+		altMeters = [self.node[i].altMeters for i in nodeIDs]
+		latDeg = [self.node[i].latDeg for i in nodeIDs]
+		lonDeg = [self.node[i].lonDeg for i in nodeIDs]
+		travelClasses = vehicleClasses(self.vehicle, kinematicFingerprint)
+		for vehicleID in sorted(self.vehicle):
+			if (self.vehicle[vehicleID].vehicleType == TYPE_UAV) and (not travelClasses.isRepresentative(vehicleID)):
+				# We already built the travel matrix for an identical UAV
+				self.travel[vehicleID] = self.travel[travelClasses.representative(vehicleID)]
+			elif (self.vehicle[vehicleID].vehicleType == TYPE_UAV):
+				# We have a UAV (Note:  In some problems we only have a truck)
+				travelMatrices = distance_functions.calcMultirotorTravelMatrix(self.vehicle[vehicleID].takeoffSpeed, self.vehicle[vehicleID].cruiseSpeed, self.vehicle[vehicleID].landingSpeed, self.vehicle[vehicleID].yawRateDeg, altMeters, self.vehicle[vehicleID].cruiseAlt, latDeg, lonDeg)
+				self.travel[vehicleID] = travelMatrix(travelMatrices, make_travel)
+
+		if (INSTANCE_FILE_CACHE):
+			writeInstanceFile(self.instanceFile, sourceFiles, self.packInstance())
+
+
+	def packInstance(self):
+		# Returns a dictionary of arrays that holds self.node, self.vehicle, and self.travel (for writeInstanceFile()).
+		# Matrices are indexed by node ID (just like self.travel).
+		arrays = {}
+
+		nodeIDs = sorted(self.node)
+		arrays['nodeID'] 		= np.array(nodeIDs, dtype=np.int64)
+		arrays['nodeType'] 		= np.array([self.node[i].nodeType for i in nodeIDs], dtype=np.int64)
+		arrays['nodeData'] 		= np.array([[self.node[i].latDeg, self.node[i].lonDeg, self.node[i].altMeters, self.node[i].parcelWtLbs, self.node[i].serviceTimeTruck, self.node[i].serviceTimeUAV] for i in nodeIDs], dtype=np.float64)
+		arrays['nodeAddress'] 	= np.array([self.node[i].address for i in nodeIDs], dtype=str)
+
+		vehicleIDs = sorted(self.vehicle)
+		arrays['vehicleID'] 	= np.array(vehicleIDs, dtype=np.int64)
+		arrays['vehicleType'] 	= np.array([self.vehicle[v].vehicleType for v in vehicleIDs], dtype=np.int64)
+		arrays['vehicleData'] 	= np.array([[self.vehicle[v].takeoffSpeed, self.vehicle[v].cruiseSpeed, self.vehicle[v].landingSpeed, self.vehicle[v].yawRateDeg, self.vehicle[v].cruiseAlt, self.vehicle[v].capacityLbs, self.vehicle[v].launchTime, self.vehicle[v].recoveryTime, self.vehicle[v].serviceTime, self.vehicle[v].batteryPower] for v in vehicleIDs], dtype=np.float64)
+		arrays['vehicleFlightRange'] = np.array([self.vehicle[v].flightRange for v in vehicleIDs], dtype=str)
+		arrays['numUAVsAvailable'] = np.array(self.numUAVsAvailable)
+
+		# The truck's travel times and distances (NaN if the travel matrix file doesn't have them).
+		# All trucks have the same travel matrix.
+		for vehicleID in vehicleIDs:
+			if (self.vehicle[vehicleID].vehicleType == TYPE_TRUCK):
+				arrays['truckTime'] = self.travel[vehicleID].totalTime
+				arrays['truckDist'] = self.travel[vehicleID].totalDistance
+				break
+
+		# The UAVs' travel matrices.  UAVs with identical kinematic parameters share one matrix.
+		# uavTravel[u] = [takeoffTime, flyTime, landTime, totalTime, takeoffDistance, flyDistance, landDistance, totalDistance],
+		# and uavTravelClass[position of vehicleID] = u (or -1, for trucks).
+		uavTravel = []
+		arrays['uavTravelClass'] = np.full(len(vehicleIDs), -1, dtype=np.int64)
+		travelClasses = vehicleClasses(self.vehicle, kinematicFingerprint)
+		for b in range(0,len(vehicleIDs)):
+			vehicleID = vehicleIDs[b]
+			if (self.vehicle[vehicleID].vehicleType == TYPE_UAV):
+				rep = travelClasses.representative(vehicleID)
+				if (rep == vehicleID):
+					uavTravel.append(self.travel[vehicleID].fields)
+					arrays['uavTravelClass'][b] = len(uavTravel) - 1
+				else:
+					arrays['uavTravelClass'][b] = arrays['uavTravelClass'][vehicleIDs.index(rep)]
+		arrays['uavTravel'] = np.array(uavTravel, dtype=np.float64).reshape((len(uavTravel), 8, len(nodeIDs), len(nodeIDs)))
+
+		return arrays
+
+
+	def unpackInstance(self, arrays, numUAVs):
+		# Build self.node, self.vehicle, and self.travel from the arrays in an instance file (see packInstance())
+		self.node = {}
+		self.vehicle = {}
+		self.travel = {}
+
+		self.numUAVsAvailable = int(arrays['numUAVsAvailable'])
+		if (self.numUAVsAvailable < numUAVs):
+			print("WARNING: You requested %d UAVs, but we only have data on %d UAVs." % (numUAVs, self.numUAVsAvailable))
+			print("\t We'll solve the problem with %d UAVs.  Sorry." % (self.numUAVsAvailable))
+
+		nodeIDs = arrays['nodeID'].tolist()
+		nodeType = arrays['nodeType'].tolist()
+		nodeData = arrays['nodeData'].tolist()
+		nodeAddress = arrays['nodeAddress'].tolist()
+		for a in range(0,len(nodeIDs)):
+			[latDeg, lonDeg, altMeters, parcelWtLbs, serviceTimeTruck, serviceTimeUAV] = nodeData[a]
+			self.node[nodeIDs[a]] = make_node(nodeType[a], latDeg, lonDeg, altMeters, parcelWtLbs, serviceTimeTruck, serviceTimeUAV, nodeAddress[a])
+
+		vehicleIDs = arrays['vehicleID'].tolist()
+		vehicleType = arrays['vehicleType'].tolist()
+		vehicleData = arrays['vehicleData'].tolist()
+		vehicleFlightRange = arrays['vehicleFlightRange'].tolist()
+		for b in range(0,len(vehicleIDs)):
+			[takeoffSpeed, cruiseSpeed, landingSpeed, yawRateDeg, cruiseAlt, capacityLbs, launchTime, recoveryTime, serviceTime, batteryPower] = vehicleData[b]
+			self.vehicle[vehicleIDs[b]] = make_vehicle(vehicleType[b], takeoffSpeed, cruiseSpeed, landingSpeed, yawRateDeg, cruiseAlt, capacityLbs, launchTime, recoveryTime, serviceTime, batteryPower, vehicleFlightRange[b])
+
+		truckTravel = None
+		uavTravel = arrays['uavTravel']
+		uavTravelClass = arrays['uavTravelClass'].tolist()
+		uavTravelOwner = {}		# uavTravelOwner[u] = the first vehicleID that uses uavTravel[u]
+		for b in range(0,len(vehicleIDs)):
+			vehicleID = vehicleIDs[b]
+			if (self.vehicle[vehicleID].vehicleType == TYPE_TRUCK):
+				if (truckTravel is None):
+					truckTravel = truckTravelMatrix(arrays['truckTime'], arrays['truckDist'])
+				self.travel[vehicleID] = truckTravel
+			elif (uavTravelClass[b] in uavTravelOwner):
+				# We already built the travel matrix for an identical UAV
+				self.travel[vehicleID] = self.travel[uavTravelOwner[uavTravelClass[b]]]
+			else:
+				uavTravelOwner[uavTravelClass[b]] = vehicleID
+				self.travel[vehicleID] = travelMatrix(uavTravel[uavTravelClass[b]], make_travel)
+
+
 	def readData(self, numUAVs):
 		# b)  tbl_vehicles.csv
 		tmpUAVs = 0
@@ -340,6 +515,7 @@ class missionControl():
 			else:
 				self.vehicle[vehicleID] = make_vehicle(vehicleType, takeoffSpeed, cruiseSpeed, landingSpeed, yawRateDeg, cruiseAlt, capacityLbs, launchTime, recoveryTime, serviceTime, batteryPower, flightRange)
 
+		self.numUAVsAvailable = tmpUAVs
 		if (tmpUAVs < numUAVs):
 			print("WARNING: You requested %d UAVs, but we only have data on %d UAVs." % (numUAVs, tmpUAVs))
 			print("\t We'll solve the problem with %d UAVs.  Sorry." % (tmpUAVs))
@@ -373,16 +549,22 @@ class missionControl():
 		# c) tbl_truck_travel_data.csv
 		if (os.path.isfile(self.distmatrixFile)):
 			# Travel matrix file exists
-			rawData = parseCSV(self.distmatrixFile, returnJagged=False, fillerValue=-1, delimiter=',')
-			for i in range(0,len(rawData)):
-				tmpi 	= int(rawData[i][0])
-				tmpj 	= int(rawData[i][1])
-				tmpTime	= float(rawData[i][2])
-				tmpDist	= float(rawData[i][3])
-
-				for vehicleID in self.vehicle:
-					if (self.vehicle[vehicleID].vehicleType == TYPE_TRUCK):
-						self.travel[vehicleID][tmpi][tmpj] = make_travel(0.0, tmpTime, 0.0, tmpTime, 0.0, tmpDist, 0.0, tmpDist)
+			# NOTE:  parseCSVarray reads the whole matrix into a NumPy array in one pass (see parseCSV.py).
+			#		 Each row is [from node ID, to node ID, time, distance].  Pairs that aren't in the file are NaN.
+			rawData = parseCSVarray(self.distmatrixFile, fillerValue=-1, delimiter=',')
+			tmpi = rawData[:,0].astype(int)
+			tmpj = rawData[:,1].astype(int)
+			numNodes = max([max(self.node)] + tmpi.tolist() + tmpj.tolist()) + 1
+			truckTime = np.full((numNodes, numNodes), np.nan)
+			truckDist = np.full((numNodes, numNodes), np.nan)
+			truckTime[tmpi, tmpj] = rawData[:,2]
+			truckDist[tmpi, tmpj] = rawData[:,3]
+
+			# All trucks share the same travel matrix:
+			truckTravel = truckTravelMatrix(truckTime, truckDist)
+			for vehicleID in self.vehicle:
+				if (self.vehicle[vehicleID].vehicleType == TYPE_TRUCK):
+					self.travel[vehicleID] = truckTravel
 
 		else:
 			# Travel matrix file does not exist
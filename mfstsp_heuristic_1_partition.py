@@ -8,8 +8,11 @@ from parseCSV import *
 from gurobipy import *
 from collections import defaultdict
 
+from records import *
 from solve_tsp_callback import *
 from checkP2Feasibility import *
+from reachability_index import *
+from truck_tour import *
 
 
 # =============================================================
@@ -57,49 +60,9 @@ def make_dict():
 	# j = 12
 	# tau[v][i][j] = 44
 
-class make_node:
-	def __init__(self, nodeType, latDeg, lonDeg, altMeters, parcelWtLbs, serviceTimeTruck, serviceTimeUAV, address): 
-		# Set node[nodeID]
-		self.nodeType 			= nodeType
-		self.latDeg 			= latDeg
-		self.lonDeg				= lonDeg
-		self.altMeters			= altMeters
-		self.parcelWtLbs 		= parcelWtLbs
-		self.serviceTimeTruck	= serviceTimeTruck	# [seconds]
-		self.serviceTimeUAV 	= serviceTimeUAV	# [seconds]
-		self.address 			= address			# Might be None
-
-class make_assignments:
-	def __init__(self, vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus):
-		# Set assignments[v][statusID][statusIndex]
-		self.vehicleType 	= vehicleType
-		self.startTime 		= startTime
-		self.startNodeID	= startNodeID
-		self.startLatDeg 	= startLatDeg
-		self.startLonDeg 	= startLonDeg
-		self.startAltMeters = startAltMeters
-		self.endTime 		= endTime
-		self.endNodeID 		= endNodeID
-		self.endLatDeg		= endLatDeg
-		self.endLonDeg		= endLonDeg
-		self.endAltMeters 	= endAltMeters
-		self.icon			= icon
-		self.description 	= description
-		self.UAVsOnBoard 	= UAVsOnBoard
-		self.ganttStatus	= ganttStatus
-
-class make_packages:
-	def __init__(self, packageType, latDeg, lonDeg, deliveryTime, icon):
-		# Set packages[nodeID]
-		self.packageType 	= packageType
-		self.latDeg 		= latDeg
-		self.lonDeg 		= lonDeg
-		self.deliveryTime 	= deliveryTime
-		self.icon 			= icon
-
 # Function to generate TSP assignments for a given TSP tour:
 def generateTSPinfo(myTour, c, C, node, tau, sigma):
-	tmpAssignments = defaultdict(make_dict)
+	tmpAssignments = assignmentTable()
 
 	vehicleType = TYPE_TRUCK
 	UAVsOnBoard = []				
@@ -137,12 +100,7 @@ def generateTSPinfo(myTour, c, C, node, tau, sigma):
 			print('\t Quitting Now.')
 			exit()
 
-		if (0 in tmpAssignments[1][statusID]):
-			statusIndex = len(tmpAssignments[1][statusID])
-		else:
-			statusIndex = 0
-		
-		tmpAssignments[1][statusID][statusIndex] = make_assignments(vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus)
+		tmpAssignments.add(1, statusID, vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus)
 
 
 		# Now, capture the "service" component:
@@ -164,12 +122,7 @@ def generateTSPinfo(myTour, c, C, node, tau, sigma):
 			ganttStatus		= GANTT_DELIVER
 			description		= 'Dropping off package to Customer %d' % (j)
 
-		if (0 in tmpAssignments[1][statusID]):
-			statusIndex = len(tmpAssignments[1][statusID])
-		else:
-			statusIndex = 0
-		
-		tmpAssignments[1][statusID][statusIndex] = make_assignments(vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus)
+		tmpAssignments.add(1, statusID, vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus)
 
 		tmpDepart = endTime
 		if (j != c+1):
@@ -181,7 +134,7 @@ def generateTSPinfo(myTour, c, C, node, tau, sigma):
 # Function to generate TSP assignments and packages for a given TSP tour:
 def make_TSP_package(myTour, c, C, node, tau, sigma):
 	# We want to return this collection of assignments and packages:
-	assignments	= defaultdict(make_dict)
+	assignments	= assignmentTable()
 	packages	= defaultdict(make_dict)
 
 	# Build the assignment
@@ -221,12 +174,7 @@ def make_TSP_package(myTour, c, C, node, tau, sigma):
 			print('\t Quitting Now.')
 			exit()
 
-		if (0 in assignments[1][statusID]):
-			statusIndex = len(assignments[1][statusID])
-		else:
-			statusIndex = 0
-
-		assignments[1][statusID][statusIndex] = make_assignments(vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus)
+		assignments.add(1, statusID, vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus)
 
 
 		# Now, capture the "service" component:
@@ -254,12 +202,7 @@ def make_TSP_package(myTour, c, C, node, tau, sigma):
 			pkgIcon 		= packageIcons[1]
 			packages[j] 	= make_packages(packageType, endLatDeg, endLonDeg, endTime, pkgIcon)
 
-		if (0 in assignments[1][statusID]):
-			statusIndex = len(assignments[1][statusID])
-		else:
-			statusIndex = 0
-
-		assignments[1][statusID][statusIndex] = make_assignments(vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus)
+		assignments.add(1, statusID, vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus)
 
 		tmpDepart = endTime
 		if (j != c+1):
@@ -269,15 +212,10 @@ def make_TSP_package(myTour, c, C, node, tau, sigma):
 	return (objVal, assignments, packages, myTour)
 
 
-def getTSP(c, tmpTruckCustomers, node, vehicle, travel):
-	# Build nodes:
-	newNode = {}
-	newNode[0] = make_node(node[0].nodeType, node[0].latDeg, node[0].lonDeg, node[0].altMeters, node[0].parcelWtLbs, node[0].serviceTimeTruck, node[0].serviceTimeUAV, node[0].address)
-	for j in tmpTruckCustomers:
-		newNode[j] = make_node(node[j].nodeType, node[j].latDeg, node[j].lonDeg, node[j].altMeters, node[j].parcelWtLbs, node[j].serviceTimeTruck, node[j].serviceTimeUAV, node[j].address)	
-
-	# Solve TSP using Gurobi callback:
-	[TSPobjVal, TSPassignments, TSPpackages, TSPtour] = solve_tsp_callback(newNode, vehicle, travel)
+def getTSP(c, tmpTruckCustomers, TSPengine):
+	# Solve TSP using TSPengine, which is either a persistent Gurobi model (see tspEngine in solve_tsp_callback.py)
+	# or a local search (see tspLocalSearch in tsp_local_search.py):
+	[TSPtour, TSPobjVal] = TSPengine.solve(tmpTruckCustomers)
 
 	# Add depot at the end of the tour:
 	fixedTSPtour = []
@@ -295,8 +233,9 @@ def getTotalCost(TSPtour, tau, sigma, V, C, sL, sR):
 		totalCost += (tau[i][j] + sigma[j])
 		i = j
 	v = min(V)	
+	truckNodes = set(TSPtour)
 	for j in C:
-		if j not in TSPtour:
+		if j not in truckNodes:
 			totalCost += (sL[v][j] + sR[v][j])
 
 	return totalCost
@@ -306,34 +245,36 @@ def getTruckMoves(V, C, TSPtour, tau, sigma, sL, sR):
 	v = min(V)
 	moreTruck = []
 	moreTruckSavings = []
+	tourInfo = truckTour(TSPtour, tau, sigma)
 	for j in C:
 		# We want to know which UAV customers results in positive savings when added to the list of truck customers.
-		if j not in TSPtour:
+		if j not in tourInfo:
 			for iii in range(0, len(TSPtour)-1):
 				i = TSPtour[iii]
-				k = TSPtour[iii+1]
-				tmpSavings = (sL[v][j] + sR[v][j]) - (tau[i][j] + tau[j][k] + sigma[j] - tau[i][k])
+				tmpSavings = (sL[v][j] + sR[v][j]) - tourInfo.insertionCost(i, j)
 				if (tmpSavings > 0):	
 					# print("Cheaper to serve %d via truck (save %f)" % (j, tmpSavings))
-					if (j not in moreTruck):
-						moreTruck.append(j)
-						moreTruckSavings.append(tmpSavings)
+					# (We only keep the first savings we find for j)
+					moreTruck.append(j)
+					moreTruckSavings.append(tmpSavings)
+					break
 							
 	return (list(moreTruck), list(moreTruckSavings))
 
 
-def getUAVmoves(TSPtour, xxxTruckOnly, sL, sR, tau, sigma, V, Pprime):	
+def getUAVmoves(TSPtour, xxxTruckOnly, sL, sR, tau, sigma, V, reach):	
 	# Find customers currently served via truck that would be cheaper with UAV.
 	v = min(V)
 	moreUAV = []
 	moreUAVsavings = []
+	tourInfo = truckTour(TSPtour, tau, sigma)
 	for iii in range(0, len(TSPtour)-2):
 		i = TSPtour[iii]
 		j = TSPtour[iii+1]
 		k = TSPtour[iii+2]
 		if (j not in xxxTruckOnly):
-			if ([i,k] in Pprime[v][j]):
-				tmpSavings = (sigma[j] + tau[i][j] + tau[j][k]) - (sL[v][j] + sR[v][j] + tau[i][k]) 
+			if (reach.canServeBy(v, i, j, k)):
+				tmpSavings = tourInfo.removalSavings(j) - (sL[v][j] + sR[v][j])
 				if (tmpSavings > 0):
 					# print("Cheaper to serve %d via UAV (save %f)" % (j, tmpSavings))
 					if (j not in moreUAV):
@@ -343,7 +284,7 @@ def getUAVmoves(TSPtour, xxxTruckOnly, sL, sR, tau, sigma, V, Pprime):
 	return (list(moreUAV), list(moreUAVsavings))
 
 
-def mfstsp_heuristic_1_partition(node, vehicle, travel, N, N_zero, N_plus, C, P, tau, tauprime, sigma, sigmaprime, sL, sR, lowerTruckLimit, requireUniqueTSP, prevTSPtours, bestOFV, p1_previousTSP, p1_FEASobjVal):
+def mfstsp_heuristic_1_partition(node, vehicle, travel, N, N_zero, N_plus, C, P, tau, tauprime, sigma, sigmaprime, sL, sR, lowerTruckLimit, requireUniqueTSP, prevTSPtours, bestOFV, p1_previousTSP, p1_FEASobjVal, TSPengine):
 
 	V = []
 	for vehicleID in vehicle:
@@ -375,6 +316,12 @@ def mfstsp_heuristic_1_partition(node, vehicle, travel, N, N_zero, N_plus, C, P,
 
 		Pprime[v][j].append([i,k])
 
+	# Index the pairs in Pprime, so we can quickly tell which customers a truck tour can reach (see reachability_index.py):
+	reach = reachabilityIndex(V, Pprime)
+
+	# Checks whether Phase II can find a launch point for every UAV customer (see checkP2Feasibility.py):
+	P2checker = p2FeasibilityChecker(V, reach)
+
 	
 	# We want to return these arrays:
 	customersUAV = []
@@ -393,7 +340,7 @@ def mfstsp_heuristic_1_partition(node, vehicle, travel, N, N_zero, N_plus, C, P,
 				xxxTruckOnly.append(i)
 
 		# Get TSP tour:
-		[TSPtour, TSPobjVal] = getTSP(c, xxxTruckOnly, node, vehicle, travel)
+		[TSPtour, TSPobjVal] = getTSP(c, xxxTruckOnly, TSPengine)
 	
 		# Calculate total cost of this tour (TSP + UAV launch & recovery)
 		totalCost = getTotalCost(TSPtour, tau, sigma, V, C, sL, sR)		
@@ -413,7 +360,7 @@ def mfstsp_heuristic_1_partition(node, vehicle, travel, N, N_zero, N_plus, C, P,
 				tmpTruckCustomers = list( set(tmpTruckCustomers) - set([0, c+1]) )		# remove 0 and c+1
 		
 				# Get TSP tour:			
-				[TSPtour, TSPobjVal] = getTSP(c, tmpTruckCustomers, node, vehicle, travel)
+				[TSPtour, TSPobjVal] = getTSP(c, tmpTruckCustomers, TSPengine)
 				
 				# Calculate total cost of this tour (TSP + UAV launch & recovery)
 				totalCost = getTotalCost(TSPtour, tau, sigma, V, C, sL, sR)		
@@ -425,7 +372,7 @@ def mfstsp_heuristic_1_partition(node, vehicle, travel, N, N_zero, N_plus, C, P,
 				# print("Not cheaper to move anyone to truck")
 			
 			# Any candidates for moving back to drone?
-			[moreUAV, moreUAVsavings] = getUAVmoves(TSPtour, xxxTruckOnly, sL, sR, tau, sigma, V, Pprime)
+			[moreUAV, moreUAVsavings] = getUAVmoves(TSPtour, xxxTruckOnly, sL, sR, tau, sigma, V, reach)
 			
 			if (len(moreUAV) > 0):
 				# Add the customers in moreUAV to the list of UAV customers:
@@ -433,7 +380,7 @@ def mfstsp_heuristic_1_partition(node, vehicle, travel, N, N_zero, N_plus, C, P,
 				tmpTruckCustomers = list( set(tmpTruckCustomers) - set([0, c+1]) )		# remove 0 and c+1
 
 				# Get TSP tour:
-				[TSPtour, TSPobjVal] = getTSP(c, tmpTruckCustomers, node, vehicle, travel)
+				[TSPtour, TSPobjVal] = getTSP(c, tmpTruckCustomers, TSPengine)
 				
 				# Calculate total cost of this tour (TSP + UAV launch & recovery)
 				totalCost = getTotalCost(TSPtour, tau, sigma, V, C, sL, sR)		
@@ -452,6 +399,9 @@ def mfstsp_heuristic_1_partition(node, vehicle, travel, N, N_zero, N_plus, C, P,
 	#-------------------------------------------------ALGORITHM 2 STARTS HERE---------------------------------------------------------#
 
 	isFailed = True		# Assume true until shown otherwise
+
+	# Keep track of the customers that currentTSP can reach (we update this whenever currentTSP changes):
+	coverage = tourCoverage(reach, currentTSP)
 	
 	# Move customers to truck for feasibility, and to satisfy LTL requirements:
 	while isFailed:
@@ -473,26 +423,14 @@ def mfstsp_heuristic_1_partition(node, vehicle, travel, N, N_zero, N_plus, C, P,
 		droners = list( set(C) - set(currentTSP) )
 
 		# 1a)  Check for unreachable drone customers (Line 31 in Algorithm 2)
-		for j in droners:
-			# Can we serve j?
-			canServe = False
-			for iii in range(0, len(currentTSP)-1):
-				i = currentTSP[iii]
-				for kkk in [iii+1]:
-					k = currentTSP[kkk]
-					for v in V:
-						if ([i,k] in Pprime[v][j]):
-							canServe = True
-							break
-			if not canServe:			
-				failed2reach.append(j)
+		failed2reach = coverage.unreachable(droners)
 
 
 		# If there are no unreachable drone customers, check if there are drone customers that may result in Phase II infeasibility,
 		# or if there are at least lowerTruckLimit number of customers (Lines 32-36 in Algorithm 2)
 		if (len(failed2reach) == 0):
 			if len(V) >= 1:
-				[p3_status, p3_infeas_cust] = checkP2Feasibility(droners, currentTSP, V, Pprime)
+				[p3_status, p3_infeas_cust] = P2checker.check(droners, currentTSP)
 				if (p3_status == 1) and (len(currentTSP) - 2 >= lowerTruckLimit):
 					isFailed = False
 				else:
@@ -511,6 +449,7 @@ def mfstsp_heuristic_1_partition(node, vehicle, travel, N, N_zero, N_plus, C, P,
 		if (isFailed):
 			# If we insert j into the truck route, which customers can now be reached?
 			# Also, what is the cost?
+			tourInfo = truckTour(currentTSP, tau, sigma)
 			for j in droners:
 				for iii in range(0, len(currentTSP)-1):
 					i = currentTSP[iii]
@@ -518,7 +457,7 @@ def mfstsp_heuristic_1_partition(node, vehicle, travel, N, N_zero, N_plus, C, P,
 	
 					v = min(V)
 					# negative cost is a savings
-					tmpCost = (tau[i][j] + tau[j][k] + sigma[j] - tau[i][k]) - (sL[v][j] + sR[v][j])
+					tmpCost = tourInfo.insertionCost(i, j) - (sL[v][j] + sR[v][j])
 					insertCost[j][iii+1] = tmpCost	# insert customer j *after* customer i (position iii+1)	
 					if (tmpCost < cheapestCost):
 						cheapestCost = tmpCost
@@ -531,20 +470,12 @@ def mfstsp_heuristic_1_partition(node, vehicle, travel, N, N_zero, N_plus, C, P,
 						support[j][iii+1].append(j)
 						
 					for l in list( set(failed2reach) - set([j]) ):
-						foundIt = False
-						for v in V:
-							if ([i,j] in Pprime[v][l]):
-								# i - l - j
-								support[j][iii+1].append(l)
-								foundIt = True
-								
-							elif ([j,k] in Pprime[v][l]):
-								# j - l - k
-								support[j][iii+1].append(l)
-								foundIt = True
-									
-							if (foundIt):
-								break
+						if (reach.canServe(i, l, j)):
+							# i - l - j
+							support[j][iii+1].append(l)
+						elif (reach.canServe(j, l, k)):
+							# j - l - k
+							support[j][iii+1].append(l)
 	
 					if (len(support[j][iii+1]) > maxSupport):
 						maxSupport = len(support[j][iii+1])
@@ -572,11 +503,12 @@ def mfstsp_heuristic_1_partition(node, vehicle, travel, N, N_zero, N_plus, C, P,
 				tmpTruckCustomers = list( set(tmpTruckCustomers) - set([0, c+1]) )		# remove 0 and c+1
 
 				# Get TSP tour:
-				[currentTSP, TSPobjVal] = getTSP(c, tmpTruckCustomers, node, vehicle, travel)
+				[currentTSP, TSPobjVal] = getTSP(c, tmpTruckCustomers, TSPengine)
+				coverage.setTour(currentTSP)
 
 			elif ( (len(currentTSP) - 2 >= lowerTruckLimit) and (len(failed2reach) > 0) ):
 				# If we only need to address unreachable customers, choose best ratio
-				currentTSP.insert(bestRatioInfo[1], bestRatioInfo[0])
+				coverage.insert(currentTSP, bestRatioInfo[1], bestRatioInfo[0])
 				
 			else:
 				# If we need to do both, choose best ratio?
@@ -585,7 +517,8 @@ def mfstsp_heuristic_1_partition(node, vehicle, travel, N, N_zero, N_plus, C, P,
 				tmpTruckCustomers = list( set(tmpTruckCustomers) - set([0, c+1]) )		# remove 0 and c+1
 
 				# Get TSP tour:
-				[currentTSP, TSPobjVal] = getTSP(c, tmpTruckCustomers, node, vehicle, travel)
+				[currentTSP, TSPobjVal] = getTSP(c, tmpTruckCustomers, TSPengine)
+				coverage.setTour(currentTSP)
 	
 			
 			# Re-calculate total cost of new TSP (TSP + UAV launch & recovery)
@@ -637,6 +570,10 @@ def mfstsp_heuristic_1_partition(node, vehicle, travel, N, N_zero, N_plus, C, P,
 		
 		if (not foundTSP):
 
+			# Keep track of the customers that TSPtour can reach.
+			# Each candidate changes a few arcs of TSPtour, so we change them in tourCov, check the candidate, and change them back.
+			tourCov = tourCoverage(reach, TSPtour)
+
 			# Truck/UAV swap?
 			newTruckCust = None
 			newUAVcust = None
@@ -660,28 +597,17 @@ def mfstsp_heuristic_1_partition(node, vehicle, travel, N, N_zero, N_plus, C, P,
 							if (tmpCost < minCost):
 
 								# Do the following check (P2 feasiblity) when it is worth doing it (meaning if all the previous checks are satisfied):
-								failed2reach = []
 								# create a list of drone customers (C setmins currentTSP)
 								droners = list( set(C) - set(tmpTSPtour) )
 
 								# 1a)  Check for unreachable drone customers
-								for temp_j in droners:
-									# Can we serve j?
-									canServe = False
-									for iii in range(0, len(tmpTSPtour)-1):
-										temp_i = tmpTSPtour[iii]
-										for kkk in [iii+1]:
-											temp_k = tmpTSPtour[kkk]
-											for temp_v in V:
-												if ([temp_i,temp_k] in Pprime[temp_v][temp_j]):
-													canServe = True
-													break
-									if not canServe:			
-										failed2reach.append(temp_j)	
+								tourCov.changeArcs([[i,j], [j,k]], [[i,l], [l,k]])
+								failed2reach = tourCov.unreachable(droners)
+								tourCov.changeArcs([[i,l], [l,k]], [[i,j], [j,k]])
 
 								if (len(failed2reach) == 0):
 									if len(V) >= 1:
-										[p3_status, p3_infeas_cust] = checkP2Feasibility(droners, tmpTSPtour, V, Pprime)
+										[p3_status, p3_infeas_cust] = P2checker.check(droners, tmpTSPtour)
 										if (p3_status == 1) and (len(tmpTSPtour) - 2 >= lowerTruckLimit):
 
 											minCost = tmpCost
@@ -715,28 +641,17 @@ def mfstsp_heuristic_1_partition(node, vehicle, travel, N, N_zero, N_plus, C, P,
 					if (tmpCost < minCost):
 
 						# Do the following check (P2 feasiblity) when it is worth doing it (meaning if all the previous checks are satisfied):
-						failed2reach = []
 						# create a list of drone customers (C setmins currentTSP)
 						droners = list( set(C) - set(tmpTSPtour) )
 
 						# 1a)  Check for unreachable drone customers
-						for temp_j in droners:
-							# Can we serve j?
-							canServe = False
-							for iii in range(0, len(tmpTSPtour)-1):
-								temp_i = tmpTSPtour[iii]
-								for kkk in [iii+1]:
-									temp_k = tmpTSPtour[kkk]
-									for temp_v in V:
-										if ([temp_i,temp_k] in Pprime[temp_v][temp_j]):
-											canServe = True
-											break
-							if not canServe:			
-								failed2reach.append(temp_j)	
+						tourCov.changeArcs([[i,j], [j,k], [k,l]], [[i,k], [k,j], [j,l]])
+						failed2reach = tourCov.unreachable(droners)
+						tourCov.changeArcs([[i,k], [k,j], [j,l]], [[i,j], [j,k], [k,l]])
 
 						if (len(failed2reach) == 0):
 							if len(V) >= 1:
-								[p3_status, p3_infeas_cust] = checkP2Feasibility(droners, tmpTSPtour, V, Pprime)
+								[p3_status, p3_infeas_cust] = P2checker.check(droners, tmpTSPtour)
 								if (p3_status == 1) and (len(tmpTSPtour) - 2 >= lowerTruckLimit):
 
 									bestTour = list(tmpTSPtour)
@@ -761,28 +676,15 @@ def mfstsp_heuristic_1_partition(node, vehicle, travel, N, N_zero, N_plus, C, P,
 				if (costNew - costOld < minCost):
 
 					# Do the following check (P2 feasiblity) when it is worth doing it (meaning if all the previous checks are satisfied):
-					failed2reach = []
 					# create a list of drone customers (C setmins currentTSP)
 					droners = list( set(C) - set(tmpTSPtour) )
 
 					# 1a)  Check for unreachable drone customers
-					for temp_j in droners:
-						# Can we serve j?
-						canServe = False
-						for iii in range(0, len(tmpTSPtour)-1):
-							temp_i = tmpTSPtour[iii]
-							for kkk in [iii+1]:
-								temp_k = tmpTSPtour[kkk]
-								for temp_v in V:
-									if ([temp_i,temp_k] in Pprime[temp_v][temp_j]):
-										canServe = True
-										break
-						if not canServe:			
-							failed2reach.append(temp_j)	
+					failed2reach = reach.unreachable(droners, tmpTSPtour)
 
 					if (len(failed2reach) == 0):
 						if len(V) >= 1:
-							[p3_status, p3_infeas_cust] = checkP2Feasibility(droners, tmpTSPtour, V, Pprime)
+							[p3_status, p3_infeas_cust] = P2checker.check(droners, tmpTSPtour)
 							if (p3_status == 1) and (len(tmpTSPtour) - 2 >= lowerTruckLimit):
 						
 								entireTSPtour = list(tmpTSPtour)
@@ -806,19 +708,19 @@ def mfstsp_heuristic_1_partition(node, vehicle, travel, N, N_zero, N_plus, C, P,
 				tmpTSPtour = list(TSPtour)
 				tmpTSPtour[insertionIndex] = newTruckCust
 				
+				[TSPobjVal, TSPassignments, TSPtour] = generateTSPinfo(tmpTSPtour, c, C, node, tau, sigma)
 				prevTSPtours.append(tmpTSPtour)
-				[TSPobjVal, TSPassignments, TSPtour] = generateTSPinfo(tmpTSPtour, c, C, node, tau, sigma)					
 			
 			elif (action == 'subtour'):
-				prevTSPtours.append(bestTour)
 				[TSPobjVal, TSPassignments, TSPtour] = generateTSPinfo(bestTour, c, C, node, tau, sigma)
+				prevTSPtours.append(bestTour)
 					
 				if (TSPobjVal < bestOFV):
 					foundTSP = True
 			
 			elif (action == 'entire'):
-				prevTSPtours.append(entireTSPtour)
 				[TSPobjVal, TSPassignments, TSPtour] = generateTSPinfo(entireTSPtour, c, C, node, tau, sigma)
+				prevTSPtours.append(entireTSPtour)
 
 				if (TSPobjVal < bestOFV):
 					foundTSP = True
@@ -66,27 +66,26 @@ def mfstsp_heuristic_2_asgn_uavs(node, eee, eeePrime, N_zero, N_plus, C, V, c, a
 	myX = []
 	myOrderedList = []
 	myOrderedList.append(0)	# Initialize with depot.
-	for vehicleID in assignments:
-		for statusID in assignments[vehicleID]:
-			for asgnIndex in assignments[vehicleID][statusID]:
-				if (assignments[vehicleID][statusID][asgnIndex].vehicleType == TYPE_TRUCK):		
-					if (statusID in [TRAVEL_TRUCK_W_UAV, TRAVEL_TRUCK_EMPTY]):
-						i = assignments[vehicleID][statusID][asgnIndex].startNodeID
-						j = assignments[vehicleID][statusID][asgnIndex].endNodeID
-						
-						if (j not in customersTruck):
-							# When we solve the TSP, we only use a subset of nodes.  
-							# This causes the TSP solution to return a final node that's not c+1.
-							j = c+1
-							bigM = assignments[vehicleID][statusID][asgnIndex].endTime
-
-						myX.append([i,j])
-						if i == 0:
-							t[i] = assignments[vehicleID][statusID][asgnIndex].startTime
-						t[j] = assignments[vehicleID][statusID][asgnIndex].endTime
-						
-						if (j in C):
-							myOrderedList.append(j)	
+	# NOTE:  assignments is an assignmentTable (see records.py).
+	for row in assignments.grouped():
+		if (assignments.vehicleType[row] == TYPE_TRUCK):		
+			if (assignments.statusID[row] in [TRAVEL_TRUCK_W_UAV, TRAVEL_TRUCK_EMPTY]):
+				i = assignments.startNodeID[row]
+				j = assignments.endNodeID[row]
+				
+				if (j not in customersTruck):
+					# When we solve the TSP, we only use a subset of nodes.  
+					# This causes the TSP solution to return a final node that's not c+1.
+					j = c+1
+					bigM = assignments.endTime[row]
+
+				myX.append([i,j])
+				if i == 0:
+					t[i] = assignments.startTime[row]
+				t[j] = assignments.endTime[row]
+				
+				if (j in C):
+					myOrderedList.append(j)	
 	myOrderedList.append(c+1)
 	
 	# Reset N_zero -- Should only include customers visted by the truck, plus depot 0.	
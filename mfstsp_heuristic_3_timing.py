@@ -7,6 +7,8 @@ import math
 from parseCSV import *
 from gurobipy import *
 from collections import defaultdict
+from phase3_model import *
+from phase3_schedule import *
 
 # =============================================================
 NODE_TYPE_DEPOT		= 0
@@ -35,6 +37,10 @@ GANTT_RECOVER	= 4
 GANTT_LAUNCH	= 5
 GANTT_FINISHED	= 6
 
+# P3type (How Phase III is solved)
+P3_TYPE_MIP 			= 1		# Gurobi, via phase3Model (phase3_model.py)
+P3_TYPE_COMBINATORIAL 	= 2		# Branch-and-bound over the launch/recovery orders, via phase3Schedule (phase3_schedule.py).  Falls back to the MIP if there are too many orders.
+
 # There's a package color that corresponds to the VEHICLE that delivered the package.
 # Right now we only have 5 boxes (so we can have at most 5 trucks).
 packageIcons		= ['box_yellow_centered.gltf', 'box_blue_centered.gltf', 'box_orange_centered.gltf', 'box_green_centered.gltf', 'box_gray_centered.gltf', 'box_brown_centered.gltf']
@@ -53,8 +59,9 @@ def make_dict():
 	# tau[v][i][j] = 44
 
 
-def mfstsp_heuristic_3_timing(x, y, z, node, eee, N, P, V, cutoffTime, c, sigma, sigmaprime, tau, tauprime, minDistance, sR, sL, vehicle, travel, REQUIRE_TRUCK_AT_DEPOT, REQUIRE_DRIVER, optLowBnd):
+def mfstsp_heuristic_3_timing(x, y, z, node, eee, N, P, V, cutoffTime, c, sigma, sigmaprime, tau, tauprime, minDistance, sR, sL, vehicle, travel, REQUIRE_TRUCK_AT_DEPOT, REQUIRE_DRIVER, optLowBnd, P3model=None, P3type=P3_TYPE_MIP):
 	# Solve P3 here using Gurobi (Line 3 in Algorithm 6)
+	# If P3type is P3_TYPE_COMBINATORIAL, try the combinatorial solver in phase3_schedule.py first.
 
 	# Find the cost of inserting truck customers:
 	insertCost = {}
@@ -108,363 +115,55 @@ def mfstsp_heuristic_3_timing(x, y, z, node, eee, N, P, V, cutoffTime, c, sigma,
 		landsat[k].append(v)
 		
 		
-	# 2) GUROBI
-	# Model
-	m = Model("phase3")
-
-	# Tell Gurobi not to print to a log file
-	m.params.OutputFlag = 0
+	# 2) COMBINATORIAL SOLVER
+	# Without Gurobi, if there aren't too many launch/recovery orders to try:
+	P3schedule = None
+	if (P3type == P3_TYPE_COMBINATORIAL):
+		P3schedule = phase3Schedule()
+		if (not P3schedule.solve(x, y, N, C, V, c, sigma, sigmaprime, tau, tauprime, sR, sL, eee, REQUIRE_TRUCK_AT_DEPOT, REQUIRE_DRIVER, N_zero, N_plus, launchesfrom, landsat)):
+			P3schedule = None
 
+	if (P3schedule is not None):
+		m = P3schedule
 
-	# a) Decision Variable Definitions and Objective Function:
+		decvarcheckt 	= P3schedule.decvarcheckt
+		decvarbart 		= P3schedule.decvarbart
+		decvarhatt 		= P3schedule.decvarhatt
 
-	decvarcheckt 	= defaultdict(make_dict)
-	decvarbart 		= defaultdict(make_dict)
-	decvarhatt 		= defaultdict(make_dict)
+		decvarchecktprime 	= P3schedule.decvarchecktprime
+		decvarhattprime 	= P3schedule.decvarhattprime
 
-	decvarchecktprime 	= defaultdict(make_dict)
-	decvarhattprime 	= defaultdict(make_dict)
+		decvarzhat		= P3schedule.decvarzhat
 
-	decvarzl 		= defaultdict(make_dict)
-	decvarzr 		= defaultdict(make_dict)
-	decvarzprime 	= defaultdict(make_dict)
-	decvarzdp 		= defaultdict(make_dict)
-	decvarzhat		= {}
-	
-
-	RELAX = False
-	if (RELAX):
-		myVtype = GRB.CONTINUOUS
-	else:
-		myVtype = GRB.BINARY
-					
-	
-	for i in N:
-		if (i in C):
-			decvarzhat[i] = m.addVar(lb = 0, ub = 1, obj = optLowBnd + 10*insertCost[i], vtype = GRB.BINARY, name = "hatz.%d" % (i))
-			
-		if (REQUIRE_TRUCK_AT_DEPOT):
-			if (i == c+1):
-				# This is our only term in the objective function (for hatt):
-				decvarhatt[i] = m.addVar(lb = 0, obj=1, vtype=GRB.CONTINUOUS, name="hatt.%d" % (i))
-				decvarbart[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="bart.%d" % (i))			
-				decvarcheckt[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="checkt.%d" % (i))			
-	
-			elif (i == 0):
-				# DON'T Hard-code \hat{t}_{0} = 0.
-				# However, \check{t}_{0} = \bar{t}_{0} = 0
-				decvarhatt[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="hatt.%d" % (i))			
-				decvarbart[i] = m.addVar(lb = 0, ub = 0, obj=0, vtype=GRB.CONTINUOUS, name="bart.%d" % (i))			
-				decvarcheckt[i] = m.addVar(lb = 0, ub = 0, obj=0, vtype=GRB.CONTINUOUS, name="checkt.%d" % (i))			
-	
-			elif (i not in C):
-				# Just a regular non-negative continuous decision variable:
-				decvarhatt[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="hatt.%d" % (i))
-				decvarbart[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="bart.%d" % (i))			
-				decvarcheckt[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="checkt.%d" % (i))			
-		
+		if (P3schedule.isFeasible):
+			p3Status = GRB.OPTIMAL
 		else:
-			if (i == c+1):
-				# This is our only term in the objective function (for hatt):
-				decvarhatt[i] = m.addVar(lb = 0, obj=1, vtype=GRB.CONTINUOUS, name="hatt.%d" % (i))
-				decvarbart[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="bart.%d" % (i))			
-				decvarcheckt[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="checkt.%d" % (i))			
-	
-			elif (i == 0):
-				# Hard-code \hat{t}_{0} = \check{t}_{0} = \bar{t}_{0} = 0:
-				decvarhatt[i] = m.addVar(lb = 0, ub = 0, obj=0, vtype=GRB.CONTINUOUS, name="hatt.%d" % (i))			
-				decvarbart[i] = m.addVar(lb = 0, ub = 0, obj=0, vtype=GRB.CONTINUOUS, name="bart.%d" % (i))			
-				decvarcheckt[i] = m.addVar(lb = 0, ub = 0, obj=0, vtype=GRB.CONTINUOUS, name="checkt.%d" % (i))			
-	
-			elif (i not in C):
-				# Just a regular non-negative continuous decision variable:
-				decvarhatt[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="hatt.%d" % (i))
-				decvarbart[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="bart.%d" % (i))			
-				decvarcheckt[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="checkt.%d" % (i))			
-
-	for v in V:
-		# Hard-code to zero:
-		decvarchecktprime[v][0] = m.addVar(lb = 0, ub=0, obj=0, vtype=GRB.CONTINUOUS, name="checktprime.%d.0" % (v))
+			p3Status = GRB.INFEASIBLE
 
-	for k in N:
-		for v in V:
-			if ((v in landsat[k]) or (v in launchesfrom[k])):
-				if (k != 0):
-					decvarchecktprime[v][k] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="checktprime.%d.%d" % (v, k))
-				decvarhattprime[v][k] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="hattprime.%d.%d" % (v, k))
-
-	for [v,i,j,k] in y:
-		decvarchecktprime[v][j] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="checktprime.%d.%d" % (v, j))
-		decvarhattprime[v][j] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="hattprime.%d.%d" % (v, j))
-					
-
-	if (REQUIRE_DRIVER):
-		for v in V:
-			# Hardcode z^{R}_{v, 0, c+1} = 0 for all v in V:
-			decvarzr[v][0][c+1] = m.addVar(lb = 0, ub = 0, obj = 0, vtype=myVtype, name="zr.%d.0.%d" % (v,c+1))
-			if (REQUIRE_TRUCK_AT_DEPOT):
-				# DON'T Hardcode z^{L}_{v, 0, 0} = 0 for all v in V:
-				decvarzl[v][0][0] = m.addVar(lb = 0, ub = 1, obj = 0, vtype=myVtype, name="zl.%d.0.0" % (v))
-			else:
-				# Hardcode z^{L}_{v, 0, 0} = 0 for all v in V:
-				decvarzl[v][0][0] = m.addVar(lb = 0, ub = 0, obj = 0, vtype=myVtype, name="zl.%d.0.0" % (v))
-	
-			
-	for k in N_plus:
-		if (REQUIRE_DRIVER):
-			zzz = set().union([0], landsat[k])
-		else:
-			zzz = landsat[k]
-		for v1 in zzz:
-			for v2 in zzz:
-				if (v1 != v2):
-					if not ((v2 == 0) and (k == c+1 or k == 0)):
-						decvarzr[v1][v2][k] = m.addVar(lb = 0, ub = 1, obj = 0, vtype=myVtype, name="zr.%d.%d.%d" % (v1,v2,k))
-						
+	else:
+		# 3) GUROBI
+		# The model is kept in P3model between calls.  If only the sorties changed since the last call,
+		# just the parts of the model that touch those sorties are rebuilt (see phase3_model.py):
+		if (P3model is None):
+			P3model = phase3Model()
+		P3model.update(x, y, node, V, cutoffTime, c, sigma, sigmaprime, tau, tauprime, minDistance, sR, sL, eee, REQUIRE_TRUCK_AT_DEPOT, REQUIRE_DRIVER, optLowBnd, insertCost, N, N_zero, N_plus, C, A, B, launchesfrom, landsat)
 
-	for i in N_zero:
-		if (REQUIRE_DRIVER):
-			zzz = set().union([0], launchesfrom[i])
-		else:
-			zzz = launchesfrom[i]	
-		for v1 in zzz:
-			for v2 in zzz:
-				if (v1 != v2):
-					if not (v2 == 0 and (i == c+1 or i == 0)):
-						decvarzl[v1][v2][i] = m.addVar(lb = 0, ub = 1, obj = 0, vtype=myVtype, name="zl.%d.%d.%d" % (v1,v2,i))
+		m = P3model.m
 
-					
-	for i in N_plus:
-		if (i != 0):
-			for v1 in launchesfrom[i]:
-				for v2 in landsat[i]:
-					# NOTE:  v1 can equal v2, since v can land at and then launch from the same location.
-					decvarzprime[v1][v2][i] = m.addVar(lb = 0, ub = 1, obj = 0, vtype=myVtype, name="zprime.%d.%d.%d" % (v1,v2,i))
-			for v1 in landsat[i]:
-				for v2 in launchesfrom[i]:
-					# NOTE:  v1 can equal v2, since v can land at and then launch from the same location.
-					decvarzdp[v1][v2][i] = m.addVar(lb = 0, ub = 1, obj = 0, vtype=myVtype, name="zdp.%d.%d.%d" % (v1,v2,i))
-					
+		decvarcheckt 	= P3model.decvarcheckt
+		decvarbart 		= P3model.decvarbart
+		decvarhatt 		= P3model.decvarhatt
 
-	
-	# Define M
-	M = 0		# Initialize
-	unvisitedCustomers = list(range(1,c+1))   # We haven't visited anyone yet.	
-	i = 0		# Start at the depot
+		decvarchecktprime 	= P3model.decvarchecktprime
+		decvarhattprime 	= P3model.decvarhattprime
 
-	while (len(unvisitedCustomers) > 0):
-		# Find the nearest customer.
-		# Break ties by selecting the customer with the smallest node number
-		
-		# minDistance = max(max(tau))		# Initialize to a big value  
-		# We found this value earlier
-		tmpMinDist = minDistance
-		for j in unvisitedCustomers:
-			if (tau[i][j] <= tmpMinDist):
-				tmpMinDist = tau[i][j]
-				jstar = j
-				
-		M += tau[i][jstar] + node[jstar].serviceTimeTruck
-		unvisitedCustomers.remove(jstar)
-		i = jstar
-	
-	# Route back to the depot:
-	M += tau[i][c+1]
+		decvarzhat		= P3model.decvarzhat
 
 		
-	# The objective is to minimize the total travel distance.
-	m.modelSense = GRB.MINIMIZE
-		
-	# Give Gurobi a time limit
-	if (cutoffTime > 0):
-		m.params.TimeLimit = cutoffTime
-	
-	# Set a tolerance for MIP gap
-	m.params.MIPgap = 0.03	# 3%
-	
-	# Update model to integrate new variables
-	m.update()
-
-	# Start adding constraints:
-
-	for k in N_plus:
-		for v in landsat[k]:
-			if (REQUIRE_TRUCK_AT_DEPOT):
-				# Constraint (76):
-				m.addConstr(decvarchecktprime[v][k] >= decvarcheckt[k] + sR[v][k] - M*decvarzhat[B[v][k]], "Constr.72.%d.%d" % (v,k))		
-				if (REQUIRE_DRIVER):
-					# Constraint (77):	
-					m.addConstr(decvarchecktprime[v][k] >= decvarbart[k] + sR[v][k] - M*(1 - decvarzr[0][v][k]), "Constr.73.%d.%d" % (v,k))			
-
-			elif (k != c+1):
-				# Constraint (76): We don't require the truck to be at the depot for landing.  Ignore when k == c+1
-				m.addConstr(decvarchecktprime[v][k] >= decvarcheckt[k] + sR[v][k] -M*decvarzhat[B[v][k]], "Constr.72.%d.%d" % (v,k))
-				if (REQUIRE_DRIVER):
-					# Constraint (77):
-					m.addConstr(decvarchecktprime[v][k] >= decvarbart[k] + sR[v][k] - M*(1 - decvarzr[0][v][k]), "Constr.73.%d.%d" % (v,k))		
-
-			for v2 in landsat[k]:
-				if (v2 != v):
-					# Constraint (78):
-					m.addConstr(decvarchecktprime[v][k] >= decvarchecktprime[v2][k] + sR[v][k] - M*(1 - decvarzr[v2][v][k]), "Constr.74.%d.%d.%d" % (v,v2,k))
-			
-			if (k != c+1):
-				for v2 in launchesfrom[k]:
-					if (v2 != v):
-						# Constraint (79):
-						m.addConstr(decvarchecktprime[v][k] >= decvarhattprime[v2][k] + sR[v][k] - M*(1 - decvarzprime[v2][v][k]), "Constr.75.%d.%d.%d" % (v,v2,k))	
-
-	for [v,i,j,k] in y:
-		# Constraint (80):
-		m.addConstr(decvarchecktprime[v][k] >= decvarhattprime[v][j] + (tauprime[v][j][k] + sR[v][k])*(1-decvarzhat[j]), "Constr.76.%d.%d.%d" % (v,k,j))
+		# Solve
+		m.optimize()
 
-		# Constraint (72):	
-		m.addConstr(decvarchecktprime[v][j] >= decvarhattprime[v][i] + tauprime[v][i][j]*(1-decvarzhat[j]), "Constr.70.%d.%d.%d" % (v,j,i))
-
-		# Constraint (73):
-		m.addConstr(decvarchecktprime[v][j] <= decvarhattprime[v][i] + tauprime[v][i][j] + M*(decvarzhat[j]), "Constr.70b.%d.%d.%d" % (v,j,i))
-
-		# Constraint (74):
-		m.addConstr(decvarhattprime[v][j] >= decvarchecktprime[v][j] + sigmaprime[j]*(1-decvarzhat[j]), "Constr.71.%d.%d" % (v,j))
-
-		# Constraint (75):
-		m.addConstr(decvarhattprime[v][j] <= decvarchecktprime[v][j] + sigmaprime[j] + M*(decvarzhat[j]), "Constr.71b.%d.%d" % (v,j))
-
-		# Constraint (81):	
-		m.addConstr(decvarchecktprime[v][k] - sR[v][k] - decvarhattprime[v][i] <= eee[v][i][j][k], "Constr.77.%d.%d.%d" % (v,i,k))	
-
-
-	for i in N_zero:
-		for v in launchesfrom[i]:
-			# Constraint (67):
-			m.addConstr(decvarhattprime[v][i] >= decvarchecktprime[v][i] + sL[v][i]*(1-decvarzhat[A[v][i]]), "Constr.65.%d.%d" % (v,i))	
-			
-			if (REQUIRE_DRIVER):
-				# Constraint (68):
-				m.addConstr(decvarhattprime[v][i] >= decvarcheckt[i] + sL[v][i] - M*(1 - decvarzl[v][0][i]), "Constr.66.%d.%d" % (v,i))
-
-				# Constraint (69):
-				m.addConstr(decvarhattprime[v][i] >= decvarbart[i] + sL[v][i] - M*(1 - decvarzl[0][v][i]), "Constr.67.%d.%d" % (v,i))			
-			
-			else:
-				# Constraint (108):
-				m.addConstr(decvarhattprime[v][i] >= decvarcheckt[i] + sL[v][i] - M*(decvarzhat[A[v][i]]), "Constr.104.%d.%d" % (v,i))
-			
-			for v2 in launchesfrom[i]:
-				if (v2 != v):
-					# Constraint (70):
-					m.addConstr(decvarhattprime[v][i] >= decvarhattprime[v2][i] + sL[v][i] - M*(1 - decvarzl[v2][v][i]), "Constr.68.%d.%d.%d" % (v,v2,i))			
-
-		if (i != 0):
-			for v in landsat[i]:
-				for v2 in launchesfrom[i]:
-					if (v2 != v):
-						# Constraint (71):
-						m.addConstr(decvarhattprime[v2][i] >= decvarchecktprime[v][i] + sL[v2][i] - M*(1 - decvarzdp[v][v2][i]), "Constr.69.%d.%d.%d" % (v,v2,i))	
-
-
-	for [i,j] in x:
-		# Constraint (82):
-		m.addConstr(decvarcheckt[j] >= decvarhatt[i] + tau[i][j], "Constr.78.%d.%d" % (i,j))	
-
-
-	for k in N_plus:
-		# Constraint (87):
-		m.addConstr(decvarhatt[k] >= decvarbart[k], "Constr.83.%d" % (k))			
-
-		if (k != c+1):
-			# Constraint (83):
-			m.addConstr(decvarbart[k] >= decvarcheckt[k] + sigma[k], "Constr.79.%d" % (k))	
-
-			for v in launchesfrom[k]:
-				# Constraint (89):
-				m.addConstr(decvarhatt[k] >= decvarhattprime[v][k], "Constr.85.%d.%d" % (v, k))
-
-				if (REQUIRE_DRIVER):
-					# Constraint (86):
-					m.addConstr(decvarbart[k] >= decvarhattprime[v][k] + sigma[k] - M*(1 - decvarzl[v][0][k]), "Constr.82.%d" % (k))			
-
-		else:
-			# Constraint (84):
-			m.addConstr(decvarbart[k] >= decvarcheckt[k], "Constr.80.%d" % (k))	
-	
-		for v in landsat[k]:
-			# Constraint (88):
-			m.addConstr(decvarhatt[k] >= decvarchecktprime[v][k], "Constr.84.%d.%d" % (v,k))
-
-			if (REQUIRE_DRIVER):
-				# Constraint (85):
-				m.addConstr(decvarbart[k] >= decvarchecktprime[v][k] + sigma[k] - M*(1 - decvarzr[v][0][k]), "Constr.81.%d" % (k))
-
-				# Constraint (91):
-				m.addConstr(decvarzr[0][v][k] + decvarzr[v][0][k] + decvarzhat[B[v][k]] == 1, "Constr.87.%d.%d" % (v,k))
-
-			for v2 in landsat[k]:
-				if (v2 != v):
-					# Constraint (92):
-					m.addConstr(decvarzr[v][v2][k] + decvarzr[v2][v][k] <= 1, "Constr.88.%d.%d.%d" % (v,v2,k))
-
-					# Constraint (93):	
-					m.addConstr(decvarzr[v][v2][k] + decvarzr[v2][v][k] + decvarzhat[B[v][k]] + decvarzhat[B[v2][k]] >= 1, "Constr.89.%d.%d.%d" % (v,v2,k))	
-
-
-	for i in N_zero:
-		for v in launchesfrom[i]:
-			if (REQUIRE_DRIVER):
-				# Constraint (94):
-				m.addConstr(decvarzl[0][v][i] + decvarzl[v][0][i] + decvarzhat[A[v][i]] == 1, "Constr.90.%d.%d" % (v,i))
-
-			for v2 in launchesfrom[i]:
-				if (v2 != v):
-					# Constraint (95):
-					m.addConstr(decvarzl[v][v2][i] + decvarzl[v2][v][i] <= 1, "Constr.91.%d.%d.%d" % (v,v2,i))
-
-					# Constraint (96):	
-					m.addConstr(decvarzl[v][v2][i] + decvarzl[v2][v][i] + decvarzhat[A[v][i]] + decvarzhat[A[v2][i]] >= 1, "Constr.92.%d.%d.%d" % (v,v2,i))	
-	
-
-	for k in N_zero:
-		if (k != 0):
-			for v in landsat[k]:
-				for v2 in launchesfrom[k]:
-					if (v2 != v):
-						# Constraint (98):
-						m.addConstr(decvarzprime[v2][v][k] + decvarzdp[v][v2][k] <= 1, "Constr.94.%d.%d.%d" % (v,v2,k))
-
-						# Constraint (97):
-						m.addConstr(decvarzprime[v2][v][k] + decvarzdp[v][v2][k] + decvarzhat[B[v][k]] + decvarzhat[A[v2][k]] >= 1, "Constr.93.%d.%d.%d" % (v,v2,k))	
-
-
-	for k in N_plus:
-		if (REQUIRE_TRUCK_AT_DEPOT):
-			tmpSL = 0
-			for v in launchesfrom[k]:
-				tmpSL += sL[v][k]*(1-decvarzhat[A[v][k]])
-			tmpSR = 0
-			for v in landsat[k]:
-				tmpSR += sR[v][k]*(1-decvarzhat[B[v][k]])
-			# Constraint (99):
-			m.addConstr(decvarhatt[k] >= decvarcheckt[k] + tmpSL + tmpSR, "Constr.95.%d" % (k))
-
-		elif (k != c+1):
-			tmpSL = 0
-			for v in launchesfrom[k]:
-				tmpSL += sL[v][k]*(1-decvarzhat[A[v][k]])
-			tmpSR = 0
-			for v in landsat[k]:
-				tmpSR += sR[v][k]*(1-decvarzhat[B[v][k]])
-			# Constraint (99):
-			m.addConstr(decvarhatt[k] >= decvarcheckt[k] + tmpSL + tmpSR, "Constr.95.%d" % (k))
-
-
-	if (REQUIRE_TRUCK_AT_DEPOT):
-		for v in launchesfrom[0]:
-			# Constraint (90):
-			m.addConstr(decvarhatt[0] >= decvarhattprime[v][0], "Constr.86.%d" % (v))	
-
-	
-	# Solve
-	m.optimize()
+		p3Status = m.Status
 
 	ls_hatt = {}
 	ls_checkt = {}
@@ -472,7 +171,7 @@ def mfstsp_heuristic_3_timing(x, y, z, node, eee, N, P, V, cutoffTime, c, sigma,
 	
 
 	# Need to build the TSP solution in order
-	if (m.Status == GRB.INFEASIBLE):
+	if (p3Status == GRB.INFEASIBLE):
 		# NO FEASIBLE SOLUTION
 		# print("P3 IS INFEASIBLE")
 
@@ -484,7 +183,7 @@ def mfstsp_heuristic_3_timing(x, y, z, node, eee, N, P, V, cutoffTime, c, sigma,
 		waitingUAV			= -1
 		waitingArray 		= {}					
 
-	elif ((m.Status == GRB.TIME_LIMIT) and (m.objVal > 1e30)):
+	elif ((p3Status == GRB.TIME_LIMIT) and (m.objVal > 1e30)):
 		# NO FEASIBLE SOLUTION WAS FOUND (maybe one exists, but we ran out of time)
 		# print("P3 Time Limit Reached")
 		
@@ -496,7 +195,7 @@ def mfstsp_heuristic_3_timing(x, y, z, node, eee, N, P, V, cutoffTime, c, sigma,
 		waitingUAV				= -1
 		waitingArray 			= {}
 
-	elif (m.Status == GRB.CUTOFF):
+	elif (p3Status == GRB.CUTOFF):
 		# Lower bound is greater than current incumbent.
 		# print("P3 Objective bound is worse than CutOff")
 		
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+
+import numpy as np
+
+# This file contains the matrices that are indexed by node IDs (e.g., travel[v][i][j], tau[i][j],
+# tauprime[v][i][j], eee[v][i][j][k], eeePrime[v][i][k], sL[v][i], and sR[v][k]).
+#
+# Node IDs are 0, 1, ..., c (and c+1, the copy of the depot), so rather than nesting dictionaries,
+# each matrix is built all at once as a NumPy array with one row (column) per node ID.
+# Reading one entry of a Python list is much faster than reading one entry of a NumPy array, so
+# each matrix is also a list of its rows.  m[i][j] is just two list lookups, and m.array holds the
+# same numbers for vectorized code.
+#
+# Entries that aren't defined (e.g., tau[c+1][j], or eee[v][i][j][k] when v can't carry j's parcel)
+# are NaN.  Unlike defaultdict(make_dict), reading an entry never adds it to the matrix.
+#
+# These matrices are read-only, so vehicles with identical parameters share them (see vehicle_classes.py).
+
+# The fields of a make_travel object (in the order make_travel() takes them):
+TRAVEL_FIELDS = ['takeoffTime', 'flyTime', 'landTime', 'totalTime', 'takeoffDistance', 'flyDistance', 'landDistance', 'totalDistance']
+
+
+class nodeMatrix(list):
+	def __init__(self, array):
+		self.array = np.asarray(array, dtype=np.float64)
+		list.__init__(self, self.array.tolist())
+
+
+class travelMatrix(list):
+	def __init__(self, fields, makeTravel):
+		# travel[v] for one vehicle.
+		# fields is an array (or list) of 8 NxN matrices, in the order of TRAVEL_FIELDS.
+		# travel[v][i][j] is a makeTravel object (or None, if we have no data for i --> j),
+		# and travel[v].totalTime[i,j] (etc.) is the NumPy array of each field.
+		self.fields = np.asarray(fields, dtype=np.float64)
+		for f in range(0,len(TRAVEL_FIELDS)):
+			setattr(self, TRAVEL_FIELDS[f], self.fields[f])
+
+		values = [field.tolist() for field in self.fields]
+		for i in range(0,self.fields.shape[1]):
+			row = []
+			for entry in zip(*[field[i] for field in values]):
+				if (entry[3] != entry[3]):
+					# totalTime is NaN
+					row.append(None)
+				else:
+					row.append(makeTravel(*entry))
+			self.append(row)
+
+
+def withDepotCopy(matrix, c):
+	# matrix is indexed by the nodes [0, 1, ..., c] (in its last two dimensions).
+	# Returns a copy that is indexed by [0, 1, ..., c+1], where node c+1 is the depot at the end of the tour.
+	# Node c+1 is only a destination, so matrix[c+1][j] is NaN, and matrix[i][c+1] = matrix[i][0].
+	matrix = np.asarray(matrix, dtype=np.float64)
+	newMatrix = np.full(matrix.shape[:-2] + (c+2, c+2), np.nan)
+	newMatrix[..., 0:c+1, 0:c+1] = matrix[..., 0:c+1, 0:c+1]
+	newMatrix[..., 0:c+1, c+1] = matrix[..., 0:c+1, 0]
+
+	return newMatrix
@@ -1 +1 @@
-'''Created on April 2, 2014@author: Jacob Conaway@author: David Jones '''import csvdef parseCSV(filename, returnJagged=False, fillerValue=-1, delimiter=',', commentChar='%'):	with open(filename, "U") as csvfile:		csvFile = csvfile.readlines()		matrix = []		maxSize = 0		for line in csvFile:			if(line.startswith(commentChar)):				# Got to next line				continue			row = list(map(float, filter(None, line.rstrip().split(delimiter))))			matrix.append(row)			if (len(row) > maxSize):				maxSize = len(row)		if(not(returnJagged)):			for row in matrix:    				row += [fillerValue] * (maxSize - len(row))		if (len(matrix) == 1):			# This is a vector, just return a 1-D vector			matrix = matrix[0]					return matrix        def printMatrix(matrix):	for row in matrix:		for cell in row:			print(cell),
\ No newline at end of file
+'''Created on April 2, 2014@author: Jacob Conaway@author: David Jones '''import csvimport numpy as npdef readCSVrows(filename, convert=float, delimiter=',', commentChar='%'):	# Yields the rows of filename one at a time (as lists of convert(field)), skipping comment lines.	# NOTE:  Empty fields are dropped, so a blank line is an empty row.	with open(filename, "r") as csvfile:		for line in csvfile:			if(line.startswith(commentChar)):				# Got to next line				continue			yield list(map(convert, filter(None, line.rstrip().split(delimiter))))def parseCSV(filename, returnJagged=False, fillerValue=-1, delimiter=',', commentChar='%'):	matrix = []	maxSize = 0	for row in readCSVrows(filename, float, delimiter, commentChar):		matrix.append(row)		if (len(row) > maxSize):			maxSize = len(row)	if(not(returnJagged)):		for row in matrix:    			row += [fillerValue] * (maxSize - len(row))	if (len(matrix) == 1):		# This is a vector, just return a 1-D vector		matrix = matrix[0]				return matrixdef parseCSVarray(filename, fillerValue=-1, delimiter=',', commentChar='%'):	# Same as parseCSV (with returnJagged=False), but returns a 2-D NumPy array of floats	# (one row per line, even if there is only one line).	# Files with the same number of fields on every line (e.g., tbl_truck_travel_data_PG.csv) are	# streamed straight into the array by NumPy's parser.  Anything else (short rows, empty fields,	# or blank lines) falls back to parseCSV's rules, and short rows are padded with fillerValue.	hasBlankLines = [False]	def dataLines():		with open(filename, "r") as csvfile:			for line in csvfile:				if(line.startswith(commentChar)):					continue				if (line.strip() == ''):					hasBlankLines[0] = True				yield line	try:		matrix = np.loadtxt(dataLines(), dtype=np.float64, delimiter=delimiter, comments=None, ndmin=2)		if (not hasBlankLines[0]):			return matrix	except ValueError:		pass	matrix = list(readCSVrows(filename, float, delimiter, commentChar))	maxSize = max([len(row) for row in matrix] + [0])	return np.array([row + [fillerValue] * (maxSize - len(row)) for row in matrix], dtype=np.float64).reshape((len(matrix), maxSize))def printMatrix(matrix):	for row in matrix:		for cell in row:			print(cell),
\ No newline at end of file
@@ -0,0 +1,501 @@
+#!/usr/bin/env python
+
+from gurobipy import *
+from collections import defaultdict
+
+
+# This file contains the (P3) timing model of the heuristic, which is kept between calls
+# to mfstsp_heuristic_3_timing().
+#
+# After Phase III is solved, the local search in solve_mfstsp_heuristic moves the recovery
+# point of a few sorties and re-solves (P3) with the same truck tour.  Rather than building
+# a new model each time, we split the model into blocks:
+#	- The "truck" block holds everything that only depends on the truck tour (x) and on the
+#	  set of UAV customers:  zhat, checkt, bart and hatt, and Constraint (82).
+#	- The block of node n holds everything at node n that depends on which UAVs launch from
+#	  or land at n:  checktprime[v][n], hattprime[v][n], zl, zr, zprime and zdp at n, and
+#	  the constraints indexed by n.
+#	- The block of sortie [v,i,j,k] holds checktprime[v][j] and hattprime[v][j], and
+#	  Constraints (72)-(75), (80) and (81).  These constraints use the variables of the blocks
+#	  of nodes i and k.
+# If the truck tour (or anything else in the truck block) changes, we build a new model.
+# Otherwise, we only rebuild the blocks of the nodes where a sortie was added or removed,
+# and the blocks of the sorties that launch from or land at those nodes.
+#
+# NOTE:  A patched model has the same variables and constraints as a new one, but not in the same order,
+#		 and Gurobi only solves (P3) to within its MIP gap (3%).  So a re-solve after a local search move
+#		 can find a different makespan than a new model would.  The incumbent (and so the LTLs that are
+#		 pruned, and the heuristic's final solution) can then change.
+
+
+def make_dict():
+	return defaultdict(make_dict)
+
+
+class phase3Model:
+	def __init__(self):
+		self.m 			= None
+		self.modelKey 	= None		# Everything (other than y) that the model depends on
+		self.y 			= set()		# y = {(v, i, j, k), ...}, the sorties in the model
+		self.blocks 	= {}		# blocks[('node', n)] or blocks[('sortie', v, i, j, k)] = [[home, key, var], ...], [constr, ...]
+
+	def addVar(self, block, home, key, lb, ub, obj, vtype, name):
+		# Add a variable to the model, store it in home[key], and remember that it belongs to block
+		home[key] = self.m.addVar(lb = lb, ub = ub, obj = obj, vtype = vtype, name = name)
+		self.blocks[block][0].append([home, key, home[key]])
+
+	def addConstr(self, block, constr, name):
+		self.blocks[block][1].append(self.m.addConstr(constr, name))
+
+	def removeBlock(self, block):
+		[myVars, myConstrs] = self.blocks.pop(block)
+		self.m.remove(myConstrs)
+		self.m.remove([var for [home, key, var] in myVars])
+		for [home, key, var] in myVars:
+			if (home.get(key) is var):
+				del home[key]
+
+	def update(self, x, y, node, V, cutoffTime, c, sigma, sigmaprime, tau, tauprime, minDistance, sR, sL, eee, REQUIRE_TRUCK_AT_DEPOT, REQUIRE_DRIVER, optLowBnd, insertCost, N, N_zero, N_plus, C, A, B, launchesfrom, landsat):
+		# Bring the model up to date with the given truck tour (x) and sorties (y)
+		self.N_zero 	= N_zero
+		self.N_plus 	= N_plus
+		self.A 			= A
+		self.B 			= B
+		self.launchesfrom = launchesfrom
+		self.landsat 	= landsat
+		self.sigma 		= sigma
+		self.sigmaprime = sigmaprime
+		self.tauprime 	= tauprime
+		self.sR 		= sR
+		self.sL 		= sL
+		self.eee 		= eee
+		self.V 			= V
+		self.c 			= c
+		self.REQUIRE_TRUCK_AT_DEPOT = REQUIRE_TRUCK_AT_DEPOT
+		self.REQUIRE_DRIVER 		= REQUIRE_DRIVER
+
+		modelKey = (tuple([tuple(arc) for arc in x]), tuple(sorted(C)), tuple(V), optLowBnd, cutoffTime, REQUIRE_TRUCK_AT_DEPOT, REQUIRE_DRIVER)
+		newY = set([tuple(sortie) for sortie in y])
+
+		newModel = (modelKey != self.modelKey)
+		if (newModel):
+			self.modelKey = modelKey
+			self.buildTruck(x, node, cutoffTime, tau, minDistance, optLowBnd, insertCost, N, C)
+			dirtyNodes = set().union(N_zero, N_plus)
+			addSorties = [sortie for sortie in y]
+		else:
+			changed = newY.symmetric_difference(self.y)
+			dirtyNodes = set([i for (v,i,j,k) in changed] + [k for (v,i,j,k) in changed])
+			addSorties = [[v,i,j,k] for [v,i,j,k] in y if (((v,i,j,k) not in self.y) or (i in dirtyNodes) or (k in dirtyNodes))]
+
+			for (v,i,j,k) in self.y:
+				if (((v,i,j,k) not in newY) or (i in dirtyNodes) or (k in dirtyNodes)):
+					self.removeBlock(('sortie', v, i, j, k))
+			for n in dirtyNodes:
+				self.removeBlock(('node', n))
+
+		self.y = newY
+
+		# Add the new blocks.  We add them one part at a time (e.g., the zr variables of every node, and then
+		# the zl variables of every node), so that a new model lists its variables and constraints in the
+		# same order as the original (P3) model did:
+		dirtyNodes = [n for n in N if n in dirtyNodes]
+		dirtyN_zero = [n for n in N_zero if n in dirtyNodes]
+		dirtyN_plus = [n for n in N_plus if n in dirtyNodes]
+		for n in dirtyNodes:
+			self.blocks[('node', n)] = [[], []]
+		for [v,i,j,k] in addSorties:
+			self.blocks[('sortie', v, i, j, k)] = [[], []]
+
+		for n in dirtyNodes:
+			self.addNodeVars(n, 'times')
+		for [v,i,j,k] in addSorties:
+			self.addSortieVars(v, i, j, k)
+		if (newModel):
+			self.addDriverVars()
+		for n in dirtyN_plus:
+			self.addNodeVars(n, 'zr')
+		for n in dirtyN_zero:
+			self.addNodeVars(n, 'zl')
+		for n in dirtyN_plus:
+			self.addNodeVars(n, 'zprime')
+
+		self.m.update()
+
+		for n in dirtyN_plus:
+			self.addNodeConstrs(n, 'recovery')
+		for [v,i,j,k] in addSorties:
+			self.addSortieConstrs(v, i, j, k)
+		for n in dirtyN_zero:
+			self.addNodeConstrs(n, 'launch')
+		if (newModel):
+			self.addArcConstrs(x, tau)
+		for n in dirtyN_plus:
+			self.addNodeConstrs(n, 'truck')
+		for n in dirtyN_zero:
+			self.addNodeConstrs(n, 'launchOrder')
+		for n in dirtyN_zero:
+			self.addNodeConstrs(n, 'swap')
+		for n in dirtyN_plus:
+			self.addNodeConstrs(n, 'service')
+		for n in dirtyNodes:
+			self.addNodeConstrs(n, 'depot')
+
+		self.m.update()
+
+	def buildTruck(self, x, node, cutoffTime, tau, minDistance, optLowBnd, insertCost, N, C):
+		# Build a new model, with only the variables and constraints of the truck block
+		c = self.c
+		self.blocks = {}
+		self.y = set()
+
+		# Model
+		self.m = Model("phase3")
+		m = self.m
+
+		# Tell Gurobi not to print to a log file
+		m.params.OutputFlag = 0
+
+		self.decvarcheckt 	= defaultdict(make_dict)
+		self.decvarbart 	= defaultdict(make_dict)
+		self.decvarhatt 	= defaultdict(make_dict)
+
+		self.decvarchecktprime 	= defaultdict(make_dict)
+		self.decvarhattprime 	= defaultdict(make_dict)
+
+		self.decvarzl 		= defaultdict(make_dict)
+		self.decvarzr 		= defaultdict(make_dict)
+		self.decvarzprime 	= defaultdict(make_dict)
+		self.decvarzdp 		= defaultdict(make_dict)
+		self.decvarzhat		= {}
+
+		RELAX = False
+		if (RELAX):
+			self.myVtype = GRB.CONTINUOUS
+		else:
+			self.myVtype = GRB.BINARY
+
+		for i in N:
+			if (i in C):
+				self.decvarzhat[i] = m.addVar(lb = 0, ub = 1, obj = optLowBnd + 10*insertCost[i], vtype = GRB.BINARY, name = "hatz.%d" % (i))
+
+			if (i == c+1):
+				# This is our only term in the objective function (for hatt):
+				self.decvarhatt[i] = m.addVar(lb = 0, obj=1, vtype=GRB.CONTINUOUS, name="hatt.%d" % (i))
+				self.decvarbart[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="bart.%d" % (i))
+				self.decvarcheckt[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="checkt.%d" % (i))
+
+			elif (i == 0):
+				# \check{t}_{0} = \bar{t}_{0} = 0.
+				# Only hard-code \hat{t}_{0} = 0 if the truck doesn't have to be at the depot for launches.
+				if (self.REQUIRE_TRUCK_AT_DEPOT):
+					self.decvarhatt[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="hatt.%d" % (i))
+				else:
+					self.decvarhatt[i] = m.addVar(lb = 0, ub = 0, obj=0, vtype=GRB.CONTINUOUS, name="hatt.%d" % (i))
+				self.decvarbart[i] = m.addVar(lb = 0, ub = 0, obj=0, vtype=GRB.CONTINUOUS, name="bart.%d" % (i))
+				self.decvarcheckt[i] = m.addVar(lb = 0, ub = 0, obj=0, vtype=GRB.CONTINUOUS, name="checkt.%d" % (i))
+
+			elif (i not in C):
+				# Just a regular non-negative continuous decision variable:
+				self.decvarhatt[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="hatt.%d" % (i))
+				self.decvarbart[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="bart.%d" % (i))
+				self.decvarcheckt[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="checkt.%d" % (i))
+
+		for v in self.V:
+			# Hard-code to zero:
+			self.decvarchecktprime[v][0] = m.addVar(lb = 0, ub=0, obj=0, vtype=GRB.CONTINUOUS, name="checktprime.%d.0" % (v))
+
+		# Define M
+		M = 0		# Initialize
+		unvisitedCustomers = list(range(1,c+1))   # We haven't visited anyone yet.
+		i = 0		# Start at the depot
+
+		while (len(unvisitedCustomers) > 0):
+			# Find the nearest customer.
+			# Break ties by selecting the customer with the smallest node number
+			tmpMinDist = minDistance
+			for j in unvisitedCustomers:
+				if (tau[i][j] <= tmpMinDist):
+					tmpMinDist = tau[i][j]
+					jstar = j
+
+			M += tau[i][jstar] + node[jstar].serviceTimeTruck
+			unvisitedCustomers.remove(jstar)
+			i = jstar
+
+		# Route back to the depot:
+		M += tau[i][c+1]
+		self.M = M
+
+		# The objective is to minimize the total travel distance.
+		m.modelSense = GRB.MINIMIZE
+
+		# Give Gurobi a time limit
+		if (cutoffTime > 0):
+			m.params.TimeLimit = cutoffTime
+
+		# Set a tolerance for MIP gap
+		m.params.MIPgap = 0.03	# 3%
+
+	def addDriverVars(self):
+		# z variables at the depot that don't depend on which UAVs launch from or land at the depot
+		c = self.c
+		m = self.m
+
+		if (self.REQUIRE_DRIVER):
+			for v in self.V:
+				# Hardcode z^{R}_{v, 0, c+1} = 0 for all v in V:
+				self.decvarzr[v][0][c+1] = m.addVar(lb = 0, ub = 0, obj = 0, vtype=self.myVtype, name="zr.%d.0.%d" % (v,c+1))
+				if (self.REQUIRE_TRUCK_AT_DEPOT):
+					# DON'T Hardcode z^{L}_{v, 0, 0} = 0 for all v in V:
+					self.decvarzl[v][0][0] = m.addVar(lb = 0, ub = 1, obj = 0, vtype=self.myVtype, name="zl.%d.0.0" % (v))
+				else:
+					# Hardcode z^{L}_{v, 0, 0} = 0 for all v in V:
+					self.decvarzl[v][0][0] = m.addVar(lb = 0, ub = 0, obj = 0, vtype=self.myVtype, name="zl.%d.0.0" % (v))
+
+	def addArcConstrs(self, x, tau):
+		# The only constraints of the truck block
+		for [i,j] in x:
+			# Constraint (82):
+			self.m.addConstr(self.decvarcheckt[j] >= self.decvarhatt[i] + tau[i][j], "Constr.78.%d.%d" % (i,j))
+
+	def addNodeVars(self, n, part):
+		# Add one part ('times', 'zr', 'zl', or 'zprime') of the variables of the UAVs that launch from or land at node n
+		c = self.c
+		block = ('node', n)
+		landsat = self.landsat[n]
+		launchesfrom = self.launchesfrom[n]
+		myVtype = self.myVtype
+
+		if (part == 'times'):
+			for v in self.V:
+				if ((v in landsat) or (v in launchesfrom)):
+					if (n != 0):
+						self.addVar(block, self.decvarchecktprime[v], n, 0, GRB.INFINITY, 0, GRB.CONTINUOUS, "checktprime.%d.%d" % (v, n))
+					self.addVar(block, self.decvarhattprime[v], n, 0, GRB.INFINITY, 0, GRB.CONTINUOUS, "hattprime.%d.%d" % (v, n))
+
+		if ((part == 'zr') and (n in self.N_plus)):
+			if (self.REQUIRE_DRIVER):
+				zzz = set().union([0], landsat)
+			else:
+				zzz = landsat
+			for v1 in zzz:
+				for v2 in zzz:
+					if (v1 != v2):
+						if not ((v2 == 0) and (n == c+1 or n == 0)):
+							self.addVar(block, self.decvarzr[v1][v2], n, 0, 1, 0, myVtype, "zr.%d.%d.%d" % (v1,v2,n))
+
+		if ((part == 'zl') and (n in self.N_zero)):
+			if (self.REQUIRE_DRIVER):
+				zzz = set().union([0], launchesfrom)
+			else:
+				zzz = launchesfrom
+			for v1 in zzz:
+				for v2 in zzz:
+					if (v1 != v2):
+						if not (v2 == 0 and (n == c+1 or n == 0)):
+							self.addVar(block, self.decvarzl[v1][v2], n, 0, 1, 0, myVtype, "zl.%d.%d.%d" % (v1,v2,n))
+
+		if ((part == 'zprime') and (n in self.N_plus) and (n != 0)):
+			for v1 in launchesfrom:
+				for v2 in landsat:
+					# NOTE:  v1 can equal v2, since v can land at and then launch from the same location.
+					self.addVar(block, self.decvarzprime[v1][v2], n, 0, 1, 0, myVtype, "zprime.%d.%d.%d" % (v1,v2,n))
+			for v1 in landsat:
+				for v2 in launchesfrom:
+					# NOTE:  v1 can equal v2, since v can land at and then launch from the same location.
+					self.addVar(block, self.decvarzdp[v1][v2], n, 0, 1, 0, myVtype, "zdp.%d.%d.%d" % (v1,v2,n))
+
+	def addSortieVars(self, v, i, j, k):
+		block = ('sortie', v, i, j, k)
+		self.addVar(block, self.decvarchecktprime[v], j, 0, GRB.INFINITY, 0, GRB.CONTINUOUS, "checktprime.%d.%d" % (v, j))
+		self.addVar(block, self.decvarhattprime[v], j, 0, GRB.INFINITY, 0, GRB.CONTINUOUS, "hattprime.%d.%d" % (v, j))
+
+	def addSortieConstrs(self, v, i, j, k):
+		block = ('sortie', v, i, j, k)
+		decvarchecktprime = self.decvarchecktprime
+		decvarhattprime = self.decvarhattprime
+		decvarzhat = self.decvarzhat
+		tauprime = self.tauprime
+		M = self.M
+
+		# Constraint (80):
+		self.addConstr(block, decvarchecktprime[v][k] >= decvarhattprime[v][j] + (tauprime[v][j][k] + self.sR[v][k])*(1-decvarzhat[j]), "Constr.76.%d.%d.%d" % (v,k,j))
+
+		# Constraint (72):
+		self.addConstr(block, decvarchecktprime[v][j] >= decvarhattprime[v][i] + tauprime[v][i][j]*(1-decvarzhat[j]), "Constr.70.%d.%d.%d" % (v,j,i))
+
+		# Constraint (73):
+		self.addConstr(block, decvarchecktprime[v][j] <= decvarhattprime[v][i] + tauprime[v][i][j] + M*(decvarzhat[j]), "Constr.70b.%d.%d.%d" % (v,j,i))
+
+		# Constraint (74):
+		self.addConstr(block, decvarhattprime[v][j] >= decvarchecktprime[v][j] + self.sigmaprime[j]*(1-decvarzhat[j]), "Constr.71.%d.%d" % (v,j))
+
+		# Constraint (75):
+		self.addConstr(block, decvarhattprime[v][j] <= decvarchecktprime[v][j] + self.sigmaprime[j] + M*(decvarzhat[j]), "Constr.71b.%d.%d" % (v,j))
+
+		# Constraint (81):
+		self.addConstr(block, decvarchecktprime[v][k] - self.sR[v][k] - decvarhattprime[v][i] <= self.eee[v][i][j][k], "Constr.77.%d.%d.%d" % (v,i,k))
+
+	def addNodeConstrs(self, n, part):
+		# Add one part of the constraints at node n:
+		# 'recovery' (76)-(79), 'launch' (67)-(71) and (108), 'truck' (83)-(89) and (91)-(93),
+		# 'launchOrder' (94)-(96), 'swap' (97)-(98), 'service' (99), or 'depot' (90)
+		c = self.c
+		block = ('node', n)
+		landsat = self.landsat[n]
+		launchesfrom = self.launchesfrom[n]
+		A = self.A
+		B = self.B
+		sL = self.sL
+		sR = self.sR
+		M = self.M
+		decvarcheckt = self.decvarcheckt
+		decvarbart = self.decvarbart
+		decvarhatt = self.decvarhatt
+		decvarchecktprime = self.decvarchecktprime
+		decvarhattprime = self.decvarhattprime
+		decvarzl = self.decvarzl
+		decvarzr = self.decvarzr
+		decvarzprime = self.decvarzprime
+		decvarzdp = self.decvarzdp
+		decvarzhat = self.decvarzhat
+
+		if ((part == 'recovery') and (n in self.N_plus)):
+			k = n
+			for v in landsat:
+				if (self.REQUIRE_TRUCK_AT_DEPOT):
+					# Constraint (76):
+					self.addConstr(block, decvarchecktprime[v][k] >= decvarcheckt[k] + sR[v][k] - M*decvarzhat[B[v][k]], "Constr.72.%d.%d" % (v,k))
+					if (self.REQUIRE_DRIVER):
+						# Constraint (77):
+						self.addConstr(block, decvarchecktprime[v][k] >= decvarbart[k] + sR[v][k] - M*(1 - decvarzr[0][v][k]), "Constr.73.%d.%d" % (v,k))
+
+				elif (k != c+1):
+					# Constraint (76): We don't require the truck to be at the depot for landing.  Ignore when k == c+1
+					self.addConstr(block, decvarchecktprime[v][k] >= decvarcheckt[k] + sR[v][k] -M*decvarzhat[B[v][k]], "Constr.72.%d.%d" % (v,k))
+					if (self.REQUIRE_DRIVER):
+						# Constraint (77):
+						self.addConstr(block, decvarchecktprime[v][k] >= decvarbart[k] + sR[v][k] - M*(1 - decvarzr[0][v][k]), "Constr.73.%d.%d" % (v,k))
+
+				for v2 in landsat:
+					if (v2 != v):
+						# Constraint (78):
+						self.addConstr(block, decvarchecktprime[v][k] >= decvarchecktprime[v2][k] + sR[v][k] - M*(1 - decvarzr[v2][v][k]), "Constr.74.%d.%d.%d" % (v,v2,k))
+
+				if (k != c+1):
+					for v2 in launchesfrom:
+						if (v2 != v):
+							# Constraint (79):
+							self.addConstr(block, decvarchecktprime[v][k] >= decvarhattprime[v2][k] + sR[v][k] - M*(1 - decvarzprime[v2][v][k]), "Constr.75.%d.%d.%d" % (v,v2,k))
+
+		if ((part == 'launch') and (n in self.N_zero)):
+			i = n
+			for v in launchesfrom:
+				# Constraint (67):
+				self.addConstr(block, decvarhattprime[v][i] >= decvarchecktprime[v][i] + sL[v][i]*(1-decvarzhat[A[v][i]]), "Constr.65.%d.%d" % (v,i))
+
+				if (self.REQUIRE_DRIVER):
+					# Constraint (68):
+					self.addConstr(block, decvarhattprime[v][i] >= decvarcheckt[i] + sL[v][i] - M*(1 - decvarzl[v][0][i]), "Constr.66.%d.%d" % (v,i))
+
+					# Constraint (69):
+					self.addConstr(block, decvarhattprime[v][i] >= decvarbart[i] + sL[v][i] - M*(1 - decvarzl[0][v][i]), "Constr.67.%d.%d" % (v,i))
+
+				else:
+					# Constraint (108):
+					self.addConstr(block, decvarhattprime[v][i] >= decvarcheckt[i] + sL[v][i] - M*(decvarzhat[A[v][i]]), "Constr.104.%d.%d" % (v,i))
+
+				for v2 in launchesfrom:
+					if (v2 != v):
+						# Constraint (70):
+						self.addConstr(block, decvarhattprime[v][i] >= decvarhattprime[v2][i] + sL[v][i] - M*(1 - decvarzl[v2][v][i]), "Constr.68.%d.%d.%d" % (v,v2,i))
+
+			if (i != 0):
+				for v in landsat:
+					for v2 in launchesfrom:
+						if (v2 != v):
+							# Constraint (71):
+							self.addConstr(block, decvarhattprime[v2][i] >= decvarchecktprime[v][i] + sL[v2][i] - M*(1 - decvarzdp[v][v2][i]), "Constr.69.%d.%d.%d" % (v,v2,i))
+
+		if ((part == 'truck') and (n in self.N_plus)):
+			k = n
+			# Constraint (87):
+			self.addConstr(block, decvarhatt[k] >= decvarbart[k], "Constr.83.%d" % (k))
+
+			if (k != c+1):
+				# Constraint (83):
+				self.addConstr(block, decvarbart[k] >= decvarcheckt[k] + self.sigma[k], "Constr.79.%d" % (k))
+
+				for v in launchesfrom:
+					# Constraint (89):
+					self.addConstr(block, decvarhatt[k] >= decvarhattprime[v][k], "Constr.85.%d.%d" % (v, k))
+
+					if (self.REQUIRE_DRIVER):
+						# Constraint (86):
+						self.addConstr(block, decvarbart[k] >= decvarhattprime[v][k] + self.sigma[k] - M*(1 - decvarzl[v][0][k]), "Constr.82.%d" % (k))
+
+			else:
+				# Constraint (84):
+				self.addConstr(block, decvarbart[k] >= decvarcheckt[k], "Constr.80.%d" % (k))
+
+			for v in landsat:
+				# Constraint (88):
+				self.addConstr(block, decvarhatt[k] >= decvarchecktprime[v][k], "Constr.84.%d.%d" % (v,k))
+
+				if (self.REQUIRE_DRIVER):
+					# Constraint (85):
+					self.addConstr(block, decvarbart[k] >= decvarchecktprime[v][k] + self.sigma[k] - M*(1 - decvarzr[v][0][k]), "Constr.81.%d" % (k))
+
+					# Constraint (91):
+					self.addConstr(block, decvarzr[0][v][k] + decvarzr[v][0][k] + decvarzhat[B[v][k]] == 1, "Constr.87.%d.%d" % (v,k))
+
+				for v2 in landsat:
+					if (v2 != v):
+						# Constraint (92):
+						self.addConstr(block, decvarzr[v][v2][k] + decvarzr[v2][v][k] <= 1, "Constr.88.%d.%d.%d" % (v,v2,k))
+
+						# Constraint (93):
+						self.addConstr(block, decvarzr[v][v2][k] + decvarzr[v2][v][k] + decvarzhat[B[v][k]] + decvarzhat[B[v2][k]] >= 1, "Constr.89.%d.%d.%d" % (v,v2,k))
+
+		if ((part == 'launchOrder') and (n in self.N_zero)):
+			i = n
+			for v in launchesfrom:
+				if (self.REQUIRE_DRIVER):
+					# Constraint (94):
+					self.addConstr(block, decvarzl[0][v][i] + decvarzl[v][0][i] + decvarzhat[A[v][i]] == 1, "Constr.90.%d.%d" % (v,i))
+
+				for v2 in launchesfrom:
+					if (v2 != v):
+						# Constraint (95):
+						self.addConstr(block, decvarzl[v][v2][i] + decvarzl[v2][v][i] <= 1, "Constr.91.%d.%d.%d" % (v,v2,i))
+
+						# Constraint (96):
+						self.addConstr(block, decvarzl[v][v2][i] + decvarzl[v2][v][i] + decvarzhat[A[v][i]] + decvarzhat[A[v2][i]] >= 1, "Constr.92.%d.%d.%d" % (v,v2,i))
+
+		if ((part == 'swap') and (n in self.N_zero) and (n != 0)):
+			k = n
+			for v in landsat:
+				for v2 in launchesfrom:
+					if (v2 != v):
+						# Constraint (98):
+						self.addConstr(block, decvarzprime[v2][v][k] + decvarzdp[v][v2][k] <= 1, "Constr.94.%d.%d.%d" % (v,v2,k))
+
+						# Constraint (97):
+						self.addConstr(block, decvarzprime[v2][v][k] + decvarzdp[v][v2][k] + decvarzhat[B[v][k]] + decvarzhat[A[v2][k]] >= 1, "Constr.93.%d.%d.%d" % (v,v2,k))
+
+		if ((part == 'service') and (n in self.N_plus) and (self.REQUIRE_TRUCK_AT_DEPOT or (n != c+1))):
+			k = n
+			tmpSL = 0
+			for v in launchesfrom:
+				tmpSL += sL[v][k]*(1-decvarzhat[A[v][k]])
+			tmpSR = 0
+			for v in landsat:
+				tmpSR += sR[v][k]*(1-decvarzhat[B[v][k]])
+			# Constraint (99):
+			self.addConstr(block, decvarhatt[k] >= decvarcheckt[k] + tmpSL + tmpSR, "Constr.95.%d" % (k))
+
+		if ((part == 'depot') and (n == 0) and (self.REQUIRE_TRUCK_AT_DEPOT)):
+			for v in launchesfrom:
+				# Constraint (90):
+				self.addConstr(block, decvarhatt[0] >= decvarhattprime[v][0], "Constr.86.%d" % (v))
@@ -0,0 +1,380 @@
+#!/usr/bin/env python
+
+from collections import defaultdict
+from collections import deque
+
+
+# This file contains a combinatorial (Gurobi-free) solver for (P3), which may be used instead of
+# the MIP in mfstsp_heuristic_3_timing().
+#
+# Once the truck tour (x) and the sorties (y) are fixed, the only decisions left in (P3) are the
+# orders of the launches, recoveries, and the driver's service at each truck node.  (We look for
+# solutions that serve every UAV customer, i.e., zhat = 0.)  If those orders are fixed, every
+# constraint of (P3) has the form  t[a] >= t[b] + w,  so the earliest feasible schedule is found
+# with a longest-path search, and the earliest schedule also minimizes the makespan (hatt[c+1]).
+# If the longest paths contain a positive cycle (e.g., because a UAV's endurance is too short
+# for the chosen orders), the orders are infeasible.
+#
+# We choose the order of the launches, recoveries, and driver's service at one truck node at a time
+# (in tour order), with branch-and-bound:  the longest paths with the orders chosen so far are a lower
+# bound on the makespan.  The longest paths of each branch start from the longest paths of its parent,
+# so only the effect of the new constraints has to be propagated.  The branches with the smallest
+# bounds are tried first.
+#
+# Before branching, we count the combinations of orders.  If there are more than P3_MAX_ORDERS of them,
+# or the branch-and-bound needs more than P3_MAX_BRANCHES branches, solve() returns False, and the MIP
+# should be used instead.
+
+# Don't try (and let the MIP solve P3) if there are more than this many combinations of orders:
+P3_MAX_ORDERS = 10000
+
+# Give up (and let the MIP solve P3) if the branch-and-bound evaluates more than this many branches:
+P3_MAX_BRANCHES = 1000
+
+# Tolerance [seconds]:
+P3_TOL = 1e-7
+
+
+class scheduleValue:
+	# Has the same "x" attribute as a Gurobi variable, so solutions can be read the same way
+	def __init__(self, x):
+		self.x = x
+
+
+class phase3Schedule:
+	def __init__(self):
+		self.isFeasible = False
+		self.objVal = float('inf')
+
+		self.decvarcheckt 		= {}
+		self.decvarbart 		= {}
+		self.decvarhatt 		= {}
+		self.decvarchecktprime 	= defaultdict(dict)
+		self.decvarhattprime 	= defaultdict(dict)
+		self.decvarzhat 		= {}
+
+	def timeVar(self, name):
+		# Index of the time variable with the given name (e.g., ('hatt', i) or ('hattprime', v, i))
+		if (name not in self.index):
+			self.index[name] = len(self.names)
+			self.names.append(name)
+		return self.index[name]
+
+	def edge(self, a, w, b):
+		# Constraint t[a] >= t[b] + w
+		return [self.timeVar(b), self.timeVar(a), w]
+
+	def solve(self, x, y, N, C, V, c, sigma, sigmaprime, tau, tauprime, sR, sL, eee, REQUIRE_TRUCK_AT_DEPOT, REQUIRE_DRIVER, N_zero, N_plus, launchesfrom, landsat):
+		# Returns True if (P3) was solved (self.isFeasible then says whether it has a solution),
+		# or False if there were too many orders to try.
+		self.index = {}
+		self.names = []
+
+		# Every time variable is >= 0.  These ones are also <= 0:
+		fixedZero = [('checkt', 0), ('bart', 0)]
+		if (not REQUIRE_TRUCK_AT_DEPOT):
+			fixedZero.append(('hatt', 0))
+
+		for i in N:
+			if (i not in C):
+				self.timeVar(('checkt', i))
+				self.timeVar(('bart', i))
+				self.timeVar(('hatt', i))
+
+		# 1) Constraints that don't depend on the orders:
+		edges = []
+		for [i,j] in x:
+			# Constraint (82):
+			edges.append(self.edge(('checkt', j), tau[i][j], ('hatt', i)))
+
+		for [v,i,j,k] in y:
+			# Constraints (72) and (73):
+			edges.append(self.edge(('checktprime', v, j), tauprime[v][i][j], ('hattprime', v, i)))
+			edges.append(self.edge(('hattprime', v, i), -tauprime[v][i][j], ('checktprime', v, j)))
+			# Constraints (74) and (75):
+			edges.append(self.edge(('hattprime', v, j), sigmaprime[j], ('checktprime', v, j)))
+			edges.append(self.edge(('checktprime', v, j), -sigmaprime[j], ('hattprime', v, j)))
+			# Constraint (80):
+			edges.append(self.edge(('checktprime', v, k), tauprime[v][j][k] + sR[v][k], ('hattprime', v, j)))
+			# Constraint (81):
+			edges.append(self.edge(('hattprime', v, i), -sR[v][k] - eee[v][i][j][k], ('checktprime', v, k)))
+
+		for i in N_zero:
+			for v in launchesfrom[i]:
+				if (i == 0):
+					fixedZero.append(('checktprime', v, 0))
+				# Constraint (67):
+				edges.append(self.edge(('hattprime', v, i), sL[v][i], ('checktprime', v, i)))
+				if (not REQUIRE_DRIVER):
+					# Constraint (108):
+					edges.append(self.edge(('hattprime', v, i), sL[v][i], ('checkt', i)))
+
+		for k in N_plus:
+			# Constraint (87):
+			edges.append(self.edge(('hatt', k), 0, ('bart', k)))
+			if (k != c+1):
+				# Constraint (83):
+				edges.append(self.edge(('bart', k), sigma[k], ('checkt', k)))
+				for v in launchesfrom[k]:
+					# Constraint (89):
+					edges.append(self.edge(('hatt', k), 0, ('hattprime', v, k)))
+			else:
+				# Constraint (84):
+				edges.append(self.edge(('bart', k), 0, ('checkt', k)))
+
+			for v in landsat[k]:
+				if (REQUIRE_TRUCK_AT_DEPOT or (k != c+1)):
+					# Constraint (76):
+					edges.append(self.edge(('checktprime', v, k), sR[v][k], ('checkt', k)))
+				# Constraint (88):
+				edges.append(self.edge(('hatt', k), 0, ('checktprime', v, k)))
+
+			if (REQUIRE_TRUCK_AT_DEPOT or (k != c+1)):
+				# Constraint (99):
+				tmpS = sum([sL[v][k] for v in launchesfrom[k]]) + sum([sR[v][k] for v in landsat[k]])
+				edges.append(self.edge(('hatt', k), tmpS, ('checkt', k)))
+
+		if (REQUIRE_TRUCK_AT_DEPOT):
+			for v in launchesfrom[0]:
+				# Constraint (90):
+				edges.append(self.edge(('hatt', 0), 0, ('hattprime', v, 0)))
+
+		# 2) The orders we can choose, in tour order.  At each truck node n, the UAVs land and launch one at a time,
+		# and (if REQUIRE_DRIVER) not while the driver serves customer n.  So we choose the order of these "events"
+		# (the recoveries, the launches, and the driver's service) at each node.
+		# options = [[alternative, alternative, ...], ...], where each alternative is the list of edges of one order
+		# of the events at a node, and we have to pick one alternative from each element of options.
+		# NOTE:  (P3) chooses the order of each pair of events separately (e.g., whether the driver serves n before or
+		#		 after each launch).  Any combination of those choices that isn't an order of all the events at n has a
+		#		 cycle of positive length (since every launch and recovery takes time), and is infeasible.
+		nodeEvents = []		# nodeEvents = [[n, events], ...]
+		numOrders = 1		# Number of combinations of the orders (the size of the search)
+		for n in [0] + N_plus:
+			events = []
+			if (n in N_plus):
+				events.extend([['R', v] for v in landsat[n]])
+			if (n in N_zero):
+				events.extend([['L', v] for v in launchesfrom[n]])
+			if (REQUIRE_DRIVER):
+				if (n == 0):
+					for v in launchesfrom[n]:
+						# At the depot, the driver has nothing to serve before launching v (Constraints (68) and (86)):
+						edges.append(self.edge(('hattprime', v, n), sL[v][n], ('bart', n)))
+				elif (n == c+1):
+					if (REQUIRE_TRUCK_AT_DEPOT):
+						for v in landsat[n]:
+							# At the depot, the driver is never "serving" when a UAV lands (Constraint (77)):
+							edges.append(self.edge(('checktprime', v, n), sR[v][n], ('bart', n)))
+				else:
+					events.append(['S', n])
+
+			if (min([sR[v][n] for [eventType, v] in events if (eventType == 'R')] + [sL[v][n] for [eventType, v] in events if (eventType == 'L')] + [1]) <= 0):
+				# A launch or recovery takes no time, so the pairwise orders need not form an order of the events
+				return False
+
+			numOrders *= countOrders(events)
+			if (numOrders > P3_MAX_ORDERS):
+				return False
+			nodeEvents.append([n, events])
+
+		options = []
+		for [n, events] in nodeEvents:
+			if (len(events) > 1):
+				choice = [self.orderEdges(order, n, sigma, sL, sR) for order in eventOrders(events)]
+				if (len(choice) > 1):
+					options.append(choice)
+				else:
+					edges.extend(choice[0])
+
+		# 3) Branch-and-bound over the orders:
+		fixedZero = [self.timeVar(name) for name in fixedZero]
+		self.isFixedZero = [(a in fixedZero) for a in range(0,len(self.names))]
+
+		self.outEdges = [[] for a in range(0,len(self.names))]
+		self.goal = self.index[('hatt', c+1)]
+		self.bestObj = float('inf')
+		self.bestTimes = None
+		self.numBranches = 0
+
+		times = [0.0]*len(self.names)
+		for [b, a, w] in edges:
+			self.outEdges[b].append([a, w])
+		if (not self.propagate(times, edges)):
+			self.isFeasible = False
+			return True
+
+		self.options = options
+		if (not self.branch(0, times)):
+			return False
+
+		if (self.bestTimes is None):
+			self.isFeasible = False
+			return True
+
+		# Store the solution:
+		self.isFeasible = True
+		self.objVal = self.bestTimes[self.goal]
+		for a in range(0,len(self.names)):
+			name = self.names[a]
+			if (name[0] == 'checkt'):
+				self.decvarcheckt[name[1]] = scheduleValue(self.bestTimes[a])
+			elif (name[0] == 'bart'):
+				self.decvarbart[name[1]] = scheduleValue(self.bestTimes[a])
+			elif (name[0] == 'hatt'):
+				self.decvarhatt[name[1]] = scheduleValue(self.bestTimes[a])
+			elif (name[0] == 'checktprime'):
+				self.decvarchecktprime[name[1]][name[2]] = scheduleValue(self.bestTimes[a])
+			elif (name[0] == 'hattprime'):
+				self.decvarhattprime[name[1]][name[2]] = scheduleValue(self.bestTimes[a])
+		for j in C:
+			self.decvarzhat[j] = scheduleValue(0.0)
+
+		return True
+
+	def orderEdges(self, order, n, sigma, sL, sR):
+		# The edges that make the events at n (see solve()) happen in the given order
+		tmpEdges = []
+		for p in range(0,len(order)):
+			for q in range(p+1,len(order)):
+				tmpEdges.extend(self.pairEdges(order[p], order[q], n, sigma, sL, sR))
+		return tmpEdges
+
+	def pairEdges(self, first, second, n, sigma, sL, sR):
+		# The edges that make event first happen before event second at n
+		[firstType, v] = first
+		[secondType, v2] = second
+		if (firstType == 'L'):
+			if (secondType == 'L'):
+				# Constraint (70):
+				return [self.edge(('hattprime', v2, n), sL[v2][n], ('hattprime', v, n))]
+			elif (secondType == 'R'):
+				# v launches before v2 lands (Constraint (79)):
+				return [self.edge(('checktprime', v2, n), sR[v2][n], ('hattprime', v, n))]
+			else:
+				# The driver serves customer n after launching v (Constraint (69)):
+				return [self.edge(('hattprime', v, n), sL[v][n], ('checkt', n)), self.edge(('bart', n), sigma[n], ('hattprime', v, n))]
+		elif (firstType == 'R'):
+			if (secondType == 'L'):
+				if (v2 == v):
+					# (Constraint (67) already makes v land before it launches again)
+					return []
+				# v lands before v2 launches (Constraint (71)):
+				return [self.edge(('hattprime', v2, n), sL[v2][n], ('checktprime', v, n))]
+			elif (secondType == 'R'):
+				# Constraint (78):
+				return [self.edge(('checktprime', v2, n), sR[v2][n], ('checktprime', v, n))]
+			else:
+				# The driver serves customer n after v lands (Constraint (85)):
+				return [self.edge(('bart', n), sigma[n], ('checktprime', v, n))]
+		else:
+			if (secondType == 'L'):
+				# The driver serves customer n before launching v2 (Constraints (68) and (86)):
+				return [self.edge(('hattprime', v2, n), sL[v2][n], ('bart', n))]
+			else:
+				# The driver serves customer n before v2 lands (Constraint (77)):
+				return [self.edge(('checktprime', v2, n), sR[v2][n], ('bart', n))]
+
+	def propagate(self, times, newEdges):
+		# Update the longest paths in times after adding newEdges (which are already in outEdges).
+		# Returns False if the constraints are infeasible, or if the makespan can't beat the best one found so far.
+		# (Each time variable is in the queue at most once.  If one enters the queue more than len(times) times, there's a positive cycle.)
+		queue = deque()
+		inQueue = [False]*len(times)
+		numUpdates = [0]*len(times)
+		for [b, a, w] in newEdges:
+			if (times[b] + w > times[a] + P3_TOL):
+				times[a] = times[b] + w
+				if (not inQueue[a]):
+					inQueue[a] = True
+					queue.append(a)
+
+		while (len(queue) > 0):
+			b = queue.popleft()
+			inQueue[b] = False
+			if (self.isFixedZero[b] and (times[b] > P3_TOL)):
+				return False
+			numUpdates[b] += 1
+			if (numUpdates[b] > len(times)):
+				# Positive cycle
+				return False
+			for [a, w] in self.outEdges[b]:
+				if (times[b] + w > times[a] + P3_TOL):
+					times[a] = times[b] + w
+					if (not inQueue[a]):
+						inQueue[a] = True
+						queue.append(a)
+
+		if (times[self.goal] >= self.bestObj - P3_TOL):
+			return False
+
+		return True
+
+	def branch(self, depth, times):
+		# Try every alternative of the remaining options.  Returns False if we ran out of branches.
+		if (depth == len(self.options)):
+			self.bestObj = times[self.goal]
+			self.bestTimes = list(times)
+			return True
+
+		# Find the longest paths with each alternative, and try the alternatives with the shortest makespan first:
+		children = []
+		for newEdges in self.options[depth]:
+			self.numBranches += 1
+			if (self.numBranches > P3_MAX_BRANCHES):
+				return False
+
+			for [b, a, w] in newEdges:
+				self.outEdges[b].append([a, w])
+
+			tmpTimes = list(times)
+			if (self.propagate(tmpTimes, newEdges)):
+				children.append([tmpTimes[self.goal], len(children), newEdges, tmpTimes])
+
+			for [b, a, w] in newEdges:
+				self.outEdges[b].pop()
+
+		children.sort()
+		for [tmpObj, tmpIndex, newEdges, tmpTimes] in children:
+			if (tmpObj >= self.bestObj - P3_TOL):
+				break
+
+			for [b, a, w] in newEdges:
+				self.outEdges[b].append([a, w])
+
+			if (not self.branch(depth+1, tmpTimes)):
+				return False
+
+			for [b, a, w] in newEdges:
+				self.outEdges[b].pop()
+
+		return True
+
+
+def mustPrecede(events, p, q):
+	# True if events[p] must happen before events[q] (a UAV lands before it launches again)
+	return ((events[p][0] == 'R') and (events[q][0] == 'L') and (events[p][1] == events[q][1]))
+
+def countOrders(events):
+	# Number of orders of events (see solve()), found by counting the orders of every subset of the events
+	numEvents = len(events)
+	numWays = [0]*(2**numEvents)	# numWays[set] = number of orders of the events in set (a bitmask)
+	numWays[0] = 1
+	for mySet in range(1,2**numEvents):
+		for q in range(0,numEvents):
+			if (mySet & (1 << q)):
+				# Event q is the last one in set:
+				if (not any([(mySet & (1 << p)) and mustPrecede(events, q, p) for p in range(0,numEvents)])):
+					numWays[mySet] += numWays[mySet & ~(1 << q)]
+	return numWays[-1]
+
+def eventOrders(events, order=None):
+	# Every order of events (see solve()) that starts with the given order (a list of positions in events)
+	if (order is None):
+		order = []
+	if (len(order) == len(events)):
+		yield [events[p] for p in order]
+		return
+	for q in range(0,len(events)):
+		if ((q not in order) and all([(p in order) for p in range(0,len(events)) if mustPrecede(events, p, q)])):
+			for myOrder in eventOrders(events, order + [q]):
+				yield myOrder
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+
+# This file contains an index of which UAV customers can be served from which truck arcs.
+#
+# Phase I keeps Pprime[v][j] = [[i,k], ...], the pairs of truck nodes that UAV v can serve customer j between,
+# and asks "can some UAV serve j between consecutive tour nodes i and k?" over and over.  Testing [i,k] in Pprime[v][j]
+# scans the whole list, so reachabilityIndex stores the same pairs in sets:
+#	pairs[v][j]			= {(i,k), ...}		(the pairs of Pprime[v][j])
+#	anyPairs[j]			= {(i,k), ...}		(the pairs of every UAV)
+#	customersOnArc[(i,k)] = [j, ...]		(the customers some UAV can serve between i and k, in the order of Pprime)
+#
+# tourCoverage keeps track of how many arcs of a truck tour can serve each customer, so we can tell which UAV
+# customers a tour can't reach.  When the tour changes by a few arcs, only the customers on those arcs are updated.
+
+
+class reachabilityIndex:
+	def __init__(self, V, Pprime):
+		self.pairs = {}
+		self.anyPairs = {}
+		self.customersOnArc = {}
+		for v in V:
+			self.pairs[v] = {}
+			for j in Pprime[v]:
+				self.pairs[v][j] = set()
+				if (j not in self.anyPairs):
+					self.anyPairs[j] = set()
+				for [i,k] in Pprime[v][j]:
+					self.pairs[v][j].add((i,k))
+					if ((i,k) not in self.anyPairs[j]):
+						self.anyPairs[j].add((i,k))
+						self.customersOnArc.setdefault((i,k), []).append(j)
+
+	def canServe(self, i, j, k):
+		# Can some UAV serve customer j between truck nodes i and k?
+		return ((j in self.anyPairs) and ((i,k) in self.anyPairs[j]))
+
+	def canServeBy(self, v, i, j, k):
+		# Can UAV v serve customer j between truck nodes i and k?
+		return ((j in self.pairs[v]) and ((i,k) in self.pairs[v][j]))
+
+	def customersOn(self, i, k):
+		# The customers that some UAV can serve between truck nodes i and k
+		return self.customersOnArc.get((i,k), [])
+
+	def unreachable(self, customers, tour):
+		# The customers (in the order of customers) that no arc of tour can serve
+		arcs = set([(tour[iii], tour[iii+1]) for iii in range(0, len(tour)-1)])
+		return [j for j in customers if (j not in self.anyPairs) or (self.anyPairs[j].isdisjoint(arcs))]
+
+
+class tourCoverage:
+	def __init__(self, reach, tour):
+		self.reach = reach
+		self.setTour(tour)
+
+	def setTour(self, tour):
+		# Start over with a new tour
+		self.count = {}		# count[j] = number of arcs of the tour that can serve j
+		for iii in range(0, len(tour)-1):
+			self.addArc(tour[iii], tour[iii+1])
+
+	def addArc(self, i, k):
+		for j in self.reach.customersOn(i, k):
+			self.count[j] = self.count.get(j, 0) + 1
+
+	def removeArc(self, i, k):
+		for j in self.reach.customersOn(i, k):
+			self.count[j] -= 1
+
+	def changeArcs(self, removedArcs, addedArcs):
+		# The tour lost removedArcs ([[i,k], ...]) and gained addedArcs
+		for [i,k] in removedArcs:
+			self.removeArc(i, k)
+		for [i,k] in addedArcs:
+			self.addArc(i, k)
+
+	def insert(self, tour, position, j):
+		# Insert customer j into tour (a list) at position, and update the counts
+		self.changeArcs([[tour[position-1], tour[position]]], [[tour[position-1], j], [j, tour[position]]])
+		tour.insert(position, j)
+
+	def unreachable(self, customers):
+		# The customers (in the order of customers) that no arc of the tour can serve
+		return [j for j in customers if self.count.get(j, 0) == 0]
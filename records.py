@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+
+# This file contains the records that describe a problem and its solution:
+#	node[nodeID] 				= make_node(...)
+#	vehicle[vehicleID] 			= make_vehicle(...)
+#	travel[vehicleID][i][j] 	= make_travel(...)		(see travelMatrix in node_matrix.py)
+#	packages[nodeID] 			= make_packages(...)
+#	assignments 				= assignmentTable()
+#
+# There is one make_travel for every vehicle and pair of nodes, so the records use __slots__
+# (rather than a dictionary per record).
+#
+# The assignments of a solution are stored by column:  assignments.startTime[row] (etc.) is the
+# start time of the row-th assignment.  Each assignment belongs to a vehicle (assignments.vehicleID[row])
+# and has a status (assignments.statusID[row]).
+
+
+# The fields of a make_assignments object (in the order make_assignments() takes them):
+ASSIGNMENT_FIELDS = ['vehicleType', 'startTime', 'startNodeID', 'startLatDeg', 'startLonDeg', 'startAltMeters', 'endTime', 'endNodeID', 'endLatDeg', 'endLonDeg', 'endAltMeters', 'icon', 'description', 'UAVsOnBoard', 'ganttStatus']
+
+
+class make_node:
+	__slots__ = ['nodeType', 'latDeg', 'lonDeg', 'altMeters', 'parcelWtLbs', 'serviceTimeTruck', 'serviceTimeUAV', 'address']
+
+	def __init__(self, nodeType, latDeg, lonDeg, altMeters, parcelWtLbs, serviceTimeTruck, serviceTimeUAV, address):
+		# Set node[nodeID]
+		self.nodeType 			= nodeType
+		self.latDeg 			= latDeg
+		self.lonDeg				= lonDeg
+		self.altMeters			= altMeters
+		self.parcelWtLbs 		= parcelWtLbs
+		self.serviceTimeTruck	= serviceTimeTruck	# [seconds]
+		self.serviceTimeUAV 	= serviceTimeUAV	# [seconds]
+		self.address 			= address			# Might be None
+
+class make_vehicle:
+	__slots__ = ['vehicleType', 'takeoffSpeed', 'cruiseSpeed', 'landingSpeed', 'yawRateDeg', 'cruiseAlt', 'capacityLbs', 'launchTime', 'recoveryTime', 'serviceTime', 'batteryPower', 'flightRange']
+
+	def __init__(self, vehicleType, takeoffSpeed, cruiseSpeed, landingSpeed, yawRateDeg, cruiseAlt, capacityLbs, launchTime, recoveryTime, serviceTime, batteryPower, flightRange):
+		# Set vehicle[vehicleID]
+		self.vehicleType	= vehicleType
+		self.takeoffSpeed	= takeoffSpeed
+		self.cruiseSpeed	= cruiseSpeed
+		self.landingSpeed	= landingSpeed
+		self.yawRateDeg		= yawRateDeg
+		self.cruiseAlt		= cruiseAlt
+		self.capacityLbs	= capacityLbs
+		self.launchTime		= launchTime	# [seconds].
+		self.recoveryTime	= recoveryTime	# [seconds].
+		self.serviceTime	= serviceTime
+		self.batteryPower	= batteryPower	# [joules].
+		self.flightRange	= flightRange	# 'high' or 'low'
+
+class make_travel:
+	__slots__ = ['takeoffTime', 'flyTime', 'landTime', 'totalTime', 'takeoffDistance', 'flyDistance', 'landDistance', 'totalDistance']
+
+	def __init__(self, takeoffTime, flyTime, landTime, totalTime, takeoffDistance, flyDistance, landDistance, totalDistance):
+		# Set travel[vehicleID][fromID][toID]
+		self.takeoffTime 	 = takeoffTime
+		self.flyTime 		 = flyTime
+		self.landTime 		 = landTime
+		self.totalTime 		 = totalTime
+		self.takeoffDistance = takeoffDistance
+		self.flyDistance	 = flyDistance
+		self.landDistance	 = landDistance
+		self.totalDistance	 = totalDistance
+
+class make_packages:
+	__slots__ = ['packageType', 'latDeg', 'lonDeg', 'deliveryTime', 'icon']
+
+	def __init__(self, packageType, latDeg, lonDeg, deliveryTime, icon):
+		# Set packages[nodeID]
+		self.packageType 	= packageType
+		self.latDeg 		= latDeg
+		self.lonDeg 		= lonDeg
+		self.deliveryTime 	= deliveryTime
+		self.icon 			= icon
+
+class make_assignments:
+	__slots__ = ASSIGNMENT_FIELDS
+
+	def __init__(self, vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus):
+		# One row of an assignmentTable (see assignmentTable.record())
+		self.vehicleType 	= vehicleType
+		self.startTime 		= startTime
+		self.startNodeID	= startNodeID
+		self.startLatDeg 	= startLatDeg
+		self.startLonDeg 	= startLonDeg
+		self.startAltMeters = startAltMeters
+		self.endTime 		= endTime
+		self.endNodeID 		= endNodeID
+		self.endLatDeg		= endLatDeg
+		self.endLonDeg		= endLonDeg
+		self.endAltMeters 	= endAltMeters
+		self.icon			= icon
+		self.description 	= description
+		self.UAVsOnBoard 	= UAVsOnBoard
+		self.ganttStatus	= ganttStatus
+
+
+class assignmentTable:
+	def __init__(self):
+		self.vehicleID 	= []
+		self.statusID 	= []
+		for field in ASSIGNMENT_FIELDS:
+			setattr(self, field, [])
+
+	def __len__(self):
+		return len(self.vehicleID)
+
+	def add(self, vehicleID, statusID, vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus):
+		# Append an assignment of vehicleID (with the same inputs as make_assignments)
+		self.vehicleID.append(vehicleID)
+		self.statusID.append(statusID)
+		self.vehicleType.append(vehicleType)
+		self.startTime.append(startTime)
+		self.startNodeID.append(startNodeID)
+		self.startLatDeg.append(startLatDeg)
+		self.startLonDeg.append(startLonDeg)
+		self.startAltMeters.append(startAltMeters)
+		self.endTime.append(endTime)
+		self.endNodeID.append(endNodeID)
+		self.endLatDeg.append(endLatDeg)
+		self.endLonDeg.append(endLonDeg)
+		self.endAltMeters.append(endAltMeters)
+		self.icon.append(icon)
+		self.description.append(description)
+		self.UAVsOnBoard.append(UAVsOnBoard)
+		self.ganttStatus.append(ganttStatus)
+
+	def grouped(self):
+		# Returns the rows, grouped by vehicle and then by status (in the order each vehicle/status first appears).
+		# Within each group, the rows are in the order they were added.
+		groups = {}		# groups[vehicleID][statusID] = [row, ...]
+		for row in range(0,len(self.vehicleID)):
+			groups.setdefault(self.vehicleID[row], {}).setdefault(self.statusID[row], []).append(row)
+
+		rows = []
+		for vehicleID in groups:
+			for statusID in groups[vehicleID]:
+				rows.extend(groups[vehicleID][statusID])
+
+		return rows
+
+	def record(self, row):
+		# The row-th assignment, as a make_assignments object
+		return make_assignments(*[getattr(self, field)[row] for field in ASSIGNMENT_FIELDS])
@@ -4,12 +4,18 @@ import sys
 import time
 import datetime
 import math
+import numpy as np
 from parseCSV import *
 from gurobipy import *
 from collections import defaultdict
 
 import endurance_calculator
 import distance_functions
+from vehicle_classes import *
+from records import *
+from node_matrix import *
+from spatial_index import *
+from sortie_index import *
 
 
 # =============================================================
@@ -53,58 +59,23 @@ def make_dict():
 	return defaultdict(make_dict)
 
 
+def sortieVars(decvary, sorties):
+	# The variables decvary[v][i][j][k] of the given list of sorties [v, i, j, k]
+	return [decvary[v][i][j][k] for [v,i,j,k] in sorties]
 
-class make_node:
-	def __init__(self, nodeType, latDeg, lonDeg, altMeters, parcelWtLbs, serviceTimeTruck, serviceTimeUAV, address): 
-		# Set node[nodeID]
-		self.nodeType 			= nodeType
-		self.latDeg 			= latDeg
-		self.lonDeg				= lonDeg
-		self.altMeters			= altMeters
-		self.parcelWtLbs 		= parcelWtLbs
-		self.serviceTimeTruck	= serviceTimeTruck	# [seconds]
-		self.serviceTimeUAV 	= serviceTimeUAV	# [seconds]
-		self.address 			= address			# Might be None...need MapQuest to give us this info later.
-
-class make_assignments:
-	def __init__(self, vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus):
-		# Set assignments[v][statusID][statusIndex]
-		self.vehicleType 	= vehicleType
-		self.startTime 		= startTime
-		self.startNodeID	= startNodeID
-		self.startLatDeg 	= startLatDeg
-		self.startLonDeg 	= startLonDeg
-		self.startAltMeters = startAltMeters
-		self.endTime 		= endTime
-		self.endNodeID 		= endNodeID
-		self.endLatDeg		= endLatDeg
-		self.endLonDeg		= endLonDeg
-		self.endAltMeters 	= endAltMeters
-		self.icon			= icon
-		self.description 	= description
-		self.UAVsOnBoard 	= UAVsOnBoard
-		self.ganttStatus	= ganttStatus
-
-class make_packages:
-	def __init__(self, packageType, latDeg, lonDeg, deliveryTime, icon):
-		# Set packages[nodeID]
-		self.packageType 	= packageType
-		self.latDeg 		= latDeg
-		self.lonDeg 		= lonDeg
-		self.deliveryTime 	= deliveryTime
-		self.icon 			= icon
 
 
 def solve_mfstsp_IP(node, vehicle, travel, cutoffTime, REQUIRE_TRUCK_AT_DEPOT, REQUIRE_DRIVER, Etype):
 	
 	# Establish Gurobi data sets
+	# NOTE:  tau, tauprime[v], eee[v], sL[v], and sR[v] are nodeMatrix objects (see node_matrix.py).
 	C 			= []
-	tau			= defaultdict(make_dict)
-	tauprime 	= defaultdict(make_dict)
-	eee 		= defaultdict(make_dict)
+	tau			= None
+	tauprime 	= {}
+	eee 		= {}
 	V			= []		# Set of UAVs.
-	sL			= defaultdict(make_dict)
-	sR			= defaultdict(make_dict)
+	sL			= {}
+	sR			= {}
 	sigma		= {}
 	sigmaprime	= {}
 
@@ -128,73 +99,94 @@ def solve_mfstsp_IP(node, vehicle, travel, cutoffTime, REQUIRE_TRUCK_AT_DEPOT, R
 	node[c+1] = make_node(node[0].nodeType, node[0].latDeg, node[0].lonDeg, node[0].altMeters, node[0].parcelWtLbs, node[0].serviceTimeTruck, node[0].serviceTimeUAV, node[0].address) 
 	
 	
+	# Vehicles with identical parameters share the same tauprime and eee tables:
+	uavClasses = vehicleClasses(vehicle, enduranceFingerprint)
+
 	# Build tau (truck) and tauprime (UAV):
+	# NOTE: We need to capture the travel time to node c+1 (which is the same physical location as node 0).
 	minDistance = 0			# We'll use this to calculate big M later
 	for vehicleID in vehicle:
-		for i in N_zero:
-			for j in N_zero:
-				if (vehicle[vehicleID].vehicleType == TYPE_TRUCK):
-					tau[i][j] = travel[vehicleID][i][j].totalTime
-					if (tau[i][j] > minDistance):
-						minDistance = tau[i][j]
-				elif (vehicle[vehicleID].vehicleType == TYPE_UAV):
-					tauprime[vehicleID][i][j] = travel[vehicleID][i][j].totalTime
-				else:
-					print("ERROR:  Vehicle Type %d is not defined." % (vehicle[vehicleID].vehicleType))
-					quit()	
-					
-			# NOTE: We need to capture the travel time to node c+1 (which is the same physical location as node 0):
-			if (vehicle[vehicleID].vehicleType == TYPE_TRUCK):
-				tau[i][c+1] = travel[vehicleID][i][0].totalTime
-				if (tau[i][c+1] > minDistance):
-					minDistance = tau[i][c+1]
-			elif (vehicle[vehicleID].vehicleType == TYPE_UAV):
-				tauprime[vehicleID][i][c+1] = travel[vehicleID][i][0].totalTime
-			else:
-				print("ERROR:  Vehicle Type %d is not defined." % (vehicle[vehicleID].vehicleType))
-				quit()	
+		if (vehicle[vehicleID].vehicleType == TYPE_UAV) and (not uavClasses.isRepresentative(vehicleID)):
+			tauprime[vehicleID] = tauprime[uavClasses.representative(vehicleID)]
+		elif (vehicle[vehicleID].vehicleType == TYPE_TRUCK):
+			tau = nodeMatrix(withDepotCopy(travel[vehicleID].totalTime, c))
+			minDistance = max(minDistance, float(np.nanmax(tau.array)))
+		elif (vehicle[vehicleID].vehicleType == TYPE_UAV):
+			tauprime[vehicleID] = nodeMatrix(withDepotCopy(travel[vehicleID].totalTime, c))
+		else:
+			print("ERROR:  Vehicle Type %d is not defined." % (vehicle[vehicleID].vehicleType))
+			quit()	
 
 
 	# Build the set of all possible sorties:
-	P = []
+	# The sorties (and endurances) are only calculated once for each class of identical vehicles.
+	P = sortieSet()
+	sorties = {}	# sorties[rep] = [[i, j, k], ...]
 	for v in vehicle:
-		for i in N_zero:
-			for j in C:
-				if ((j != i) and (node[j].parcelWtLbs <= vehicle[v].capacityLbs)):
-					for k in N_plus:
-						if (k != i) and (k != j):
-							
-							# Calculate the endurance for each sortie:
-							if (k == c+1):
-								eee[v][i][j][k] = endurance_calculator.give_endurance(node, vehicle, travel, v, i, j, 0, Etype)
-							else:	
-								eee[v][i][j][k] = endurance_calculator.give_endurance(node, vehicle, travel, v, i, j, k, Etype)
-							
-							# If endurance is based on distance, build the P set using distance limitations:
-							if Etype == 5:
-								DISTij = distance_functions.groundDistanceStraight(node[i].latDeg*(math.pi/180), node[i].lonDeg*(math.pi/180), node[j].latDeg*(math.pi/180), node[j].lonDeg*(math.pi/180))
-								DISTjk = distance_functions.groundDistanceStraight(node[j].latDeg*(math.pi/180), node[j].lonDeg*(math.pi/180), node[k].latDeg*(math.pi/180), node[k].lonDeg*(math.pi/180))
+		rep = uavClasses.representative(v)
+		if (rep not in sorties):
+			sorties[rep] = []
+
+			# eee[rep][i][j][k] is only defined for i in N_zero, customers j != i (that rep can carry), and k in N_plus.
+			canCarry = [(i in C) and (node[i].parcelWtLbs <= vehicle[rep].capacityLbs) for i in N_zero]
+			repEee = np.full((c+2, c+2, c+2), np.nan)
+			if any(canCarry):
+				# Calculate the endurance for every sortie of rep at once.
+				# NOTE:  N_zero = [0, 1, ..., c], so endurance[i][j][k] is indexed directly by node IDs.
+				#		 Node c+1 is the same physical location as node 0.
+				endurance = endurance_calculator.give_endurance_tensor(node, vehicle, travel, rep, N_zero, Etype)
+
+				repEee[0:c+1] = withDepotCopy(endurance, c)
+				repEee[:,:,0] = np.nan
+				repEee[:,[j for j in N if ((j > c) or (not canCarry[j]))],:] = np.nan
+				repEee[list(N_zero),list(N_zero),:] = np.nan
+			if (vehicle[rep].vehicleType == TYPE_UAV):
+				eee[rep] = nodeMatrix(repEee)
+
+			# NOTE:  Vehicles that can't carry any parcel (e.g., the truck) have no sorties.
+			if any(canCarry):
+				# Only launch/recovery nodes within reach of customer j can be part of a sortie to j:
+				reach = nodeGrid(node, N, endurance_calculator.give_max_radius(node, vehicle, rep, C, Etype))
 
-								if vehicle[v].flightRange == 'low':
-									if DISTij + DISTjk <= 6*METERS_PER_MILE:
-										P.append([v,i,j,k])
-								elif vehicle[v].flightRange == 'high':
-									if DISTij + DISTjk <= 12*METERS_PER_MILE:
-										P.append([v,i,j,k])
-
-							else:
-								if (tauprime[v][i][j] + node[j].serviceTimeUAV + tauprime[v][j][k] <= eee[v][i][j][k]):
-									P.append([v,i,j,k])
+				for j in C:
+					if (canCarry[j]):
+						nearby = reach.neighbors(j)
+						for i in nearby:
+							if (i != c+1) and (i != j):
+								for k in nearby:
+									if (k != 0) and (k != i) and (k != j):
+
+										# If endurance is based on distance, build the P set using distance limitations:
+										if Etype == 5:
+											DISTij = distance_functions.groundDistanceStraight(node[i].latDeg*(math.pi/180), node[i].lonDeg*(math.pi/180), node[j].latDeg*(math.pi/180), node[j].lonDeg*(math.pi/180))
+											DISTjk = distance_functions.groundDistanceStraight(node[j].latDeg*(math.pi/180), node[j].lonDeg*(math.pi/180), node[k].latDeg*(math.pi/180), node[k].lonDeg*(math.pi/180))
+
+											if vehicle[rep].flightRange == 'low':
+												if DISTij + DISTjk <= 6*METERS_PER_MILE:
+													sorties[rep].append([i,j,k])
+											elif vehicle[rep].flightRange == 'high':
+												if DISTij + DISTjk <= 12*METERS_PER_MILE:
+													sorties[rep].append([i,j,k])
+
+										else:
+											if (tauprime[rep][i][j] + node[j].serviceTimeUAV + tauprime[rep][j][k] <= eee[rep][i][j][k]):
+												sorties[rep].append([i,j,k])
+
+				# List the sorties in the same order as if we had looped over i, j, and k:
+				sorties[rep].sort()
+
+		if (v != rep):
+			eee[v] = eee[rep]
+		for [i,j,k] in sorties[rep]:
+			P.append([v,i,j,k])
 
 
 	for v in V:
-		# Build the launch service times:
-		for i in N_zero:
-			sL[v][i] = vehicle[v].launchTime
+		# Build the launch service times (for i in N_zero):
+		sL[v] = nodeMatrix([vehicle[v].launchTime]*(c+1) + [np.nan])
 
-		# Build the recovery service times:
-		for k in N_plus:
-			sR[v][k] = vehicle[v].recoveryTime
+		# Build the recovery service times (for k in N_plus):
+		sR[v] = nodeMatrix([np.nan] + [vehicle[v].recoveryTime]*(c+1))
 			
 
 
@@ -236,6 +228,13 @@ def solve_mfstsp_IP(node, vehicle, travel, cutoffTime, REQUIRE_TRUCK_AT_DEPOT, R
 	decvarzprime 	= defaultdict(make_dict)
 	decvarzdp 		= defaultdict(make_dict)
 
+	# NOTE:  bulk_model (and scipy) is only imported here, so the heuristic (which imports this file via main.py)
+	#		 doesn't need scipy.
+	from bulk_model import bulkVars, bulkRows
+
+	# NOTE:  The variables are created all at once (see bulkVars.create()), in the order they are listed here.
+	newVars = bulkVars()
+
 	RELAX = False
 	if (RELAX):
 		myVtype = GRB.CONTINUOUS
@@ -246,68 +245,65 @@ def solve_mfstsp_IP(node, vehicle, travel, cutoffTime, REQUIRE_TRUCK_AT_DEPOT, R
 	for i in N_zero:
 		for j in N_plus:
 			if (i != j):
-				decvarx[i][j] = m.addVar(lb=0, ub=1, obj=0, vtype=myVtype, name="x.%d.%d" % (i,j))
+				newVars.add(decvarx[i], j, lb=0, ub=1, obj=0, vtype=myVtype, name="x.%d.%d" % (i,j))
 
 		for j in C:
 			if (j != i):
 				if (i == 0):
 					# Hard-code p_{0,j} = 1 for all j in C:
-					decvarp[i][j] = m.addVar(lb=1, ub=1, obj=0, vtype=myVtype, name="p.%d.%d" % (i,j))
+					newVars.add(decvarp[i], j, lb=1, ub=1, obj=0, vtype=myVtype, name="p.%d.%d" % (i,j))
 				else:
-					decvarp[i][j] = m.addVar(lb=0, ub=1, obj=0, vtype=myVtype, name="p.%d.%d" % (i,j))
+					newVars.add(decvarp[i], j, lb=0, ub=1, obj=0, vtype=myVtype, name="p.%d.%d" % (i,j))
 
 	for v in V:
 		# UAVs only!
 		for i in N_zero:
-			for j in C:
-				if (j != i):
-					for k in N_plus:
-						if ([v,i,j,k] in P):
-							decvary[v][i][j][k] = m.addVar(lb=0, ub=1, obj=0, vtype=myVtype, name="y.%d.%d.%d.%d" % (v,i,j,k))
+			for [v,i,j,k] in P.launchedFrom(v, i):
+				newVars.add(decvary[v][i][j], k, lb=0, ub=1, obj=0, vtype=myVtype, name="y.%d.%d.%d.%d" % (v,i,j,k))
 		# UAVs only!
 		for i in N:
-			decvarchecktprime[v][i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="checktprime.%d.%d" % (v, i))
-			decvarhattprime[v][i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="hattprime.%d.%d" % (v, i))
+			newVars.add(decvarchecktprime[v], i, lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="checktprime.%d.%d" % (v, i))
+			newVars.add(decvarhattprime[v], i, lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="hattprime.%d.%d" % (v, i))
 
 	
 	for i in N:
 		if (REQUIRE_TRUCK_AT_DEPOT):
 			if (i == c+1):
 				# This is our only term in the objective function (for hatt):
-				decvarhatt[i] = m.addVar(lb = 0, obj=1, vtype=GRB.CONTINUOUS, name="hatt.%d" % (i))
-				decvarbart[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="bart.%d" % (i))			
-				decvarcheckt[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="checkt.%d" % (i))			
+				newVars.add(decvarhatt, i, lb = 0, obj=1, vtype=GRB.CONTINUOUS, name="hatt.%d" % (i))
+				newVars.add(decvarbart, i, lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="bart.%d" % (i))			
+				newVars.add(decvarcheckt, i, lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="checkt.%d" % (i))			
 	
 			elif (i == 0):
 				# DON'T Hard-code \hat{t}_{0} = \bar{t}_{0} = 0.
 				# However, \check{t}_{0} = 0
-				decvarhatt[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="hatt.%d" % (i))			
-				decvarbart[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="bart.%d" % (i))			
-				decvarcheckt[i] = m.addVar(lb = 0, ub = 0, obj=0, vtype=GRB.CONTINUOUS, name="checkt.%d" % (i))			
+				newVars.add(decvarhatt, i, lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="hatt.%d" % (i))			
+				newVars.add(decvarbart, i, lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="bart.%d" % (i))			
+				newVars.add(decvarcheckt, i, lb = 0, ub = 0, obj=0, vtype=GRB.CONTINUOUS, name="checkt.%d" % (i))			
 	
 			else:
 				# Just a regular non-negative continuous decision variable:
-				decvarhatt[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="hatt.%d" % (i))
-				decvarbart[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="bart.%d" % (i))			
-				decvarcheckt[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="checkt.%d" % (i))			
+				newVars.add(decvarhatt, i, lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="hatt.%d" % (i))
+				newVars.add(decvarbart, i, lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="bart.%d" % (i))			
+				newVars.add(decvarcheckt, i, lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="checkt.%d" % (i))			
 		else:
 			if (i == c+1):
 				# This is our only term in the objective function (for hatt):
-				decvarhatt[i] = m.addVar(lb = 0, obj=1, vtype=GRB.CONTINUOUS, name="hatt.%d" % (i))
-				decvarbart[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="bart.%d" % (i))			
-				decvarcheckt[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="checkt.%d" % (i))			
+				newVars.add(decvarhatt, i, lb = 0, obj=1, vtype=GRB.CONTINUOUS, name="hatt.%d" % (i))
+				newVars.add(decvarbart, i, lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="bart.%d" % (i))			
+				newVars.add(decvarcheckt, i, lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="checkt.%d" % (i))			
 	
 			elif (i == 0):
 				# Hard-code \hat{t}_{0} = \check{t}_{0} = \bar{t}_{0} = 0:
-				decvarhatt[i] = m.addVar(lb = 0, ub = 0, obj=0, vtype=GRB.CONTINUOUS, name="hatt.%d" % (i))			
-				decvarbart[i] = m.addVar(lb = 0, ub = 0, obj=0, vtype=GRB.CONTINUOUS, name="bart.%d" % (i))			
-				decvarcheckt[i] = m.addVar(lb = 0, ub = 0, obj=0, vtype=GRB.CONTINUOUS, name="checkt.%d" % (i))			
+				newVars.add(decvarhatt, i, lb = 0, ub = 0, obj=0, vtype=GRB.CONTINUOUS, name="hatt.%d" % (i))			
+				newVars.add(decvarbart, i, lb = 0, ub = 0, obj=0, vtype=GRB.CONTINUOUS, name="bart.%d" % (i))			
+				newVars.add(decvarcheckt, i, lb = 0, ub = 0, obj=0, vtype=GRB.CONTINUOUS, name="checkt.%d" % (i))			
 	
 			else:
 				# Just a regular non-negative continuous decision variable:
-				decvarhatt[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="hatt.%d" % (i))
-				decvarbart[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="bart.%d" % (i))			
-				decvarcheckt[i] = m.addVar(lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="checkt.%d" % (i))			
+				newVars.add(decvarhatt, i, lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="hatt.%d" % (i))
+				newVars.add(decvarbart, i, lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="bart.%d" % (i))			
+				newVars.add(decvarcheckt, i, lb = 0, obj=0, vtype=GRB.CONTINUOUS, name="checkt.%d" % (i))			
 
 
 	if (REQUIRE_DRIVER):
@@ -323,22 +319,24 @@ def solve_mfstsp_IP(node, vehicle, travel, cutoffTime, REQUIRE_TRUCK_AT_DEPOT, R
 				for k in N_plus:
 					if ((v1 in V) and (v2 == 0) and (k == c+1)):
 						# Hardcode z^{R}_{v, 0, c+1} = 0 for all v in V:
-						decvarzr[v1][v2][k] = m.addVar(lb = 0, ub = 0, obj = 0, vtype=myVtype, name="zr.%d.%d.%d" % (v1,v2,k))
+						newVars.add(decvarzr[v1][v2], k, lb = 0, ub = 0, obj = 0, vtype=myVtype, name="zr.%d.%d.%d" % (v1,v2,k))
 					else:	
-						decvarzr[v1][v2][k] = m.addVar(lb = 0, ub = 1, obj = 0, vtype=myVtype, name="zr.%d.%d.%d" % (v1,v2,k))
+						newVars.add(decvarzr[v1][v2], k, lb = 0, ub = 1, obj = 0, vtype=myVtype, name="zr.%d.%d.%d" % (v1,v2,k))
 
 				for k in N_zero:
-					decvarzl[v1][v2][k] = m.addVar(lb = 0, ub = 1, obj = 0, vtype=myVtype, name="zl.%d.%d.%d" % (v1,v2,k))						
+					newVars.add(decvarzl[v1][v2], k, lb = 0, ub = 1, obj = 0, vtype=myVtype, name="zl.%d.%d.%d" % (v1,v2,k))						
 
 	for v1 in V:
 		for v2 in V:
 			if (v2 != v1):
 				for k in C:
-					decvarzprime[v1][v2][k] = m.addVar(lb = 0, ub = 1, obj = 0, vtype=myVtype, name="zprime.%d.%d.%d" % (v1,v2,k))
-					decvarzdp[v1][v2][k] = m.addVar(lb = 0, ub = 1, obj = 0, vtype=myVtype, name="zdp.%d.%d.%d" % (v1,v2,k))
+					newVars.add(decvarzprime[v1][v2], k, lb = 0, ub = 1, obj = 0, vtype=myVtype, name="zprime.%d.%d.%d" % (v1,v2,k))
+					newVars.add(decvarzdp[v1][v2], k, lb = 0, ub = 1, obj = 0, vtype=myVtype, name="zdp.%d.%d.%d" % (v1,v2,k))
 
 	for i in N_plus:
-		decvaru[i] = m.addVar(lb=1, ub=c+2, obj=0, vtype=GRB.CONTINUOUS, name="u.%d" % (i))
+		newVars.add(decvaru, i, lb=1, ub=c+2, obj=0, vtype=GRB.CONTINUOUS, name="u.%d" % (i))
+
+	newVars.create(m)
 
 	
 	# Define M
@@ -377,307 +375,328 @@ def solve_mfstsp_IP(node, vehicle, travel, cutoffTime, REQUIRE_TRUCK_AT_DEPOT, R
 	m.update()
 
 	#### Start adding constraints:
+	# NOTE:  Each constraint is queued as a row of coefficients (see bulkRows in bulk_model.py), with every variable
+	#		 on the left-hand side and the constant on the right-hand side.  The rows are added to the model in the
+	#		 order they're queued.
+	rows = bulkRows(m)
 
 	# Constraint ensuring that there are a minimum of LTL number of truck customers: (NOT IN THE IP MODEL)
-	m.addConstr(quicksum(quicksum(decvarx[i][j] for j in C if j != i) for i in N_zero) >= LTL, "MIN.LTL")
+	truckVars = [decvarx[i][j] for i in N_zero for j in C if j != i]
+	rows.add([1]*len(truckVars), truckVars, GRB.GREATER_EQUAL, LTL, "MIN.LTL")
 
 
 	for j in C:
 		# Constraint (2): Visit each customer exactly once
-		m.addConstr(quicksum(decvarx[i][j] for i in N_zero if i != j) + quicksum(quicksum(quicksum(decvary[v][i][j][k] for k in N_plus if [v,i,j,k] in P) for i in N_zero if i != j) for v in V)  == 1, "Constr.2.%d" % j)
+		inVars = [decvarx[i][j] for i in N_zero if i != j]
+		uavVars = [var for v in V for var in sortieVars(decvary, P.serving(v, j))]
+		rows.add([1]*len(inVars) + [1]*len(uavVars), inVars + uavVars, GRB.EQUAL, 1, "Constr.2.%d" % j)
 		
 		# Constraint (5): IN=OUT, truck
-		m.addConstr(quicksum(decvarx[i][j] for i in N_zero if i != j) == quicksum(decvarx[j][k] for k in N_plus if k != j), "Constr.5.%d" % j)
+		outVars = [decvarx[j][k] for k in N_plus if k != j]
+		rows.add([1]*len(inVars) + [-1]*len(outVars), inVars + outVars, GRB.EQUAL, 0, "Constr.5.%d" % j)
 
 
 	# Constraint (3): Truck must leave the depot
-	m.addConstr(quicksum(decvarx[0][j] for j in N_plus) == 1, "Constr.3")
+	rows.add([1]*len(N_plus), [decvarx[0][j] for j in N_plus], GRB.EQUAL, 1, "Constr.3")
 
 	# Constraint (4): Truck must return to the depot
-	m.addConstr(quicksum(decvarx[i][c+1] for i in N_zero) == 1, "Constr.4")
+	rows.add([1]*len(N_zero), [decvarx[i][c+1] for i in N_zero], GRB.EQUAL, 1, "Constr.4")
 
 	
 	for v in V:
+		# Columns of the variables in Constraint (15), so its rows can be built as NumPy arrays:
+		hattprimeColumn = np.array([decvarhattprime[v][l].index for l in N])
+		launchColumn = []		# launchColumn[n] = column of y[v][l][q][n'], for the n-th sortie of v launched from a customer l
+		launchNodes = []		# launchNodes[n] = [l, q, n']
+		for l in C:
+			for [v,l,q,n] in P.launchedFrom(v, l):
+				launchColumn.append(decvary[v][l][q][n].index)
+				launchNodes.append([l, q, n])
+		launchColumn = np.array(launchColumn, dtype=np.int64)
+		launchNodes = np.array(launchNodes, dtype=np.int64).reshape(-1, 3)
+
 		for i in N_zero:
+			launched = sortieVars(decvary, P.launchedFrom(v, i))
+
 			# Constraint (6): UAV may be launched from any node (including the depot) at most once
-			m.addConstr(quicksum(quicksum(decvary[v][i][j][k] for k in N_plus if [v,i,j,k] in P) for j in C if j != i) <= 1), "Constr.6.%d.%d" % (v, i)
+			rows.add([1]*len(launched), launched, GRB.LESS_EQUAL, 1, "Constr.6.%d.%d" % (v, i))
+
+			pColumn = np.full(c+2, -1, dtype=np.int64)
+			for l in C:
+				if (l != i):
+					pColumn[l] = decvarp[i][l].index
 			
 			for k in N_plus:
 				if (k!=i):
-					for l in C:
-						if (l!=i):
-							if (l!=k):
-								exprl = LinExpr()
-								exprl.clear()
-								exprr = LinExpr()
-								exprr.clear()
-					
-								exprl.add(decvarhattprime[v][l],1)
-								exprl.add(decvarchecktprime[v][k],-1)
-								exprr.addConstant(-3*M)
-								exprr.add(decvarp[i][l],M)
-								for j in C:
-									if ([v,i,j,k] in P):
-										if (j!=l):
-											exprr.add(decvary[v][i][j][k],M)
-								for q in C:
-									if (q != i):
-										if (q != k):
-											if (q != l):
-												for n in N_plus:
-													if ([v,l,q,n] in P):
-														if (n != i):
-															if (n != k):
-																exprr.add(decvary[v][l][q][n],M)
-								# Constraint (15): No overlapping sorties
-								m.addConstr(exprl, GRB.GREATER_EQUAL, exprr, "Constr.15.%d.%d.%d.%d" % (v,i,k,l))
+					ikSorties = P.between(v, i, k)
+
+					# Constraint (15): No overlapping sorties
+					# For each customer l (other than i and k):
+					#	hattprime[v][l] - checktprime[v][k] - M*p[i][l] - M*(sum of y[v][i][j][k], j != l)
+					#		- M*(sum of y[v][l][q][n], q and n not in {i, k})  >=  -3M
+					ls = np.array([l for l in C if (l != i) and (l != k)], dtype=np.int64)
+					numRows = len(ls)
+					rowOf = np.full(c+2, -1, dtype=np.int64)
+					rowOf[ls] = np.arange(numRows)
+
+					ikColumn = np.array([decvary[v][i][j][k].index for [v,i,j,k] in ikSorties], dtype=np.int64)
+					ikCust = np.array([j for [v,i,j,k] in ikSorties], dtype=np.int64)
+					ikRow = np.repeat(np.arange(numRows), len(ikColumn))
+					ikKeep = (np.tile(ikCust, numRows) != ls[ikRow])
+
+					lKeep = (rowOf[launchNodes[:,0]] >= 0)
+					for col in [1, 2]:
+						lKeep &= (launchNodes[:,col] != i) & (launchNodes[:,col] != k)
+
+					rowIndex = np.concatenate([np.arange(numRows), np.arange(numRows), np.arange(numRows), ikRow[ikKeep], rowOf[launchNodes[lKeep,0]]])
+					colIndex = np.concatenate([hattprimeColumn[ls], np.full(numRows, decvarchecktprime[v][k].index), pColumn[ls], np.tile(ikColumn, numRows)[ikKeep], launchColumn[lKeep]])
+					coefs = np.concatenate([np.ones(numRows), -np.ones(numRows), np.full(len(colIndex) - 2*numRows, -M)])
+					byRow = np.argsort(rowIndex, kind='stable')
+					rowStart = np.concatenate([[0], np.cumsum(np.bincount(rowIndex, minlength=numRows))])
+					rows.addRows(rowStart, colIndex[byRow], coefs[byRow], GRB.GREATER_EQUAL, [-3*M]*numRows, ["Constr.15.%d.%d.%d.%d" % (v,i,k,l) for l in ls])
 
 					# Strengthening Constraint: (NOT IN THE IP MODEL)	
-					m.addConstr(decvarchecktprime[v][k] - sR[v][k] - decvarhattprime[v][i] <= quicksum((eee[v][i][j][k] - M)*decvary[v][i][j][k] for j in C if [v,i,j,k] in P) + M, "Constr.xxxxxx.%d.%d.%d" % (v,i,k))
+					ikVars = sortieVars(decvary, ikSorties)
+					rows.add([1, -1] + [M - eee[v][i][j][k] for [v,i,j,k] in ikSorties], [decvarchecktprime[v][k], decvarhattprime[v][i]] + ikVars, GRB.LESS_EQUAL, sR[v][k] + M, "Constr.xxxxxx.%d.%d.%d" % (v,i,k))
 
 			# Constraint (16): No UAV launch before arrival
-			m.addConstr(decvarhattprime[v][i] >= decvarchecktprime[v][i] + sL[v][i] - M*(1 - quicksum(quicksum(decvary[v][i][j][k] for k in N_plus if [v,i,j,k] in P) for j in C if j != i)), "Constr.16.%d.%d" % (v,i))	
+			rows.add([1, -1] + [-M]*len(launched), [decvarhattprime[v][i], decvarchecktprime[v][i]] + launched, GRB.GREATER_EQUAL, sL[v][i] - M, "Constr.16.%d.%d" % (v,i))
 			
 			if (REQUIRE_DRIVER):
 				# Constraint (17): No UAV launch before truck arrives if delivery happens after
-				m.addConstr(decvarhattprime[v][i] >= decvarcheckt[i] + sL[v][i] - M*(1 - decvarzl[v][0][i]), "Constr.17.%d.%d" % (v,i))
+				rows.add([1, -1, -M], [decvarhattprime[v][i], decvarcheckt[i], decvarzl[v][0][i]], GRB.GREATER_EQUAL, sL[v][i] - M, "Constr.17.%d.%d" % (v,i))
 
 				# Constraint (18): No UAV launch before delivery happens, if it happens before launch	
-				m.addConstr(decvarhattprime[v][i] >= decvarbart[i] + sL[v][i] - M*(1 - decvarzl[0][v][i]), "Constr.18.%d.%d" % (v,i))			
+				rows.add([1, -1, -M], [decvarhattprime[v][i], decvarbart[i], decvarzl[0][v][i]], GRB.GREATER_EQUAL, sL[v][i] - M, "Constr.18.%d.%d" % (v,i))
 			else:
 				# Constraint (60): 
-				m.addConstr(decvarhattprime[v][i] >= decvarcheckt[i] + sL[v][i] - M*(1 - quicksum(quicksum(decvary[v][i][j][k] for k in N_plus if [v,i,j,k] in P) for j in C if j != i)), "Constr.58.%d.%d" % (v,i))	
+				rows.add([1, -1] + [-M]*len(launched), [decvarhattprime[v][i], decvarcheckt[i]] + launched, GRB.GREATER_EQUAL, sL[v][i] - M, "Constr.58.%d.%d" % (v,i))
 	
 			# Strengthening Constraint: (NOT IN THE IP MODEL)	
 			if (REQUIRE_TRUCK_AT_DEPOT):
-				m.addConstr(decvarhatt[c+1] >= decvarhattprime[v][i] + quicksum(quicksum( (tauprime[v][i][j] + sigmaprime[j] + tauprime[v][j][k] + sR[v][k]) * decvary[v][i][j][k] for k in N_plus if [v,i,j,k] in P) for j in C if j != i), "Constr.x2.%d.%d" % (v,i))
+				rows.add([1, -1] + [-(tauprime[v][i][j] + sigmaprime[j] + tauprime[v][j][k] + sR[v][k]) for [v,i,j,k] in P.launchedFrom(v, i)], [decvarhatt[c+1], decvarhattprime[v][i]] + launched, GRB.GREATER_EQUAL, 0, "Constr.x2.%d.%d" % (v,i))
 
 
 		for k in N_plus:
+			recovered = sortieVars(decvary, P.recoveredAt(v, k))
+
 			# Constraint (7): UAV may rendezvous at any node, including depot, at most once 
-			m.addConstr(quicksum(quicksum(decvary[v][i][j][k] for j in C if [v,i,j,k] in P) for i in N_zero if i != k) <= 1), "Constr.7.%d.%d" % (v, k)
+			rows.add([1]*len(recovered), recovered, GRB.LESS_EQUAL, 1, "Constr.7.%d.%d" % (v, k))
 
 			if (REQUIRE_DRIVER):
 				if (REQUIRE_TRUCK_AT_DEPOT):
 					# Constraint (25):
-					m.addConstr(decvarchecktprime[v][k] >= decvarcheckt[k] + sR[v][k] - M*(1 - decvarzr[v][0][k]), "Constr.23.%d.%d" % (v,k))
+					rows.add([1, -1, -M], [decvarchecktprime[v][k], decvarcheckt[k], decvarzr[v][0][k]], GRB.GREATER_EQUAL, sR[v][k] - M, "Constr.23.%d.%d" % (v,k))
 					# Constraint (26):			
-					m.addConstr(decvarchecktprime[v][k] >= decvarbart[k] + sR[v][k] - M*(1 - decvarzr[0][v][k]), "Constr.24.%d.%d" % (v,k))
+					rows.add([1, -1, -M], [decvarchecktprime[v][k], decvarbart[k], decvarzr[0][v][k]], GRB.GREATER_EQUAL, sR[v][k] - M, "Constr.24.%d.%d" % (v,k))
 				else:
 					if k != c+1:
 						# Constraint (56):
-						m.addConstr(decvarchecktprime[v][k] >= decvarcheckt[k] + sR[v][k] - M*(1 - decvarzr[v][0][k]), "Constr.54.%d.%d" % (v,k))
+						rows.add([1, -1, -M], [decvarchecktprime[v][k], decvarcheckt[k], decvarzr[v][0][k]], GRB.GREATER_EQUAL, sR[v][k] - M, "Constr.54.%d.%d" % (v,k))
 						# Constraint (57):
-						m.addConstr(decvarchecktprime[v][k] >= decvarbart[k] + sR[v][k] - M*(1 - decvarzr[0][v][k]), "Constr.55.%d.%d" % (v,k))
+						rows.add([1, -1, -M], [decvarchecktprime[v][k], decvarbart[k], decvarzr[0][v][k]], GRB.GREATER_EQUAL, sR[v][k] - M, "Constr.55.%d.%d" % (v,k))
 
 			else:
 				if (REQUIRE_TRUCK_AT_DEPOT):
 					# Constraint (61):
-					m.addConstr(decvarchecktprime[v][k] >= decvarcheckt[k] + sR[v][k] - M*(1 - quicksum(quicksum(decvary[v][i][j][k] for i in N_zero if [v,i,j,k] in P)  for j in C if j != i)) , "Constr.59.%d.%d" % (v,k))			
+					rows.add([1, -1] + [-M]*len(recovered), [decvarchecktprime[v][k], decvarcheckt[k]] + recovered, GRB.GREATER_EQUAL, sR[v][k] - M, "Constr.59.%d.%d" % (v,k))
 				else:
 					if k != c+1:
 						# Constraint (61):
-						m.addConstr(decvarchecktprime[v][k] >= decvarcheckt[k] + sR[v][k] - M*(1 - quicksum(quicksum(decvary[v][i][j][k] for i in N_zero if [v,i,j,k] in P)  for j in C if j != i)) , "Constr.59.%d.%d" % (v,k))
+						rows.add([1, -1] + [-M]*len(recovered), [decvarchecktprime[v][k], decvarcheckt[k]] + recovered, GRB.GREATER_EQUAL, sR[v][k] - M, "Constr.59.%d.%d" % (v,k))
 			
 			for j in C:
 				if (j != k):
 					# Constraint (29):
-					m.addConstr(decvarchecktprime[v][k] >= decvarhattprime[v][j] + tauprime[v][j][k] + sR[v][k] - M*(1 - quicksum(decvary[v][i][j][k] for i in N_zero if [v,i,j,k] in P)), "Constr.27.%d.%d.%d" % (v,k,j))
+					jkVars = sortieVars(decvary, P.servingTo(v, j, k))
+					rows.add([1, -1] + [-M]*len(jkVars), [decvarchecktprime[v][k], decvarhattprime[v][j]] + jkVars, GRB.GREATER_EQUAL, tauprime[v][j][k] + sR[v][k] - M, "Constr.27.%d.%d.%d" % (v,k,j))
 	
 
 			if (REQUIRE_TRUCK_AT_DEPOT):
 				# Constraint (36):
-				m.addConstr(decvarhatt[k] >= decvarchecktprime[v][k] - M*(1 - quicksum(quicksum(decvary[v][i][j][k] for j in C if [v,i,j,k] in P) for i in N_zero if i != k)), "Constr.34.%d.%d" % (v,k))	
+				rows.add([1, -1] + [-M]*len(recovered), [decvarhatt[k], decvarchecktprime[v][k]] + recovered, GRB.GREATER_EQUAL, -M, "Constr.34.%d.%d" % (v,k))
 			else:
 			 	if k != c+1:
 			 		# Constraint (36): (Only do this if concerned with minimizing the TRUCK return time, and not the last vehicle)
-			 		m.addConstr(decvarhatt[k] >= decvarchecktprime[v][k] - M*(1 - quicksum(quicksum(decvary[v][i][j][k] for j in C if [v,i,j,k] in P) for i in N_zero if i != k)), "Constr.34.%d.%d" % (v,k))
+			 		rows.add([1, -1] + [-M]*len(recovered), [decvarhatt[k], decvarchecktprime[v][k]] + recovered, GRB.GREATER_EQUAL, -M, "Constr.34.%d.%d" % (v,k))
 
 
 			# Strengthening Constraint: (NOT IN THE IP MODEL)	
-			m.addConstr(quicksum(quicksum(decvary[v][i][j][k] for j in C if [v,i,j,k] in P) for i in N_zero if i != k) <= quicksum(decvarx[h][k] for h in N_zero if h!=k), "Constr.XXXX.%d.%d" % (v,k))
+			inVars = [decvarx[h][k] for h in N_zero if h!=k]
+			rows.add([1]*len(recovered) + [-1]*len(inVars), recovered + inVars, GRB.LESS_EQUAL, 0, "Constr.XXXX.%d.%d" % (v,k))
 
 
 		for i in C:
-			for j in C:
-				if (j != i):
-					for k in N_plus:
-						if ([v,i,j,k] in P):
-							# Constraint (8): UAV can only be released from customer node if truck has visited customer node
-							m.addConstr(2*decvary[v][i][j][k] <= quicksum(decvarx[h][i] for h in N_zero if h!=i) + quicksum(decvarx[l][k] for l in C if l!=k), "Constr.8.%d.%d.%d.%d" % (v,i,j,k))
+			for [v,i,j,k] in P.launchedFrom(v, i):
+				# Constraint (8): UAV can only be released from customer node if truck has visited customer node
+				visitVars = [decvarx[h][i] for h in N_zero if h!=i] + [decvarx[l][k] for l in C if l!=k]
+				rows.add([2] + [-1]*len(visitVars), [decvary[v][i][j][k]] + visitVars, GRB.LESS_EQUAL, 0, "Constr.8.%d.%d.%d.%d" % (v,i,j,k))
 
-							# Constraint (30): Endurance limitations
-							m.addConstr(decvarchecktprime[v][k] - sR[v][k] - decvarhattprime[v][i] <= eee[v][i][j][k] + M*(1 - decvary[v][i][j][k]), "Constr.28.%d.%d.%d.%d" % (v,i,j,k))
+				# Constraint (30): Endurance limitations
+				rows.add([1, -1, M], [decvarchecktprime[v][k], decvarhattprime[v][i], decvary[v][i][j][k]], GRB.LESS_EQUAL, eee[v][i][j][k] + M + sR[v][k], "Constr.28.%d.%d.%d.%d" % (v,i,j,k))
 
 			
 			for k in N_plus:
 				if (k != i):
 					# Constraint (10): If UAV launches from node i and rendezvous at node k then truck must visit node i then k
-					m.addConstr(decvaru[k] - decvaru[i] >= 1 - (c+2)*(1-quicksum(decvary[v][i][j][k] for j in C if [v,i,j,k] in P)), "Constr.10.%d.%d.%d" % (v,i,k))
+					ikVars = sortieVars(decvary, P.between(v, i, k))
+					rows.add([1, -1] + [-(c+2)]*len(ikVars), [decvaru[k], decvaru[i]] + ikVars, GRB.GREATER_EQUAL, 1 - (c+2), "Constr.10.%d.%d.%d" % (v,i,k))
 
 
 		for j in C:
-			for k in N_plus:
-				if ([v,0,j,k] in P):
-					# Constraint (9): UAV may depart from depot and return to k only if truck visits k
-					m.addConstr(decvary[v][0][j][k] <= quicksum(decvarx[h][k] for h in N_zero if h!=k), "Constr.9.%d.%d.%d" % (v,j,k))
+			for [v,i,j,k] in P.servingFrom(v, 0, j):
+				# Constraint (9): UAV may depart from depot and return to k only if truck visits k
+				inVars = [decvarx[h][k] for h in N_zero if h!=k]
+				rows.add([1] + [-1]*len(inVars), [decvary[v][0][j][k]] + inVars, GRB.LESS_EQUAL, 0, "Constr.9.%d.%d.%d" % (v,j,k))
 
 
 			for i in N_zero:
 				if (i != j):
+					ijVars = sortieVars(decvary, P.servingFrom(v, i, j))
+
 					# Constraint (21):
-					m.addConstr(decvarchecktprime[v][j] >= decvarhattprime[v][i] + tauprime[v][i][j] - M*(1 - quicksum(decvary[v][i][j][k] for k in N_plus if [v,i,j,k] in P)), "Constr.21.%d.%d.%d" % (v,j,i))	
+					rows.add([1, -1] + [-M]*len(ijVars), [decvarchecktprime[v][j], decvarhattprime[v][i]] + ijVars, GRB.GREATER_EQUAL, tauprime[v][i][j] - M, "Constr.21.%d.%d.%d" % (v,j,i))
 
 					# Constraint (22):
-					m.addConstr(decvarchecktprime[v][j] <= decvarhattprime[v][i] + tauprime[v][i][j] + M*(1 - quicksum(decvary[v][i][j][k] for k in N_plus if [v,i,j,k] in P)), "Constr.21b.%d.%d.%d" % (v,j,i))	
+					rows.add([1, -1] + [M]*len(ijVars), [decvarchecktprime[v][j], decvarhattprime[v][i]] + ijVars, GRB.LESS_EQUAL, tauprime[v][i][j] + M, "Constr.21b.%d.%d.%d" % (v,j,i))
 			
+			served = sortieVars(decvary, P.serving(v, j))
+
 			# Constraint (23):
-			m.addConstr(decvarhattprime[v][j] >= decvarchecktprime[v][j] + sigmaprime[j]*(quicksum(quicksum(decvary[v][i][j][k] for k in N_plus if [v,i,j,k] in P) for i in N_zero if i != j)), "Constr.22.%d.%d" % (v,j))	
+			rows.add([1, -1] + [-sigmaprime[j]]*len(served), [decvarhattprime[v][j], decvarchecktprime[v][j]] + served, GRB.GREATER_EQUAL, 0, "Constr.22.%d.%d" % (v,j))
 
 			# Constraint (24):
-			m.addConstr(decvarhattprime[v][j] <= decvarchecktprime[v][j] + sigmaprime[j] + M*(1 - quicksum(quicksum(decvary[v][i][j][k] for k in N_plus if [v,i,j,k] in P) for i in N_zero if i != j)), "Constr.22b.%d.%d" % (v,j))	
+			rows.add([1, -1] + [M]*len(served), [decvarhattprime[v][j], decvarchecktprime[v][j]] + served, GRB.LESS_EQUAL, sigmaprime[j] + M, "Constr.22b.%d.%d" % (v,j))
 
 		for k in N_zero:
+			launched = sortieVars(decvary, P.launchedFrom(v, k))
 			if (REQUIRE_TRUCK_AT_DEPOT):
 				# Constraint (37):
-				m.addConstr(decvarhatt[k] >= decvarhattprime[v][k] - M*(1 - quicksum(quicksum(decvary[v][k][l][q] for q in N_plus if [v,k,l,q] in P) for l in C if l != k)), "Constr.35.%d.%d" % (v, k))
+				rows.add([1, -1] + [-M]*len(launched), [decvarhatt[k], decvarhattprime[v][k]] + launched, GRB.GREATER_EQUAL, -M, "Constr.35.%d.%d" % (v, k))
 			else:
 				if k != 0:
 					# Constraint (59):
-					m.addConstr(decvarhatt[k] >= decvarhattprime[v][k] - M*(1 - quicksum(quicksum(decvary[v][k][l][q] for q in N_plus if [v,k,l,q] in P) for l in C if l != k)), "Constr.57.%d.%d" % (v, k))
+					rows.add([1, -1] + [-M]*len(launched), [decvarhatt[k], decvarhattprime[v][k]] + launched, GRB.GREATER_EQUAL, -M, "Constr.57.%d.%d" % (v, k))
 			
 
 		for v2 in V:
 			if (v2 != v):
 				for k in N_plus:
+					recovered = sortieVars(decvary, P.recoveredAt(v, k))
+					recovered2 = sortieVars(decvary, P.recoveredAt(v2, k))
+
 					# Constraint (27):
-					m.addConstr(decvarchecktprime[v][k] >= decvarchecktprime[v2][k] + sR[v][k] - M*(1 - decvarzr[v2][v][k]), "Constr.25.%d.%d.%d" % (v,v2,k))
+					rows.add([1, -1, -M], [decvarchecktprime[v][k], decvarchecktprime[v2][k], decvarzr[v2][v][k]], GRB.GREATER_EQUAL, sR[v][k] - M, "Constr.25.%d.%d.%d" % (v,v2,k))
 
 					# Constraint (39):
-					m.addConstr(decvarzr[v][v2][k] <= quicksum(quicksum(decvary[v][i][j][k] for j in C if [v,i,j,k] in P) for i in N_zero if i != k), "Constr.37.%d.%d.%d" % (v,v2,k))
+					rows.add([1] + [-1]*len(recovered), [decvarzr[v][v2][k]] + recovered, GRB.LESS_EQUAL, 0, "Constr.37.%d.%d.%d" % (v,v2,k))
 
 					# Constraint (40):	
-					m.addConstr(decvarzr[v][v2][k] <= quicksum(quicksum(decvary[v2][i][j][k] for j in C if [v2,i,j,k] in P) for i in N_zero if i != k), "Constr.38.%d.%d.%d" % (v,v2,k))
+					rows.add([1] + [-1]*len(recovered2), [decvarzr[v][v2][k]] + recovered2, GRB.LESS_EQUAL, 0, "Constr.38.%d.%d.%d" % (v,v2,k))
 
 					# Constraint (41):	
-					m.addConstr(decvarzr[v][v2][k] + decvarzr[v2][v][k] <= 1, "Constr.39.%d.%d.%d" % (v,v2,k))	
+					rows.add([1, 1], [decvarzr[v][v2][k], decvarzr[v2][v][k]], GRB.LESS_EQUAL, 1, "Constr.39.%d.%d.%d" % (v,v2,k))
 
 					# Constraint (42):
-					m.addConstr(decvarzr[v][v2][k] + decvarzr[v2][v][k] + 1 >= quicksum(quicksum(decvary[v][i][j][k] for j in C if [v,i,j,k] in P) for i in N_zero if i != k) + quicksum(quicksum(decvary[v2][i][j][k] for j in C if [v2,i,j,k] in P) for i in N_zero if i != k), "Constr.40.%d.%d.%d" % (v,v2,k))	
+					rows.add([1, 1] + [-1]*len(recovered) + [-1]*len(recovered2), [decvarzr[v][v2][k], decvarzr[v2][v][k]] + recovered + recovered2, GRB.GREATER_EQUAL, -1, "Constr.40.%d.%d.%d" % (v,v2,k))
 
 				for k in C:
+					recovered = sortieVars(decvary, P.recoveredAt(v, k))
+					recovered2 = sortieVars(decvary, P.recoveredAt(v2, k))
+					launched = sortieVars(decvary, P.launchedFrom(v, k))
+					launched2 = sortieVars(decvary, P.launchedFrom(v2, k))
+
 					# Constraint (28):
-					m.addConstr(decvarchecktprime[v][k] >= decvarhattprime[v2][k] + sR[v][k] - M*(1 - decvarzprime[v2][v][k]), "Constr.26.%d.%d.%d" % (v,v2,k))	
+					rows.add([1, -1, -M], [decvarchecktprime[v][k], decvarhattprime[v2][k], decvarzprime[v2][v][k]], GRB.GREATER_EQUAL, sR[v][k] - M, "Constr.26.%d.%d.%d" % (v,v2,k))
 
 					# Constraint (48):
-					m.addConstr(decvarzprime[v2][v][k] <= quicksum(quicksum(decvary[v2][k][l][q] for q in N_plus if [v2,k,l,q] in P) for l in C if l != k), "Constr.46.%d.%d.%d" % (v,v2,k))	
+					rows.add([1] + [-1]*len(launched2), [decvarzprime[v2][v][k]] + launched2, GRB.LESS_EQUAL, 0, "Constr.46.%d.%d.%d" % (v,v2,k))
 
 					# Constraint (49):
-					m.addConstr(decvarzdp[v2][v][k] <= quicksum(quicksum(decvary[v][k][l][q] for q in N_plus if [v,k,l,q] in P) for l in C if l != k), "Constr.47.%d.%d.%d" % (v,v2,k))
+					rows.add([1] + [-1]*len(launched), [decvarzdp[v2][v][k]] + launched, GRB.LESS_EQUAL, 0, "Constr.47.%d.%d.%d" % (v,v2,k))
 
 					# Constraint (50):	
-					m.addConstr(decvarzprime[v2][v][k] <= quicksum(quicksum(decvary[v][i][j][k] for j in C if [v,i,j,k] in P) for i in N_zero if i != k), "Constr.48.%d.%d.%d" % (v,v2,k))
+					rows.add([1] + [-1]*len(recovered), [decvarzprime[v2][v][k]] + recovered, GRB.LESS_EQUAL, 0, "Constr.48.%d.%d.%d" % (v,v2,k))
 
 					# Constraint (51):	
-					m.addConstr(decvarzdp[v2][v][k] <= quicksum(quicksum(decvary[v2][i][j][k] for j in C if [v2,i,j,k] in P) for i in N_zero if i != k), "Constr.49.%d.%d.%d" % (v,v2,k))
+					rows.add([1] + [-1]*len(recovered2), [decvarzdp[v2][v][k]] + recovered2, GRB.LESS_EQUAL, 0, "Constr.49.%d.%d.%d" % (v,v2,k))
 
 					# Constraint (52):
-					m.addConstr(decvarzprime[v2][v][k] + decvarzdp[v][v2][k] + 1 >= quicksum(quicksum(decvary[v][i][j][k] for j in C if [v,i,j,k] in P) for i in N_zero if i != k) + quicksum(quicksum(decvary[v2][k][l][q] for q in N_plus if [v2,k,l,q] in P) for l in C if l != k), "Constr.50.%d.%d.%d" % (v,v2,k))	
+					rows.add([1, 1] + [-1]*len(recovered) + [-1]*len(launched2), [decvarzprime[v2][v][k], decvarzdp[v][v2][k]] + recovered + launched2, GRB.GREATER_EQUAL, -1, "Constr.50.%d.%d.%d" % (v,v2,k))
 					
 					# Constraint (53):
-					m.addConstr(decvarzprime[v2][v][k] + decvarzdp[v][v2][k] <= 1, "Constr.51.%d.%d.%d" % (v,v2,k))
+					rows.add([1, 1], [decvarzprime[v2][v][k], decvarzdp[v][v2][k]], GRB.LESS_EQUAL, 1, "Constr.51.%d.%d.%d" % (v,v2,k))
 
 					# Constraint (54):	
-					m.addConstr(decvarzprime[v2][v][k] + decvarzprime[v][v2][k] <= 1, "Constr.52.%d.%d.%d" % (v,v2,k))
+					rows.add([1, 1], [decvarzprime[v2][v][k], decvarzprime[v][v2][k]], GRB.LESS_EQUAL, 1, "Constr.52.%d.%d.%d" % (v,v2,k))
 
 					# Constraint (55):	
-					m.addConstr(decvarzdp[v2][v][k] + decvarzdp[v][v2][k] <= 1, "Constr.53.%d.%d.%d" % (v,v2,k))	
+					rows.add([1, 1], [decvarzdp[v2][v][k], decvarzdp[v][v2][k]], GRB.LESS_EQUAL, 1, "Constr.53.%d.%d.%d" % (v,v2,k))
 
 
 				for i in N_zero:
+					launched = sortieVars(decvary, P.launchedFrom(v, i))
+					launched2 = sortieVars(decvary, P.launchedFrom(v2, i))
+
 					# Constraint (19):
-					m.addConstr(decvarhattprime[v][i] >= decvarhattprime[v2][i] + sL[v][i] - M*(1 - decvarzl[v2][v][i]), "Constr.19.%d.%d.%d" % (v,v2,i))	
+					rows.add([1, -1, -M], [decvarhattprime[v][i], decvarhattprime[v2][i], decvarzl[v2][v][i]], GRB.GREATER_EQUAL, sL[v][i] - M, "Constr.19.%d.%d.%d" % (v,v2,i))
 
 					# Constraint (44):
-					m.addConstr(decvarzl[v][v2][i] <= quicksum(quicksum(decvary[v][i][j][k] for k in N_plus if [v,i,j,k] in P) for j in C if j != i), "Constr.42.%d.%d.%d" % (v,v2,i))	
+					rows.add([1] + [-1]*len(launched), [decvarzl[v][v2][i]] + launched, GRB.LESS_EQUAL, 0, "Constr.42.%d.%d.%d" % (v,v2,i))
 
 					# Constraint (45):
-					m.addConstr(decvarzl[v][v2][i] <= quicksum(quicksum(decvary[v2][i][j][k] for k in N_plus if [v2,i,j,k] in P) for j in C if j != i), "Constr.43.%d.%d.%d" % (v,v2,i))	
+					rows.add([1] + [-1]*len(launched2), [decvarzl[v][v2][i]] + launched2, GRB.LESS_EQUAL, 0, "Constr.43.%d.%d.%d" % (v,v2,i))
 
 					# Constraint (46):
-					m.addConstr(decvarzl[v][v2][i] + decvarzl[v2][v][i] <= 1, "Constr.44.%d.%d.%d" % (v,v2,i))	
+					rows.add([1, 1], [decvarzl[v][v2][i], decvarzl[v2][v][i]], GRB.LESS_EQUAL, 1, "Constr.44.%d.%d.%d" % (v,v2,i))
 
 					# Constraint (47):
-					m.addConstr(decvarzl[v][v2][i] + decvarzl[v2][v][i] + 1 >= quicksum(quicksum(decvary[v][i][j][k] for k in N_plus if [v,i,j,k] in P) for j in C if j != i) + quicksum(quicksum(decvary[v2][i][j][k] for k in N_plus if [v2,i,j,k] in P) for j in C if j != i), "Constr.45.%d.%d.%d" % (v,v2,i))	
+					rows.add([1, 1] + [-1]*len(launched) + [-1]*len(launched2), [decvarzl[v][v2][i], decvarzl[v2][v][i]] + launched + launched2, GRB.GREATER_EQUAL, -1, "Constr.45.%d.%d.%d" % (v,v2,i))
 
 				for i in C:
 					# Constraint (20):
-					m.addConstr(decvarhattprime[v2][i] >= decvarchecktprime[v][i] + sL[v2][i] - M*(1 - decvarzdp[v][v2][i]), "Constr.20.%d.%d.%d" % (v,v2,i))	
+					rows.add([1, -1, -M], [decvarhattprime[v2][i], decvarchecktprime[v][i], decvarzdp[v][v2][i]], GRB.GREATER_EQUAL, sL[v2][i] - M, "Constr.20.%d.%d.%d" % (v,v2,i))
 
 
 	for i in C:
 		for j in N_plus:
 			if (j!=i):
-				exprl = LinExpr()
-				exprl.clear()
-				exprl.add(decvaru[i], 1.0)
-				exprl.add(decvaru[j], -1.0)
-				exprl.add(decvarx[i][j], c+2)
-				exprr = LinExpr()
-				exprr.clear()
-				exprr.addConstant(c+1)
 				# Constraint (11): Subtour elimination for truck
-				m.addConstr(exprl, GRB.LESS_EQUAL, exprr, "Constr.11.%d.%d" % (i, j))
+				rows.add([1.0, -1.0, c+2], [decvaru[i], decvaru[j], decvarx[i][j]], GRB.LESS_EQUAL, c+1, "Constr.11.%d.%d" % (i, j))
 
 
 		# Determining values for p[i][j], where p[i][j] = 1 if customer i is visited before
 		# customer j and p[i][j] = 0 otherwise
 		for j in C:
 			if (i!=j):	
-				exprl = LinExpr()
-				exprl.clear()
-				exprr = LinExpr()
-				exprr.clear()
-				
-				exprl.add(decvaru[i],1)
-				exprl.add(decvaru[j],-1)
-				exprl.add(decvarp[i][j],c+2)
-				exprr.addConstant(1)
 				# Constraint (12):
-				m.addConstr(exprl, GRB.GREATER_EQUAL, exprr, "Constr.12.%d.%d" % (i,j))
+				rows.add([1, -1, c+2], [decvaru[i], decvaru[j], decvarp[i][j]], GRB.GREATER_EQUAL, 1, "Constr.12.%d.%d" % (i,j))
 
-				exprl2 = LinExpr()
-				exprl2.clear()
-				exprr2 = LinExpr()
-				exprr2.clear()
-				
-				exprl2.add(decvaru[i],1)
-				exprl2.add(decvaru[j],-1)
-				exprl2.add(decvarp[i][j],c+2)
-				exprr2.addConstant(c+1)
 				# Constraint (13):
-				m.addConstr(exprl2, GRB.LESS_EQUAL, exprr2, "Constr.13.%d.%d" % (i,j))
+				rows.add([1, -1, c+2], [decvaru[i], decvaru[j], decvarp[i][j]], GRB.LESS_EQUAL, c+1, "Constr.13.%d.%d" % (i,j))
 
 				# Constraint (14):
-				m.addConstr(decvarp[i][j] + decvarp[j][i] == 1, "Constr.14.%d.%d" % (i,j))
+				rows.add([1, 1], [decvarp[i][j], decvarp[j][i]], GRB.EQUAL, 1, "Constr.14.%d.%d" % (i,j))
 	
 
 	for i in N_zero:
 		for j in N_plus:
 			if (j != i):
 				# Constraint (31): Setting the truck's arrival time.
-				m.addConstr(decvarcheckt[j] >= decvarhatt[i] + tau[i][j] - M*(1 - decvarx[i][j]), "Constr.29.%d.%d" % (i,j))	
+				rows.add([1, -1, -M], [decvarcheckt[j], decvarhatt[i], decvarx[i][j]], GRB.GREATER_EQUAL, tau[i][j] - M, "Constr.29.%d.%d" % (i,j))
 
 		# Strengthening Constraint: (NOT IN THE IP MODEL)	
-		m.addConstr(decvarhatt[c+1] >= decvarhatt[i] + quicksum(tau[i][j] * decvarx[i][j] for j in N_plus if j != i), "Constr.x1.%d" % (i))
+		outJ = [j for j in N_plus if j != i]
+		rows.add([1, -1] + [-tau[i][j] for j in outJ], [decvarhatt[c+1], decvarhatt[i]] + [decvarx[i][j] for j in outJ], GRB.GREATER_EQUAL, 0, "Constr.x1.%d" % (i))
 
 
 	for k in N_plus:
 		# Constraint (32):
-		m.addConstr(decvarbart[k] >= decvarcheckt[k] + sigma[k]*(quicksum(decvarx[j][k] for j in N_zero if j != k)), "Constr.30.%d" % (k))
+		inVars = [decvarx[j][k] for j in N_zero if j != k]
+		rows.add([1, -1] + [-sigma[k]]*len(inVars), [decvarbart[k], decvarcheckt[k]] + inVars, GRB.GREATER_EQUAL, 0, "Constr.30.%d" % (k))
 
 		# Constraint (35):
-		m.addConstr(decvarhatt[k] >= decvarbart[k], "Constr.33.%d" % (k))	
+		rows.add([1, -1], [decvarhatt[k], decvarbart[k]], GRB.GREATER_EQUAL, 0, "Constr.33.%d" % (k))
 	
 
 	if (REQUIRE_DRIVER):
@@ -685,28 +704,32 @@ def solve_mfstsp_IP(node, vehicle, travel, cutoffTime, REQUIRE_TRUCK_AT_DEPOT, R
 			for v in V:
 				if (REQUIRE_TRUCK_AT_DEPOT):
 					# Constraint (33):
-					m.addConstr(decvarbart[k] >= decvarchecktprime[v][k] + sigma[k] - M*(1 - decvarzr[v][0][k]), "Constr.31.%d.%d" % (k, v))
+					rows.add([1, -1, -M], [decvarbart[k], decvarchecktprime[v][k], decvarzr[v][0][k]], GRB.GREATER_EQUAL, sigma[k] - M, "Constr.31.%d.%d" % (k, v))
 				else:
 					if k != c+1:
 						# Constraint (58):
-						m.addConstr(decvarbart[k] >= decvarchecktprime[v][k] + sigma[k] - M*(1 - decvarzr[v][0][k]), "Constr.56.%d.%d" % (k, v))			
+						rows.add([1, -1, -M], [decvarbart[k], decvarchecktprime[v][k], decvarzr[v][0][k]], GRB.GREATER_EQUAL, sigma[k] - M, "Constr.56.%d.%d" % (k, v))
 
 
 		for k in C:
 			for v in V:
 				# Constraint (34):
-				m.addConstr(decvarbart[k] >= decvarhattprime[v][k] + sigma[k] - M*(1 - decvarzl[v][0][k]), "Constr.32.%d.%d" % (k, v))			
+				rows.add([1, -1, -M], [decvarbart[k], decvarhattprime[v][k], decvarzl[v][0][k]], GRB.GREATER_EQUAL, sigma[k] - M, "Constr.32.%d.%d" % (k, v))
 
 
 		for v in V:
 			for k in N_plus:
 				# Constraint (38):
-				m.addConstr(decvarzr[0][v][k] + decvarzr[v][0][k] == quicksum(quicksum(decvary[v][i][j][k] for j in C if [v,i,j,k] in P) for i in N_zero if i != k), "Constr.36.%d.%d" % (v,k))	
+				recovered = sortieVars(decvary, P.recoveredAt(v, k))
+				rows.add([1, 1] + [-1]*len(recovered), [decvarzr[0][v][k], decvarzr[v][0][k]] + recovered, GRB.EQUAL, 0, "Constr.36.%d.%d" % (v,k))
 
 	
 			for i in N_zero:
 				# Constraint (43):
-				m.addConstr(decvarzl[0][v][i] + decvarzl[v][0][i] == quicksum(quicksum(decvary[v][i][j][k] for k in N_plus if [v,i,j,k] in P) for j in C if j != i), "Constr.41.%d.%d" % (v,i))	
+				launched = sortieVars(decvary, P.launchedFrom(v, i))
+				rows.add([1, 1] + [-1]*len(launched), [decvarzl[0][v][i], decvarzl[v][0][i]] + launched, GRB.EQUAL, 0, "Constr.41.%d.%d" % (v,i))
+
+	rows.create()
 
 	
 	# Solve
@@ -756,7 +779,7 @@ def solve_mfstsp_IP(node, vehicle, travel, cutoffTime, REQUIRE_TRUCK_AT_DEPOT, R
 		# BUILD ASSIGNMENTS AND PACKAGES DICTIONARIES:
 
 		packages = {}	# Datastructure to keep track of delivery type and delivery time of packages
-		assignments = defaultdict(make_dict)	# Datastructure to keep track of tasks of different vehicles
+		assignments = assignmentTable()	# Datastructure to keep track of tasks of different vehicles
 	
 	
 		# --------------------------------
@@ -783,28 +806,23 @@ def solve_mfstsp_IP(node, vehicle, travel, cutoffTime, REQUIRE_TRUCK_AT_DEPOT, R
 						break
 	
 		y = []				
-		for v in V:
+		for [v,i,j,k] in P:
 			# UAVs only!
-			for i in N_zero:
-				for j in C:
-					if (j != i):
-						for k in N_plus:
-							if ([v,i,j,k] in P):
-								if (decvary[v][i][j][k].x > 0.2):
-									y.append([v,i,j,k])
-									packages[j] = make_packages(TYPE_UAV, node[j].latDeg, node[j].lonDeg, decvarhattprime[v][j].x, packageIcons[0])
-	
-									print('y[%d][%d][%d][%d] = %f' % (v,i,j,k,decvary[v][i][j][k].x))
-									print('\t Arrive at i = %d: %f' % (i, decvarchecktprime[v][i].x))
-									print('\t Launch from i = %d: %f' % (i, decvarhattprime[v][i].x))
-									print('\t tauprime[%d][%d][%d] = %f' % (v, i, j, tauprime[v][i][j]))
-									print('\t Arrive at cust j = %d: %f' % (j, decvarchecktprime[v][j].x))
-									print('\t sigmaprime[%d] = %f' % (j, sigmaprime[j]))
-									print('\t Depart cust j = %d: %f' % (j, decvarhattprime[v][j].x))
-									print('\t tauprime[%d][%d][%d] = %f' % (v,j,k,tauprime[v][j][k]))
-									print('\t Arrive at k = %d: %f' % (k, decvarchecktprime[v][k].x))
-									print('\t Depart from k = %d: %f' % (k, decvarhattprime[v][k].x))
-									
+			if (decvary[v][i][j][k].x > 0.2):
+				y.append([v,i,j,k])
+				packages[j] = make_packages(TYPE_UAV, node[j].latDeg, node[j].lonDeg, decvarhattprime[v][j].x, packageIcons[0])
+	
+				print('y[%d][%d][%d][%d] = %f' % (v,i,j,k,decvary[v][i][j][k].x))
+				print('\t Arrive at i = %d: %f' % (i, decvarchecktprime[v][i].x))
+				print('\t Launch from i = %d: %f' % (i, decvarhattprime[v][i].x))
+				print('\t tauprime[%d][%d][%d] = %f' % (v, i, j, tauprime[v][i][j]))
+				print('\t Arrive at cust j = %d: %f' % (j, decvarchecktprime[v][j].x))
+				print('\t sigmaprime[%d] = %f' % (j, sigmaprime[j]))
+				print('\t Depart cust j = %d: %f' % (j, decvarhattprime[v][j].x))
+				print('\t tauprime[%d][%d][%d] = %f' % (v,j,k,tauprime[v][j][k]))
+				print('\t Arrive at k = %d: %f' % (k, decvarchecktprime[v][k].x))
+				print('\t Depart from k = %d: %f' % (k, decvarhattprime[v][k].x))
+				
 	
 		# Capture all UAVs that land at a particular node
 		# Capture all UAVs that launch from a particular node
@@ -1368,14 +1386,9 @@ def solve_mfstsp_IP(node, vehicle, travel, cutoffTime, REQUIRE_TRUCK_AT_DEPOT, R
 	
 		# Convert assignmentsArray into the assignments class:
 		for v in vehicle:
-			for i in range(0, len(assignmentsArray[v])):
-				statusID = assignmentsArray[v][i][0]
-				if (0 in assignments[v][statusID]):
-					statusIndex = len(assignments[v][statusID])
-				else:
-					statusIndex = 0
-				
-				assignments[v][statusID][statusIndex] = make_assignments(assignmentsArray[v][i][1], assignmentsArray[v][i][2], assignmentsArray[v][i][3], assignmentsArray[v][i][4], assignmentsArray[v][i][5], assignmentsArray[v][i][6], assignmentsArray[v][i][7], assignmentsArray[v][i][8], assignmentsArray[v][i][9], assignmentsArray[v][i][10], assignmentsArray[v][i][11], assignmentsArray[v][i][12], assignmentsArray[v][i][13], assignmentsArray[v][i][14], assignmentsArray[v][i][15])	
+			for myAssignment in assignmentsArray[v]:
+				# myAssignment = [statusID, vehicleType, startTime, ...]
+				assignments.add(v, *myAssignment)
 
 		
 	return(OFV, assignments, packages, isOptimal, bestBound, waitingTruck, waitingUAV) 
\ No newline at end of file
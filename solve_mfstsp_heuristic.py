@@ -10,6 +10,8 @@ from collections import defaultdict
 import copy
 
 import os
+import multiprocessing
+import numpy as np
 
 from mfstsp_heuristic_1_partition import *
 from mfstsp_heuristic_2_asgn_uavs import *
@@ -19,6 +21,14 @@ from local_search import *
 
 import endurance_calculator
 import distance_functions
+from vehicle_classes import *
+from records import *
+from node_matrix import *
+from spatial_index import *
+from tsp_local_search import *
+from tsp_cache import *
+from tour_registry import *
+from truck_tour import *
 
 import random
 
@@ -30,6 +40,35 @@ TYPE_TRUCK 		= 1
 TYPE_UAV 		= 2
 #
 
+# TSPtype (How Phase I finds TSP tours for the truck)
+TSP_TYPE_GUROBI 		= 1		# Exact, via tspEngine (solve_tsp_callback.py)
+TSP_TYPE_LOCAL_SEARCH 	= 2		# Heuristic, via tspLocalSearch (tsp_local_search.py)
+
+# P3type (How Phase III finds the timing of the truck and UAVs)
+P3_TYPE_MIP 			= 1		# Gurobi, via phase3Model (phase3_model.py)
+P3_TYPE_COMBINATORIAL 	= 2		# Branch-and-bound over the launch/recovery orders, via phase3Schedule (phase3_schedule.py)
+
+# Set to True to keep the truck's TSP tours in Problems/<problemName>/tbl_tsp_cache_<TSPtype>.pkl,
+# so later runs on the same problem can re-use them (see tsp_cache.py):
+TSP_CACHE_PERSIST = False
+
+# Set to True to print how many of Phase I's TSP tours came from the cache (hits), and how many were solved (misses):
+TSP_CACHE_STATS = False
+
+# Number of processes for the sweep over LTL values.  1 runs the sweep serially (as in the paper),
+# and None uses every core.  Parallel sweeps may not find the same solution as serial ones,
+# since the processes see each other's incumbents and TSP tours at different times:
+LTL_PROCESSES = 1
+
+# LOCAL_SEARCH_TYPE (How the heuristic improves the UAV sorties after Phase III, see local_search.py)
+LOCAL_SEARCH_SHIFT 			= 1		# Shift the UAVs the truck waits for to the next recovery node, and re-solve Phase III
+LOCAL_SEARCH_NEIGHBOURHOOD 	= 2		# Try recovery/launch shifts, UAV swaps, and customer reassignments, and re-solve Phase III for the best few (after LOCAL_SEARCH_SHIFT)
+LOCAL_SEARCH_TYPE = LOCAL_SEARCH_SHIFT
+
+# Number of moves (the best estimates) that LOCAL_SEARCH_NEIGHBOURHOOD re-solves Phase III for in each round.
+# Phase III is solved for these moves one at a time, so each round costs up to LOCAL_SEARCH_TOP_K (+1) Phase III solves:
+LOCAL_SEARCH_TOP_K = 3
+
 METERS_PER_MILE = 1609.34
 
 # http://stackoverflow.com/questions/635483/what-is-the-best-way-to-implement-nested-dictionaries-in-python
@@ -43,50 +82,9 @@ def make_dict():
 	# j = 12
 	# tau[v][i][j] = 44
 
-class make_node:
-	def __init__(self, nodeType, latDeg, lonDeg, altMeters, parcelWtLbs, serviceTimeTruck, serviceTimeUAV, address): 
-		# Set node[nodeID]
-		self.nodeType 			= nodeType
-		self.latDeg 			= latDeg
-		self.lonDeg				= lonDeg
-		self.altMeters			= altMeters
-		self.parcelWtLbs 		= parcelWtLbs
-		self.serviceTimeTruck	= serviceTimeTruck	# [seconds]
-		self.serviceTimeUAV 	= serviceTimeUAV	# [seconds]
-		self.address 			= address			# Might be None...need MapQuest to give us this info later.
-
-class make_assignments:
-	def __init__(self, vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus):
-		# Set assignments[v][statusID][statusIndex]
-		self.vehicleType 	= vehicleType
-		self.startTime 		= startTime
-		self.startNodeID	= startNodeID
-		self.startLatDeg 	= startLatDeg
-		self.startLonDeg 	= startLonDeg
-		self.startAltMeters = startAltMeters
-		self.endTime 		= endTime
-		self.endNodeID 		= endNodeID
-		self.endLatDeg		= endLatDeg
-		self.endLonDeg		= endLonDeg
-		self.endAltMeters 	= endAltMeters
-		self.icon			= icon
-		self.description 	= description
-		self.UAVsOnBoard 	= UAVsOnBoard
-		self.ganttStatus	= ganttStatus
-
-class make_packages:
-	def __init__(self, packageType, latDeg, lonDeg, deliveryTime, icon):
-		# Set packages[nodeID]
-		self.packageType 	= packageType
-		self.latDeg 		= latDeg
-		self.lonDeg 		= lonDeg
-		self.deliveryTime 	= deliveryTime
-		self.icon 			= icon
-
-
 # Function to generate TSP assignments for a given TSP tour:
 def generateTSPinfo(myTour, c, C, node, tau, sigma):
-	tmpAssignments = defaultdict(make_dict)
+	tmpAssignments = assignmentTable()
 
 	vehicleType = TYPE_TRUCK
 	UAVsOnBoard = []				
@@ -124,12 +122,7 @@ def generateTSPinfo(myTour, c, C, node, tau, sigma):
 			print('\t Quitting Now.')
 			exit()
 
-		if (0 in tmpAssignments[1][statusID]):
-			statusIndex = len(tmpAssignments[1][statusID])
-		else:
-			statusIndex = 0
-		
-		tmpAssignments[1][statusID][statusIndex] = make_assignments(vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus)
+		tmpAssignments.add(1, statusID, vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus)
 
 
 		# Now, capture the "service" component:
@@ -151,12 +144,7 @@ def generateTSPinfo(myTour, c, C, node, tau, sigma):
 			ganttStatus		= GANTT_DELIVER
 			description		= 'Dropping off package to Customer %d' % (j)
 
-		if (0 in tmpAssignments[1][statusID]):
-			statusIndex = len(tmpAssignments[1][statusID])
-		else:
-			statusIndex = 0
-		
-		tmpAssignments[1][statusID][statusIndex] = make_assignments(vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus)
+		tmpAssignments.add(1, statusID, vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus)
 
 		tmpDepart = endTime
 		if (j != c+1):
@@ -168,7 +156,7 @@ def generateTSPinfo(myTour, c, C, node, tau, sigma):
 	
 # Function to insert a UAV customer myj between two truck customers myi and myk, and obtain TSP assignments for the resulting TSP tour:		
 def insertTruckCustomer(myj, myi, myk, c, C, node, tau, sigma, x):
-	tmpAssignments = defaultdict(make_dict)
+	tmpAssignments = assignmentTable()
 	
 	vehicleType = TYPE_TRUCK
 	UAVsOnBoard = []
@@ -224,14 +212,9 @@ def insertTruckCustomer(myj, myi, myk, c, C, node, tau, sigma, x):
 				print('\t Quitting Now.')
 				exit()
 
-			if (0 in tmpAssignments[1][statusID]):
-				myIndex = len(tmpAssignments[1][statusID])
-			else:
-				myIndex = 0
-
 			TSPobjVal = max(TSPobjVal, endTime)
-			
-			tmpAssignments[1][statusID][myIndex] = make_assignments(vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus)
+
+			tmpAssignments.add(1, statusID, vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus)
 		
 
 			# Now, capture the "service" component at myj:
@@ -248,14 +231,9 @@ def insertTruckCustomer(myj, myi, myk, c, C, node, tau, sigma, x):
 			ganttStatus		= GANTT_DELIVER
 			description		= 'Dropping off package to Customer %d' % (j)
 			
-			if (0 in tmpAssignments[1][statusID]):
-				myIndex = len(tmpAssignments[1][statusID])
-			else:
-				myIndex = 0
-
 			TSPobjVal = max(TSPobjVal, endTime)
 
-			tmpAssignments[1][statusID][myIndex] = make_assignments(vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus)
+			tmpAssignments.add(1, statusID, vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus)
 	
 			tmpDepart = endTime
 	
@@ -278,25 +256,36 @@ def ImproveMakeSpan(c, myTSPtour, y, waitingArray, customersTruck, customersUAV,
 	bestSavings = 0
 	bestAction = []
 
+	# NOTE:  tourInfo knows the position of each node in the tour, and how long the truck takes between any two of them (see truck_tour.py).
+	#		 sortiesAt[j] = [[v,i,j,k], ...] are the sorties of y that launch from or land at j (in the order of y).
+	tourInfo = truckTour(myTSPtour, tau, sigma)
+	sortiesAt = {}
+	for [v,i,j,k] in y:
+		sortiesAt.setdefault(i, []).append([v,i,j,k])
+		sortiesAt.setdefault(k, []).append([v,i,j,k])
+
 
 	if len(V) < 1:
 		availUAVs = {}
 		LR = {}
 
+		# A UAV is away from the truck from the position of its launch node until the position before its recovery node:
+		numLeaving = [0]*len(myTSPtour)
+		for [v,i,j,k] in y:
+			numLeaving[tourInfo.position[i]] += 1
+			numLeaving[tourInfo.position[k]] -= 1
+
+		numAway = 0
 		for tmpIndex in range(0, len(myTSPtour)-1):
 			i_launch = myTSPtour[tmpIndex]
-			availUAVs[i_launch] = list(V)
+			numAway += numLeaving[tmpIndex]
+			if (numAway > 0):
+				availUAVs[i_launch] = []
+			else:
+				availUAVs[i_launch] = list(V)
 			if tmpIndex > 0:
 				LR[i_launch] = 0
 
-			for [v,i,j,k] in y:
-				p = myTSPtour.index(i)
-				q = myTSPtour.index(k) - 1
-
-				if tmpIndex >= p and tmpIndex <= q:
-					availUAVs[i_launch] = []
-					break
-
 		for [v,i,j,k] in y:
 			if i != myTSPtour[0]:
 				LR[i] += 1
@@ -311,26 +300,17 @@ def ImproveMakeSpan(c, myTSPtour, y, waitingArray, customersTruck, customersUAV,
 
 			if LR[j] <= 1:
 			
-				tmpTSPtour = list(myTSPtour)
-				tmpTSPtour.remove(j)
+				tmpTSPtour = tourInfo.without(j)
 
 				if (tmpTSPtour not in prevTSPtours):
 
 					continue_outer_loop = False
 
-					savings = tau[i][j] + sigma[j] + tau[j][k] - tau[i][k]
+					savings = tourInfo.removalSavings(j)
 
 					for [v,iprime,jprime,kprime] in y:
 						if (kprime == j):
-							p = myTSPtour.index(iprime)
-							q = myTSPtour.index(kprime)
-							duration_bw_i_j = 0
-							for r in range(p,q):
-								i_temp = myTSPtour[r]
-								j_temp = myTSPtour[r+1]
-								duration_bw_i_j += tau[i_temp][j_temp]
-								if r != q-1:
-									duration_bw_i_j += sigma[j_temp]
+							duration_bw_i_j = tourInfo.travelTime(iprime, kprime)
 							
 							duration_bw_i_k = duration_bw_i_j - tau[i][j] + tau[i][k]						
 							
@@ -346,15 +326,7 @@ def ImproveMakeSpan(c, myTSPtour, y, waitingArray, customersTruck, customersUAV,
 							break
 
 						if (iprime == j):
-							p = myTSPtour.index(iprime)
-							q = myTSPtour.index(kprime)
-							duration_bw_j_k = 0
-							for r in range(p,q):
-								i_temp = myTSPtour[r]
-								j_temp = myTSPtour[r+1]
-								duration_bw_j_k += tau[i_temp][j_temp]
-								if r != q-1:
-									duration_bw_j_k += sigma[j_temp]
+							duration_bw_j_k = tourInfo.travelTime(iprime, kprime)
 							
 							duration_bw_i_k = duration_bw_j_k - tau[j][k] + tau[i][k]						
 							
@@ -369,16 +341,8 @@ def ImproveMakeSpan(c, myTSPtour, y, waitingArray, customersTruck, customersUAV,
 
 							break
 
-						if (myTSPtour.index(iprime) < myTSPtour.index(j)) and (myTSPtour.index(kprime) > myTSPtour.index(j)):
-							p = myTSPtour.index(iprime)
-							q = myTSPtour.index(kprime)
-							duration_bw_i_k_before = 0
-							for r in range(p,q):
-								i_temp = myTSPtour[r]
-								j_temp = myTSPtour[r+1]
-								duration_bw_i_k_before += tau[i_temp][j_temp]
-								if r != q-1:
-									duration_bw_i_k_before += sigma[j_temp]
+						if (tourInfo.isBetween(iprime, j, kprime)):
+							duration_bw_i_k_before = tourInfo.travelTime(iprime, kprime)
 
 							duration_bw_i_k_after = duration_bw_i_k_before - tau[i][j] - sigma[j] - tau[j][k] + tau[i][k]
 
@@ -447,8 +411,7 @@ def ImproveMakeSpan(c, myTSPtour, y, waitingArray, customersTruck, customersUAV,
 			j = myTSPtour[tmpIndex+1]
 			k = myTSPtour[tmpIndex+2]
 			
-			tmpTSPtour = list(myTSPtour)
-			tmpTSPtour.remove(j)
+			tmpTSPtour = tourInfo.without(j)
 
 			if (tmpTSPtour not in prevTSPtours):
 
@@ -458,7 +421,7 @@ def ImproveMakeSpan(c, myTSPtour, y, waitingArray, customersTruck, customersUAV,
 				continue_outer_loop = False
 				duration_bw_i_k = tau[i][k]
 				LR_at_j = 0
-				for [v,iprime,jprime,kprime] in y:
+				for [v,iprime,jprime,kprime] in sortiesAt.get(j, []):
 					if (kprime == j):
 						LR_at_j += 1						
 						if (tau[i][k] <= eee[v][iprime][jprime][k]) and (tauprime[v][iprime][jprime] + sigmaprime[jprime] + tauprime[v][jprime][k] <= eee[v][iprime][jprime][k]):
@@ -524,17 +487,389 @@ def ImproveMakeSpan(c, myTSPtour, y, waitingArray, customersTruck, customersUAV,
 
 
 		
-def solve_mfstsp_heuristic(node, vehicle, travel, cutoffTime, problemName, problemType, REQUIRE_TRUCK_AT_DEPOT, REQUIRE_DRIVER, Etype, ITER):
+def heuristicLTL(LTL, ITER, node, vehicle, travel, cutoffTime, N, N_zero, N_plus, C, P, V, c, tau, tauprime, eee, eeePrime, sigma, sigmaprime, sL, sR, minDistance, REQUIRE_TRUCK_AT_DEPOT, REQUIRE_DRIVER, bestOFV, prevTSPtours, p1_previousTSP, FEASobjVal, TSPengine, P3model, P3type, sharedOFV=None, sharedP1=None):
+	# Run Phases I, II, and III (ITER times) for one value of the lower truck limit (LTL).
+	# Returns [bestOFV, bestSolution, p1_previousTSP, FEASobjVal], where
+	# bestSolution = [objVal, assignmentsArray, packagesArray, bestWaitingTruck, bestWaitingUAV] is the best solution
+	# that beats the bestOFV we were given (or None, if there isn't one).
+	# If sharedOFV is given (a multiprocessing.Value), the incumbent's makespan is shared with the other processes in the LTL sweep.
+	# If sharedP1 is given (see readSharedP1()), Phase I starts from where the previous task of the LTL sweep left it.
+
+	foundSolution = False
+
+	# LOCAL_SEARCH_NEIGHBOURHOOD solves (P3) for its moves in a model of its own (see below):
+	neighbourhoodP3model = phase3Model()
+	Pset = set([tuple(sortie) for sortie in P])		# The sorties that neighbourhoodMoves() may use
+
+	for iterVal in range(0,ITER):
+
+		# Another process may have found a better incumbent:
+		bestOFV = readSharedOFV(sharedOFV, bestOFV)
+
+		tryingP3improvement = False		# Initialize this flag
+	
+		requireUniqueTSP = True
+
+		#-------------------------------------------------PHASE I STARTS HERE---------------------------------------------------------#
+
+		# Partition customers between truck and UAVs, and generate a unique truck tour:
+		[p1_previousTSP, FEASobjVal] = readSharedP1(sharedP1, p1_previousTSP, FEASobjVal)
+		try:
+			[FEASobjVal, customersTruck, customersUAV, TSPobjVal, TSPassignments, TSPpackages, TSPtour, foundTSP, prevTSPtours, p1_previousTSP] = mfstsp_heuristic_1_partition(node, vehicle, travel, N, N_zero, N_plus, C, P, tau, tauprime, sigma, sigmaprime, sL, sR, LTL, requireUniqueTSP, prevTSPtours, bestOFV, p1_previousTSP, FEASobjVal, TSPengine)	
+		except:
+			# Don't leave the next task waiting for our Phase I:
+			failSharedP1(sharedP1)
+			raise
+		writeSharedP1(sharedP1, p1_previousTSP, FEASobjVal)
+
+
+		# If we cant find a unique TSP tour, go back to the start of Phase I with a new LTL:
+		if (not foundTSP):
+			continue
+
+		# Generate a lower bound:
+		optLowBnd = TSPobjVal
+		for j in customersUAV:
+			v = 2
+			optLowBnd += sL[v][j]
+			optLowBnd += sR[v][j]
+		
+		# If lower bound is greater than the current OFV, go back to the start of Phase I with a new LTL:	
+		if (optLowBnd >= bestOFV):
+			continue
+		
+		keepTrying2 = True
+
+		while (keepTrying2):
+			
+			keepTrying2 = False
+
+			bestOFV = readSharedOFV(sharedOFV, bestOFV)
+
+			#-------------------------------------------------PHASE II STARTS HERE---------------------------------------------------------#
+
+			# Create UAV sorties <v,i,j,k> (a pair of launch-recovery points and a UAV for each UAV customer)
+			[insertCost, x, y, z, insertTuple] = mfstsp_heuristic_2_asgn_uavs(node, eee, eeePrime, N_zero, N_plus, C, V, c, TSPassignments, customersUAV, customersTruck, sigma, sigmaprime, tau, tauprime, REQUIRE_TRUCK_AT_DEPOT, REQUIRE_DRIVER, vehicle, sL, sR, prevTSPtours)
+
+
+			# Generate an optimistic lower bound assuming that truck never waits for UAVs:
+			optLowBnd = TSPobjVal
+			optLowBnd += insertCost
+			for [v,i,j,k] in y:
+				if (i != 0):
+					optLowBnd += sL[v][i]
+				optLowBnd += sR[v][k]
+			
+
+			# Check for lower bound:
+			if (optLowBnd > bestOFV):	# lower bound is greater than the current OFV, so go back to the start of Phase I with a new LTL
+				canDo3 = False
+				keepTrying2 = False
+
+			else:	# lower bound is promising, check for Phase II feasibility
+				if (len(z) > 0):	# Phase II is not feasible, bceause customer z does not have a feasible assignment
+					canDo3 = False
+
+					if (tryingP3improvement):
+						# After finding a feasible Phase III solution, we try to move a customer to a UAV in the improvement step.
+						# If this isn't immediately feasible, we'll stop trying, and go back to the start of Phase I with a new LTL.
+						keepTrying2 = False
+						tryingP3improvement = False
+
+					else:
+						# Let's try inserting a UAV customer with infeasible assignment in truck route:
+						customersTruck.append(z[0])
+						customersUAV.remove(z[0])
+
+						# The UAV customer with cheapest insertion cost is z[0], and corresponding insertion location information is stored in insertTuple.
+						# Use insertTuple to create a new TSP, and obtain corresponding TSP assignments as following:
+						[tmpTSPassignments, tmpTSPobjVal, tmpTSPtour] = insertTruckCustomer(insertTuple['j'], insertTuple['i'], insertTuple['k'], c, C, node, tau, sigma, x)
+
+						if (tmpTSPtour in prevTSPtours):
+							# We've already seen this.  No need to re-try
+							keepTrying2 = False
+
+						else:
+							keepTrying2 = True	
+							TSPassignments = tmpTSPassignments
+							TSPobjVal = tmpTSPobjVal
+							TSPtour = list(tmpTSPtour)
+							prevTSPtours.append(TSPtour)
+
+				else:	# Phase II is feasible, and it seems worthwhile to try Phase III
+					canDo3 = True
+
+
+			if (canDo3):
+				
+				#-------------------------------------------------PHASE III STARTS HERE---------------------------------------------------------#
+				
+				# Solve (P3) to determine the schedule of different activities:
+				[p3isFeasible, p3objVal, tmpAssignmentsArray, tmpPackagesArray, waitingTruck, waitingUAV, waitingArray, landsat, launchesfrom, ls_checkt, ls_hatt, ls_checktprime] = mfstsp_heuristic_3_timing(x, y, z, node, eee, N, P, V, cutoffTime, c, sigma, sigmaprime, tau, tauprime, minDistance, sR, sL, vehicle, travel, REQUIRE_TRUCK_AT_DEPOT, REQUIRE_DRIVER, optLowBnd, P3model, P3type)
+
+
+				# Check Phase III feasibility:
+				if (p3isFeasible):
+
+					keepTrying2 = False														
+					
+					# Update the incumbent:
+					if (p3objVal < bestOFV):
+						
+						assignmentsArray = tmpAssignmentsArray
+						packagesArray = tmpPackagesArray
+						objVal = p3objVal
+
+						bestWaitingTruck = waitingTruck
+						bestWaitingUAV = waitingUAV
+						
+						bestOFV = p3objVal
+						foundSolution = True
+						writeSharedOFV(sharedOFV, bestOFV)
+
+
+					# Improvement Step: (to try to reduce the makespan by moving a truck customer to a UAV)
+					[bestSavings, bestAction, tmpTSPtour, tmpCustomersTruck, tmpCustomersUAV] = ImproveMakeSpan(c, TSPtour, y, waitingArray, customersTruck, customersUAV, V, sL, sR, tau, tauprime, sigma, sigmaprime, node, vehicle, eee, prevTSPtours)
+					tryingP3improvement = False
+
+					if (bestSavings > 0):	# If saving is possible, make the move and go back to Phase II
+						keepTrying2 = True
+						tryingP3improvement = True
+						
+						customersTruck = list(tmpCustomersTruck)
+						customersUAV = list(tmpCustomersUAV)
+
+						# Create TSP assignments using the new TSP tour:
+						[TSPobjVal, TSPassignments, TSPtour] = generateTSPinfo(tmpTSPtour, c, C, node, tau, sigma)
+						prevTSPtours.append(TSPtour)
+
+
+					else:	# Perform local search (try shifting retrieval points for UAVs to the next location, if the truck waits at the current retrieval location)
+						while (True):
+							# (local_search() updates landsat, launchesfrom, and ls_checktprime when it trades UAVs, so it gets copies.
+							# If Phase III is infeasible for its shifts, we keep the sorties and times of the last feasible solution.)
+							[shift_happened, tmp_y] = local_search(x, y, c, waitingArray, copy.deepcopy(landsat), copy.deepcopy(launchesfrom), dict(ls_checktprime), eee, tau, tauprime, sigma, sigmaprime, ls_checkt, ls_hatt, V, sL, sR)
+
+							if shift_happened == True: # Shift is possible. Therefore re-solve (P3) after making those shifts, and obtain new solution
+								p3Solution = mfstsp_heuristic_3_timing(x, tmp_y, z, node, eee, N, P, V, cutoffTime, c, sigma, sigmaprime, tau, tauprime, minDistance, sR, sL, vehicle, travel, REQUIRE_TRUCK_AT_DEPOT, REQUIRE_DRIVER, optLowBnd, P3model, P3type)
+
+								# Check Phase III feasibility:
+								if (p3Solution[0]):	# Phase III is feasible. Update the incumbent, and go back to local search
+									[p3isFeasible, p3objVal, tmpAssignmentsArray, tmpPackagesArray, waitingTruck, waitingUAV, waitingArray, landsat, launchesfrom, ls_checkt, ls_hatt, ls_checktprime] = p3Solution
+
+									y = []
+									for [v,i,j,k] in tmp_y:
+										y.append([v,i,j,k])
+
+									keepTrying2 = False														
+									
+									# Update the incumbent:
+									if (p3objVal < bestOFV):
+										
+										assignmentsArray = tmpAssignmentsArray
+										packagesArray = tmpPackagesArray
+										objVal = p3objVal
+
+										bestWaitingTruck = waitingTruck
+										bestWaitingUAV = waitingUAV
+										
+										bestOFV = p3objVal
+										foundSolution = True
+										writeSharedOFV(sharedOFV, bestOFV)
+
+								else:	# Phase III is infeasible. Go back to the start of Phase I with a new LTL.
+									break
+								
+							else:	# Shift is not possible. Go back to the start of Phase I with a new LTL.
+								break
+
+						if (LOCAL_SEARCH_TYPE == LOCAL_SEARCH_NEIGHBOURHOOD):	# Then perform local search over a larger neighbourhood of the UAV sorties
+							currentObjVal = p3objVal
+							while (currentObjVal > optLowBnd):
+								# The best few moves, and the shifts of local_search() (which move every UAV the truck waits for at once):
+								candidates = neighbourhoodMoves(x, y, c, waitingArray, ls_checktprime, eee, tau, tauprime, sigma, sigmaprime, ls_checkt, ls_hatt, V, sL, sR, Pset, LOCAL_SEARCH_TOP_K)
+								[shift_happened, tmp_y] = local_search(x, y, c, waitingArray, copy.deepcopy(landsat), copy.deepcopy(launchesfrom), dict(ls_checktprime), eee, tau, tauprime, sigma, sigmaprime, ls_checkt, ls_hatt, V, sL, sR)
+								if (shift_happened) and (tmp_y not in candidates):
+									candidates.append(tmp_y)
+
+								# Re-solve (P3) for each candidate, and keep the best of them (if it's an improvement).
+								# NOTE:  The candidates are solved one after another (not as a batch).  They are solved in a model
+								#		 of their own, so P3model sees the same sorties (in the same order) as with LOCAL_SEARCH_SHIFT.
+								#		 ((P3) is only solved to within its MIP gap, so its makespan depends on the earlier solves.)
+								bestMove = None
+								for tmp_y in candidates:
+									p3Solution = mfstsp_heuristic_3_timing(x, tmp_y, z, node, eee, N, P, V, cutoffTime, c, sigma, sigmaprime, tau, tauprime, minDistance, sR, sL, vehicle, travel, REQUIRE_TRUCK_AT_DEPOT, REQUIRE_DRIVER, optLowBnd, neighbourhoodP3model, P3type)
+									if (p3Solution[0]) and (p3Solution[1] < currentObjVal):
+										if (bestMove is None) or (p3Solution[1] < bestMove[1][1]):
+											bestMove = [tmp_y, p3Solution]
+
+								if (bestMove is None):	# No move helps. Go back to the start of Phase I with a new LTL.
+									break
+
+								[tmp_y, [p3isFeasible, p3objVal, tmpAssignmentsArray, tmpPackagesArray, waitingTruck, waitingUAV, waitingArray, landsat, launchesfrom, ls_checkt, ls_hatt, ls_checktprime]] = bestMove
+
+								y = []
+								for [v,i,j,k] in tmp_y:
+									y.append([v,i,j,k])
+
+								currentObjVal = p3objVal
+
+								# Update the incumbent:
+								if (p3objVal < bestOFV):
+
+									assignmentsArray = tmpAssignmentsArray
+									packagesArray = tmpPackagesArray
+									objVal = p3objVal
+
+									bestWaitingTruck = waitingTruck
+									bestWaitingUAV = waitingUAV
+
+									bestOFV = p3objVal
+									foundSolution = True
+									writeSharedOFV(sharedOFV, bestOFV)
+
+				else:
+					# Phase III is infeasible. Go back to the start of Phase I with a new LTL.
+					keepTrying2 = False
+			# End Phase III loop
+		# End keep trying Phase II loop
+	# End ITER loop
+
+	if (foundSolution):
+		bestSolution = [objVal, assignmentsArray, packagesArray, bestWaitingTruck, bestWaitingUAV]
+	else:
+		bestSolution = None
+
+	return (bestOFV, bestSolution, p1_previousTSP, FEASobjVal)
+
+
+def readSharedOFV(sharedOFV, bestOFV):
+	# The best makespan found by any process in the LTL sweep:
+	if (sharedOFV is None):
+		return bestOFV
+	return min(bestOFV, sharedOFV.value)
+
+
+def writeSharedOFV(sharedOFV, bestOFV):
+	# Let the other processes in the LTL sweep know about our new incumbent:
+	if (sharedOFV is not None):
+		with sharedOFV.get_lock():
+			if (bestOFV < sharedOFV.value):
+				sharedOFV.value = bestOFV
+
+
+# In the serial sweep, each run of Phase I starts from the truck tour of the previous run (p1_previousTSP and FEASobjVal).
+# The parallel sweep keeps this order, so its processes build the same truck tours (and solve the same TSPs) as the serial sweep:
+# sharedP1 = [p1States, p1Lock, task], where p1States[task] = [p1_previousTSP, FEASobjVal] after Phase I of the given task
+# (p1States[-1] is the state before the first task), and p1Lock is a Manager Condition.
+# Phase I waits for the previous task's Phase I, while Phases II and III run in parallel.
+# If Phase I of a task fails, p1States[task] = None, and the later tasks are skipped (see ltlTaskSkipped),
+# so the pool reports the failed task's exception instead of waiting forever.
+class ltlTaskSkipped(Exception):
+	# Raised by readSharedP1() when Phase I of the previous task failed
+	pass
+
+def readSharedP1(sharedP1, p1_previousTSP, FEASobjVal):
+	if (sharedP1 is None):
+		return (p1_previousTSP, FEASobjVal)
+
+	[p1States, p1Lock, task] = sharedP1
+	with p1Lock:
+		while (task-1 not in p1States):
+			p1Lock.wait()
+		p1State = p1States[task-1]
+
+	if (p1State is None):
+		failSharedP1(sharedP1)
+		raise ltlTaskSkipped()
+
+	return p1State
+
+def failSharedP1(sharedP1):
+	if (sharedP1 is None):
+		return
+
+	[p1States, p1Lock, task] = sharedP1
+	with p1Lock:
+		p1States[task] = None
+		p1Lock.notify_all()
+
+def writeSharedP1(sharedP1, p1_previousTSP, FEASobjVal):
+	if (sharedP1 is None):
+		return
+
+	[p1States, p1Lock, task] = sharedP1
+	with p1Lock:
+		p1States[task] = [list(p1_previousTSP), FEASobjVal]
+		p1Lock.notify_all()
+
+
+def makeTSPengine(node, vehicle, travel, problemName, TSPtype, sharedTSPs=None, sharedTSPlock=None):
+	# The truck's TSP solver is built once, and re-used every time Phase I needs a new TSP tour:
+	if (TSPtype == TSP_TYPE_GUROBI):
+		TSPengine = tspEngine(node, vehicle, travel)
+	elif (TSPtype == TSP_TYPE_LOCAL_SEARCH):
+		TSPengine = tspLocalSearch(node, vehicle, travel)
+	else:
+		print('ERROR: Sorry, I do not understand TSPtype = %d.' % (TSPtype))
+		exit()
+
+	# Phase I often asks for the tour of a set of truck customers it has already seen, so we cache the tours:
+	if (TSP_CACHE_PERSIST):
+		# (The tours depend on the truck's travel times and on the service times (sigma), from these files.)
+		sourceFiles = ['Problems/%s/tbl_locations.csv' % (problemName), 'Problems/%s/tbl_truck_travel_data_PG.csv' % (problemName)]
+		TSPengine = tspCache(TSPengine, cacheFile='Problems/%s/tbl_tsp_cache_%d.pkl' % (problemName, TSPtype), sourceFiles=sourceFiles, shared=sharedTSPs, sharedLock=sharedTSPlock)
+	else:
+		TSPengine = tspCache(TSPengine, shared=sharedTSPs, sharedLock=sharedTSPlock)
+
+	return TSPengine
+
+
+# Each process in a parallel LTL sweep keeps its own TSP solver and cache, (P3) model, and registry of TSP tours (the cache and registry share their tours with the other processes):
+ltlWorker = {}
+
+def initLTLworker(problemName, TSPtype, P3type, sharedOFV, sharedTours, sharedTSPs, sharedTSPlock, p1States, p1Lock, heuristicData):
+	ltlWorker['TSPengine'] 		= makeTSPengine(heuristicData[0], heuristicData[1], heuristicData[2], problemName, TSPtype, sharedTSPs, sharedTSPlock)
+	ltlWorker['P3model'] 		= phase3Model()
+	ltlWorker['P3type'] 		= P3type
+	ltlWorker['prevTSPtours'] 	= tourRegistry(sharedTours)
+	ltlWorker['sharedOFV'] 		= sharedOFV
+	ltlWorker['p1States'] 		= p1States
+	ltlWorker['p1Lock'] 		= p1Lock
+	ltlWorker['heuristicData'] 	= heuristicData
+
+def runLTLworker(task):
+	# Run one iteration of Phases I-III for the given task = [taskIndex, LTL] in this process.
+	# Returns [bestSolution, pid, TSP cache hits, TSP cache misses].
+	[node, vehicle, travel, cutoffTime, N, N_zero, N_plus, C, P, V, c, tau, tauprime, eee, eeePrime, sigma, sigmaprime, sL, sR, minDistance, REQUIRE_TRUCK_AT_DEPOT, REQUIRE_DRIVER] = ltlWorker['heuristicData']
+	TSPengine = ltlWorker['TSPengine']
+
+	bestOFV = readSharedOFV(ltlWorker['sharedOFV'], float('inf'))
+	[taskIndex, LTL] = task
+	sharedP1 = [ltlWorker['p1States'], ltlWorker['p1Lock'], taskIndex]
+	try:
+		[bestOFV, bestSolution, p1_previousTSP, FEASobjVal] = heuristicLTL(LTL, 1, node, vehicle, travel, cutoffTime, N, N_zero, N_plus, C, P, V, c, tau, tauprime, eee, eeePrime, sigma, sigmaprime, sL, sR, minDistance, REQUIRE_TRUCK_AT_DEPOT, REQUIRE_DRIVER, bestOFV, ltlWorker['prevTSPtours'], [], 0, TSPengine, ltlWorker['P3model'], ltlWorker['P3type'], ltlWorker['sharedOFV'], sharedP1)
+	except ltlTaskSkipped:
+		# An earlier task failed (the pool reports its exception)
+		bestSolution = None
+	TSPengine.save()
+
+	return (bestSolution, os.getpid(), TSPengine.hits, TSPengine.misses)
+
+
+
+def solve_mfstsp_heuristic(node, vehicle, travel, cutoffTime, problemName, problemType, REQUIRE_TRUCK_AT_DEPOT, REQUIRE_DRIVER, Etype, ITER, TSPtype=TSP_TYPE_GUROBI, P3type=P3_TYPE_MIP):
 	
 	# Establish system parameters:
+	# NOTE:  tau, tauprime[v], eee[v], eeePrime[v], sL[v], and sR[v] are nodeMatrix objects (see node_matrix.py).
 	C 			= []
-	tau			= defaultdict(make_dict)
-	tauprime 	= defaultdict(make_dict)
-	eee 		= defaultdict(make_dict) # Endurance (in seconds) of vehicle v if it travels from i --> j --> k
-	eeePrime 	= defaultdict(make_dict) # Maximum possible Enduance (in seconds) of vehicle v if it is launched from i and retrieved at k
+	tau			= None
+	tauprime 	= {}
+	eee 		= {} # Endurance (in seconds) of vehicle v if it travels from i --> j --> k
+	eeePrime 	= {} # Maximum possible Enduance (in seconds) of vehicle v if it is launched from i and retrieved at k
 	V			= []		# Set of UAVs.
-	sL			= defaultdict(make_dict)
-	sR			= defaultdict(make_dict)
+	sL			= {}
+	sR			= {}
 	sigma		= {}
 	sigmaprime	= {}
 
@@ -557,81 +892,107 @@ def solve_mfstsp_heuristic(node, vehicle, travel, cutoffTime, problemName, probl
 	node[c+1] = make_node(node[0].nodeType, node[0].latDeg, node[0].lonDeg, node[0].altMeters, node[0].parcelWtLbs, node[0].serviceTimeTruck, node[0].serviceTimeUAV, node[0].address) 
 	
 	
+	# UAVs with identical parameters share the same tauprime, eee, and eeePrime tables:
+	uavClasses = vehicleClasses(vehicle, enduranceFingerprint)
+
 	# Build tau (truck) and tauprime (UAV):
+	# NOTE: We need to capture the travel time to node c+1 (which is the same physical location as node 0).
 	minDistance = 0			# We'll use this to calculate big M later
 	for vehicleID in vehicle:
-		for i in N_zero:
-			for j in N_zero:
-				eeePrime[vehicleID][i][j] = 0
-				if (vehicle[vehicleID].vehicleType == TYPE_TRUCK):
-					tau[i][j] = travel[vehicleID][i][j].totalTime
-					if (tau[i][j] > minDistance):
-						minDistance = tau[i][j]
-				elif (vehicle[vehicleID].vehicleType == TYPE_UAV):
-					tauprime[vehicleID][i][j] = travel[vehicleID][i][j].totalTime
-				else:
-					print("ERROR:  Vehicle Type %d is not defined." % (vehicle[vehicleID].vehicleType))
-					quit()	
-					
-			# NOTE: We need to capture the travel time to node c+1 (which is the same physical location as node 0):
-			eeePrime[vehicleID][i][c+1] = 0
-			if (vehicle[vehicleID].vehicleType == TYPE_TRUCK):
-				tau[i][c+1] = travel[vehicleID][i][0].totalTime
-				if (tau[i][c+1] > minDistance):
-					minDistance = tau[i][c+1]
-			elif (vehicle[vehicleID].vehicleType == TYPE_UAV):
-				tauprime[vehicleID][i][c+1] = travel[vehicleID][i][0].totalTime
-			else:
-				print("ERROR:  Vehicle Type %d is not defined." % (vehicle[vehicleID].vehicleType))
-				quit()	
+		if (vehicle[vehicleID].vehicleType == TYPE_UAV) and (not uavClasses.isRepresentative(vehicleID)):
+			tauprime[vehicleID] = tauprime[uavClasses.representative(vehicleID)]
+		elif (vehicle[vehicleID].vehicleType == TYPE_TRUCK):
+			tau = nodeMatrix(withDepotCopy(travel[vehicleID].totalTime, c))
+			minDistance = max(minDistance, float(np.nanmax(tau.array)))
+		elif (vehicle[vehicleID].vehicleType == TYPE_UAV):
+			tauprime[vehicleID] = nodeMatrix(withDepotCopy(travel[vehicleID].totalTime, c))
+		else:
+			print("ERROR:  Vehicle Type %d is not defined." % (vehicle[vehicleID].vehicleType))
+			quit()	
 										
 										
 	# Build the set of all possible sorties: [v, i, j, k]
+	# The sorties (and endurances) are only calculated once for each class of identical UAVs.
 	P = []
+	sorties = {}	# sorties[rep] = [[i, j, k], ...]
 	for v in V:		# vehicle
-		for i in N_zero:
-			for j in C:
-				if ((j != i) and (node[j].parcelWtLbs <= vehicle[v].capacityLbs)):
-					for k in N_plus:
-						if (k != i) and (k != j):
-
-							# Calculate the endurance for each sortie:
-							if (k == c+1):
-								eee[v][i][j][k] = endurance_calculator.give_endurance(node, vehicle, travel, v, i, j, 0, Etype)
-							else:	
-								eee[v][i][j][k] = endurance_calculator.give_endurance(node, vehicle, travel, v, i, j, k, Etype)
-							eeePrime[v][i][k] = max(eeePrime[v][i][k], eee[v][i][j][k])		# This is only used in Phase 2
-
-							# If endurance is based on distance, build the P set using distance limitations:
-							if Etype == 5:
-								DISTij = distance_functions.groundDistanceStraight(node[i].latDeg*(math.pi/180), node[i].lonDeg*(math.pi/180), node[j].latDeg*(math.pi/180), node[j].lonDeg*(math.pi/180))
-								DISTjk = distance_functions.groundDistanceStraight(node[j].latDeg*(math.pi/180), node[j].lonDeg*(math.pi/180), node[k].latDeg*(math.pi/180), node[k].lonDeg*(math.pi/180))
-
-								if vehicle[v].flightRange == 'low':
-									if DISTij + DISTjk <= 6*METERS_PER_MILE:
-										P.append([v,i,j,k])
-								elif vehicle[v].flightRange == 'high':
-									if DISTij + DISTjk <= 12*METERS_PER_MILE:
-										P.append([v,i,j,k])
-
-							else:
-								if (tauprime[v][i][j] + node[j].serviceTimeUAV + tauprime[v][j][k] <= eee[v][i][j][k]):
-									if (REQUIRE_TRUCK_AT_DEPOT):
-										if (tau[i][k] <= eee[v][i][j][k]):
-											P.append([v,i,j,k])									
-									else:	
-										if ((k == c+1) or (tau[i][k] <= eee[v][i][j][k])):
-											P.append([v,i,j,k])   # This relaxes the requirement that the truck picks up the UAV from the depot at the end.
-
-	# Build the launch service times:
+		rep = uavClasses.representative(v)
+		if (rep not in sorties):
+			sorties[rep] = []
+
+			# eee[rep][i][j][k] is only defined for i in N_zero, customers j != i (that rep can carry), and k in N_plus.
+			# eeePrime[rep][i][k] is 0 unless rep can carry a parcel.
+			canCarry = [(i in C) and (node[i].parcelWtLbs <= vehicle[rep].capacityLbs) for i in N_zero]
+			repEee = np.full((c+2, c+2, c+2), np.nan)
+			repEeePrime = np.zeros((c+2, c+2))
+			repEeePrime[c+1,:] = np.nan
+			if any(canCarry):
+				# Calculate the endurance for every sortie of rep at once.
+				# NOTE:  N_zero = [0, 1, ..., c], so endurance[i][j][k] is indexed directly by node IDs.
+				#		 Node c+1 is the same physical location as node 0.
+				endurance = endurance_calculator.give_endurance_tensor(node, vehicle, travel, rep, N_zero, Etype)
+				maxEndurance = endurance_calculator.give_max_endurance(endurance, canCarry)
+
+				repEee[0:c+1] = withDepotCopy(endurance, c)
+				repEee[:,:,0] = np.nan
+				repEee[:,[j for j in N if ((j > c) or (not canCarry[j]))],:] = np.nan
+				repEee[list(N_zero),list(N_zero),:] = np.nan
+
+				repEeePrime[0:c+1,1:] = withDepotCopy(maxEndurance, c)[0:c+1,1:]		# eeePrime[rep][i][c+1] is only used in Phase 2
+				repEeePrime[list(N_zero),list(N_zero)] = 0
+			eee[rep] = nodeMatrix(repEee)
+			eeePrime[rep] = nodeMatrix(repEeePrime)
+
+			# NOTE:  Vehicles that can't carry any parcel (e.g., the truck) have no sorties.
+			if any(canCarry):
+				# Only launch/recovery nodes within reach of customer j can be part of a sortie to j:
+				reach = nodeGrid(node, N, endurance_calculator.give_max_radius(node, vehicle, rep, C, Etype))
+
+				for j in C:
+					if (canCarry[j]):
+						nearby = reach.neighbors(j)
+						for i in nearby:
+							if (i != c+1) and (i != j):
+								for k in nearby:
+									if (k != 0) and (k != i) and (k != j):
+
+										# If endurance is based on distance, build the P set using distance limitations:
+										if Etype == 5:
+											DISTij = distance_functions.groundDistanceStraight(node[i].latDeg*(math.pi/180), node[i].lonDeg*(math.pi/180), node[j].latDeg*(math.pi/180), node[j].lonDeg*(math.pi/180))
+											DISTjk = distance_functions.groundDistanceStraight(node[j].latDeg*(math.pi/180), node[j].lonDeg*(math.pi/180), node[k].latDeg*(math.pi/180), node[k].lonDeg*(math.pi/180))
+
+											if vehicle[rep].flightRange == 'low':
+												if DISTij + DISTjk <= 6*METERS_PER_MILE:
+													sorties[rep].append([i,j,k])
+											elif vehicle[rep].flightRange == 'high':
+												if DISTij + DISTjk <= 12*METERS_PER_MILE:
+													sorties[rep].append([i,j,k])
+
+										else:
+											if (tauprime[rep][i][j] + node[j].serviceTimeUAV + tauprime[rep][j][k] <= eee[rep][i][j][k]):
+												if (REQUIRE_TRUCK_AT_DEPOT):
+													if (tau[i][k] <= eee[rep][i][j][k]):
+														sorties[rep].append([i,j,k])
+												else:
+													if ((k == c+1) or (tau[i][k] <= eee[rep][i][j][k])):
+														sorties[rep].append([i,j,k])   # This relaxes the requirement that the truck picks up the UAV from the depot at the end.
+
+				# List the sorties in the same order as if we had looped over i, j, and k:
+				sorties[rep].sort()
+
+		if (v != rep):
+			eee[v] = eee[rep]
+			eeePrime[v] = eeePrime[rep]
+		for [i,j,k] in sorties[rep]:
+			P.append([v,i,j,k])
+
+	# Build the launch service times (for i in N_zero):
 	for v in V:
-		for i in N_zero:
-			sL[v][i] = vehicle[v].launchTime
+		sL[v] = nodeMatrix([vehicle[v].launchTime]*(c+1) + [np.nan])
 			
-	# Build the recovery service times:
+	# Build the recovery service times (for k in N_plus):
 	for v in V:
-		for k in N_plus:
-			sR[v][k] = vehicle[v].recoveryTime
+		sR[v] = nodeMatrix([np.nan] + [vehicle[v].recoveryTime]*(c+1))
 
 	# Build the customer service times:
 	sigma[0] = 0.0
@@ -652,202 +1013,95 @@ def solve_mfstsp_heuristic(node, vehicle, travel, cutoffTime, problemName, probl
 	LTLbase = int(math.ceil((float(len(C) - len(V))/float(1 + len(V)))))
 
 	
-	prevTSPtours = []	# List to store all the TSPs that we will see in this problem instance
-
-
-	p1_previousTSP = []
-	FEASobjVal = 0
-
-
-	for LTL in range(LTLbase, c+1):
-
-		for iterVal in range(0,ITER):
-
-			tryingP3improvement = False		# Initialize this flag
-		
-			requireUniqueTSP = True
-
-			#-------------------------------------------------PHASE I STARTS HERE---------------------------------------------------------#
-
-			# Partition customers between truck and UAVs, and generate a unique truck tour:
-			[FEASobjVal, customersTruck, customersUAV, TSPobjVal, TSPassignments, TSPpackages, TSPtour, foundTSP, prevTSPtours, p1_previousTSP] = mfstsp_heuristic_1_partition(node, vehicle, travel, N, N_zero, N_plus, C, P, tau, tauprime, sigma, sigmaprime, sL, sR, LTL, requireUniqueTSP, prevTSPtours, bestOFV, p1_previousTSP, FEASobjVal)	
-
-
-			# If we cant find a unique TSP tour, go back to the start of Phase I with a new LTL:
-			if (not foundTSP):
-				continue
-
-			# Generate a lower bound:
-			optLowBnd = TSPobjVal
-			for j in customersUAV:
-				v = 2
-				optLowBnd += sL[v][j]
-				optLowBnd += sR[v][j]
-			
-			# If lower bound is greater than the current OFV, go back to the start of Phase I with a new LTL:	
-			if (optLowBnd >= bestOFV):
-				continue
-			
-			keepTrying2 = True
-
-			while (keepTrying2):
-				
-				keepTrying2 = False
-
-				#-------------------------------------------------PHASE II STARTS HERE---------------------------------------------------------#
-
-				# Create UAV sorties <v,i,j,k> (a pair of launch-recovery points and a UAV for each UAV customer)
-				[insertCost, x, y, z, insertTuple] = mfstsp_heuristic_2_asgn_uavs(node, eee, eeePrime, N_zero, N_plus, C, V, c, TSPassignments, customersUAV, customersTruck, sigma, sigmaprime, tau, tauprime, REQUIRE_TRUCK_AT_DEPOT, REQUIRE_DRIVER, vehicle, sL, sR, prevTSPtours)
-
-
-				# Generate an optimistic lower bound assuming that truck never waits for UAVs:
-				optLowBnd = TSPobjVal
-				optLowBnd += insertCost
-				for [v,i,j,k] in y:
-					if (i != 0):
-						optLowBnd += sL[v][i]
-					optLowBnd += sR[v][k]
-				
-
-				# Check for lower bound:
-				if (optLowBnd > bestOFV):	# lower bound is greater than the current OFV, so go back to the start of Phase I with a new LTL
-					canDo3 = False
-					keepTrying2 = False
-
-				else:	# lower bound is promising, check for Phase II feasibility
-					if (len(z) > 0):	# Phase II is not feasible, bceause customer z does not have a feasible assignment
-						canDo3 = False
-
-						if (tryingP3improvement):
-							# After finding a feasible Phase III solution, we try to move a customer to a UAV in the improvement step.
-							# If this isn't immediately feasible, we'll stop trying, and go back to the start of Phase I with a new LTL.
-							keepTrying2 = False
-							tryingP3improvement = False
-
-						else:
-							# Let's try inserting a UAV customer with infeasible assignment in truck route:
-							customersTruck.append(z[0])
-							customersUAV.remove(z[0])
-
-							# The UAV customer with cheapest insertion cost is z[0], and corresponding insertion location information is stored in insertTuple.
-							# Use insertTuple to create a new TSP, and obtain corresponding TSP assignments as following:
-							[tmpTSPassignments, tmpTSPobjVal, tmpTSPtour] = insertTruckCustomer(insertTuple['j'], insertTuple['i'], insertTuple['k'], c, C, node, tau, sigma, x)
-
-							if (tmpTSPtour in prevTSPtours):
-								# We've already seen this.  No need to re-try
-								keepTrying2 = False
-
-							else:
-								keepTrying2 = True	
-								TSPassignments = tmpTSPassignments
-								TSPobjVal = tmpTSPobjVal
-								TSPtour = list(tmpTSPtour)
-								prevTSPtours.append(TSPtour)
-
-					else:	# Phase II is feasible, and it seems worthwhile to try Phase III
-						canDo3 = True					
-
-
-				if (canDo3):
-					
-					#-------------------------------------------------PHASE III STARTS HERE---------------------------------------------------------#
-					
-					# Solve (P3) to determine the schedule of different activities:
-					[p3isFeasible, p3objVal, tmpAssignmentsArray, tmpPackagesArray, waitingTruck, waitingUAV, waitingArray, landsat, launchesfrom, ls_checkt, ls_hatt, ls_checktprime] = mfstsp_heuristic_3_timing(x, y, z, node, eee, N, P, V, cutoffTime, c, sigma, sigmaprime, tau, tauprime, minDistance, sR, sL, vehicle, travel, REQUIRE_TRUCK_AT_DEPOT, REQUIRE_DRIVER, optLowBnd)
-
+	if (TSPtype not in [TSP_TYPE_GUROBI, TSP_TYPE_LOCAL_SEARCH]):
+		print('ERROR: Sorry, I do not understand TSPtype = %d.' % (TSPtype))
+		exit()
 
-					# Check Phase III feasibility:
-					if (p3isFeasible):
+	if (P3type not in [P3_TYPE_MIP, P3_TYPE_COMBINATORIAL]):
+		print('ERROR: Sorry, I do not understand P3type = %d.' % (P3type))
+		exit()
 
-						keepTrying2 = False														
-						
-						# Update the incumbent:
-						if (p3objVal < bestOFV):
-							
-							assignmentsArray = tmpAssignmentsArray
-							packagesArray = tmpPackagesArray
-							objVal = p3objVal
+	if (LTL_PROCESSES == 1):
+		prevTSPtours = tourRegistry()	# Registry of all the TSPs that we will see in this problem instance (see tour_registry.py)
 
-							bestWaitingTruck = waitingTruck
-							bestWaitingUAV = waitingUAV
-							
-							bestOFV = p3objVal
 
+		p1_previousTSP = []
+		FEASobjVal = 0
 
-						# Improvement Step: (to try to reduce the makespan by moving a truck customer to a UAV)
-						[bestSavings, bestAction, tmpTSPtour, tmpCustomersTruck, tmpCustomersUAV] = ImproveMakeSpan(c, TSPtour, y, waitingArray, customersTruck, customersUAV, V, sL, sR, tau, tauprime, sigma, sigmaprime, node, vehicle, eee, prevTSPtours)
-						tryingP3improvement = False
+		TSPengine = makeTSPengine(node, vehicle, travel, problemName, TSPtype)
 
-						if (bestSavings > 0):	# If saving is possible, make the move and go back to Phase II
-							keepTrying2 = True
-							tryingP3improvement = True
-							
-							customersTruck = list(tmpCustomersTruck)
-							customersUAV = list(tmpCustomersUAV)
+		# The (P3) model is kept between calls to Phase III, so the local search only has to patch the sorties it moved:
+		P3model = phase3Model()
 
-							# Create TSP assignments using the new TSP tour:
-							[TSPobjVal, TSPassignments, TSPtour] = generateTSPinfo(tmpTSPtour, c, C, node, tau, sigma)
-							prevTSPtours.append(TSPtour)
 
+		for LTL in range(LTLbase, c+1):
+			[bestOFV, bestSolution, p1_previousTSP, FEASobjVal] = heuristicLTL(LTL, ITER, node, vehicle, travel, cutoffTime, N, N_zero, N_plus, C, P, V, c, tau, tauprime, eee, eeePrime, sigma, sigmaprime, sL, sR, minDistance, REQUIRE_TRUCK_AT_DEPOT, REQUIRE_DRIVER, bestOFV, prevTSPtours, p1_previousTSP, FEASobjVal, TSPengine, P3model, P3type)
 
-						else:	# Perform local search (try shifting retrieval points for UAVs to the next location, if the truck waits at the current retrieval location)
-							while (True):
-								[shift_happened, tmp_y] = local_search(x, y, c, waitingArray, landsat, launchesfrom, ls_checktprime, eee, tau, tauprime, sigma, sigmaprime, ls_checkt, ls_hatt, V, sL, sR)
+			if (bestSolution is not None):
+				[objVal, assignmentsArray, packagesArray, bestWaitingTruck, bestWaitingUAV] = bestSolution
+		# End LTL loop
 
-								if shift_happened == True: # Shift is possible. Therefore re-solve (P3) after making those shifts, and obtain new solution
-									[p3isFeasible, p3objVal, tmpAssignmentsArray, tmpPackagesArray, waitingTruck, waitingUAV, waitingArray, landsat, launchesfrom, ls_checkt, ls_hatt, ls_checktprime] = mfstsp_heuristic_3_timing(x, tmp_y, z, node, eee, N, P, V, cutoffTime, c, sigma, sigmaprime, tau, tauprime, minDistance, sR, sL, vehicle, travel, REQUIRE_TRUCK_AT_DEPOT, REQUIRE_DRIVER, optLowBnd)
+		TSPengine.save()
+		if (TSP_CACHE_STATS):
+			print('TSP cache: %d hits, %d misses' % (TSPengine.hits, TSPengine.misses))
 
-									# Check Phase III feasibility:
-									if (p3isFeasible):	# Phase III is feasible. Update the incumbent, and go back to local search
-
-										y = []
-										for [v,i,j,k] in tmp_y:
-											y.append([v,i,j,k])
-
-										keepTrying2 = False														
-										
-										# Update the incumbent:
-										if (p3objVal < bestOFV):
-											
-											assignmentsArray = tmpAssignmentsArray
-											packagesArray = tmpPackagesArray
-											objVal = p3objVal
-
-											bestWaitingTruck = waitingTruck
-											bestWaitingUAV = waitingUAV
-											
-											bestOFV = p3objVal
-
-									else:	# Phase III is infeasible. Go back to the start of Phase I with a new LTL.
-										break
-									
-								else:	# Shift is not possible. Go back to the start of Phase I with a new LTL.
-									break
-
-					else:
-						# Phase III is infeasible. Go back to the start of Phase I with a new LTL.
-						keepTrying2 = False
-				# End Phase III loop
-			# End keep trying Phase II loop
-		# End ITER loop
-	# End LTL loop
+	else:
+		# Parallel LTL sweep:  Each (LTL, ITER) pair is a task for a process pool.
+		# The processes share the incumbent's makespan (sharedOFV), the TSP tours they've tried (sharedTours),
+		# the TSP tours of the sets of truck customers they've solved (sharedTSPs), and where Phase I left off (p1States),
+		# so they can prune and skip repeated tours and TSPs like the serial sweep does.
+		manager = multiprocessing.Manager()
+		sharedTours = manager.dict()
+		sharedTSPs = manager.dict()
+		sharedTSPlock = manager.Condition()
+		p1States = manager.dict()
+		p1States[-1] = [[], 0]
+		p1Lock = manager.Condition()
+		sharedOFV = multiprocessing.Value('d', bestOFV)
+
+		heuristicData = [node, vehicle, travel, cutoffTime, N, N_zero, N_plus, C, P, V, c, tau, tauprime, eee, eeePrime, sigma, sigmaprime, sL, sR, minDistance, REQUIRE_TRUCK_AT_DEPOT, REQUIRE_DRIVER]
+
+		tasks = []
+		for LTL in range(LTLbase, c+1):
+			for iterVal in range(0,ITER):
+				tasks.append([len(tasks), LTL])
+
+		cacheStats = {}
+		pool = multiprocessing.Pool(LTL_PROCESSES, initLTLworker, (problemName, TSPtype, P3type, sharedOFV, sharedTours, sharedTSPs, sharedTSPlock, p1States, p1Lock, heuristicData))
+		try:
+			for [bestSolution, pid, hits, misses] in pool.imap_unordered(runLTLworker, tasks):
+				cacheStats[pid] = [hits, misses]
+				if ((bestSolution is not None) and (bestSolution[0] < bestOFV)):
+					[objVal, assignmentsArray, packagesArray, bestWaitingTruck, bestWaitingUAV] = bestSolution
+					bestOFV = objVal
+		except:
+			# A task failed (imap_unordered re-raises its exception here).  Stop the other processes:
+			pool.terminate()
+			manager.shutdown()
+			raise
+		pool.close()
+		pool.join()
+
+		# Each set of truck customers should have been solved by only one process (the serial sweep solves each set once, too):
+		numTSPsolved = sum([cacheStats[pid][1] for pid in cacheStats])
+		if (numTSPsolved > len(sharedTSPs)):
+			print('WARNING: The parallel LTL sweep solved %d TSPs for %d sets of truck customers.' % (numTSPsolved, len(sharedTSPs)))
+		manager.shutdown()
+
+		if (TSP_CACHE_STATS):
+			print('TSP cache: %d hits, %d misses' % (sum([cacheStats[pid][0] for pid in cacheStats]), numTSPsolved))
 	
 	# Convert best solution to "assignments" and "packages" classes
 	packages = {}
-	assignments = defaultdict(make_dict)
+	assignments = assignmentTable()
 	
 	for j in packagesArray:
 		packages[j] = make_packages(packagesArray[j][0], packagesArray[j][1], packagesArray[j][2], packagesArray[j][3], packagesArray[j][4])
 
 	for v in vehicle:
-		for i in range(0, len(assignmentsArray[v])):
-			statusID = assignmentsArray[v][i][0]
-			if (0 in assignments[v][statusID]):
-				statusIndex = len(assignments[v][statusID])
-			else:
-				statusIndex = 0
-			
-			assignments[v][statusID][statusIndex] = make_assignments(assignmentsArray[v][i][1], assignmentsArray[v][i][2], assignmentsArray[v][i][3], assignmentsArray[v][i][4], assignmentsArray[v][i][5], assignmentsArray[v][i][6], assignmentsArray[v][i][7], assignmentsArray[v][i][8], assignmentsArray[v][i][9], assignmentsArray[v][i][10], assignmentsArray[v][i][11], assignmentsArray[v][i][12], assignmentsArray[v][i][13], assignmentsArray[v][i][14], assignmentsArray[v][i][15])
+		for myAssignment in assignmentsArray[v]:
+			# myAssignment = [statusID, vehicleType, startTime, ...]
+			assignments.add(v, *myAssignment)
 
 		
 	return(objVal, assignments, packages, bestWaitingTruck, bestWaitingUAV)
\ No newline at end of file
@@ -6,7 +6,8 @@ import datetime
 import math
 from gurobipy import *
 from collections import defaultdict
-from dfs import *
+from subtour_separation import *
+from records import *
 
 import os
 
@@ -17,6 +18,9 @@ NODE_TYPE_CUST		= 1
 TYPE_TRUCK 			= 1
 TYPE_UAV 			= 2
 
+# Also cut off the subtours of the LP relaxation at the root node (as well as the subtours of integer solutions):
+SEPARATE_FRACTIONAL_SUBTOURS = True
+
 TRAVEL_UAV_PACKAGE		= 1
 TRAVEL_UAV_EMPTY		= 2
 TRAVEL_TRUCK_W_UAV		= 3
@@ -54,50 +58,10 @@ def make_dict():
 	# j = 12
 	# tau[v][i][j] = 44
 
-class make_node:
-	def __init__(self, nodeType, latDeg, lonDeg, altMeters, parcelWtLbs, serviceTimeTruck, serviceTimeUAV, address):
-		# Set node[nodeID]
-		self.nodeType 			= nodeType
-		self.latDeg 			= latDeg
-		self.lonDeg				= lonDeg
-		self.altMeters			= altMeters
-		self.parcelWtLbs 		= parcelWtLbs
-		self.serviceTimeTruck	= serviceTimeTruck	# [seconds]
-		self.serviceTimeUAV 	= serviceTimeUAV	# [seconds]
-		self.address 			= address			# Might be None
-
-class make_assignments:
-	def __init__(self, vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus):
-		# Set assignments[v][statusID][statusIndex]
-		self.vehicleType 	= vehicleType
-		self.startTime 		= startTime
-		self.startNodeID	= startNodeID
-		self.startLatDeg 	= startLatDeg
-		self.startLonDeg 	= startLonDeg
-		self.startAltMeters = startAltMeters
-		self.endTime 		= endTime
-		self.endNodeID 		= endNodeID
-		self.endLatDeg		= endLatDeg
-		self.endLonDeg		= endLonDeg
-		self.endAltMeters 	= endAltMeters
-		self.icon			= icon
-		self.description 	= description
-		self.UAVsOnBoard 	= UAVsOnBoard
-		self.ganttStatus	= ganttStatus
-
-class make_packages:
-	def __init__(self, packageType, latDeg, lonDeg, deliveryTime, icon):
-		# Set packages[nodeID]
-		self.packageType 	= packageType
-		self.latDeg 		= latDeg
-		self.lonDeg 		= lonDeg
-		self.deliveryTime 	= deliveryTime
-		self.icon 			= icon
-
 def solve_tsp_callback(node, vehicle, travel):
 	
 	# We want to return this collection of assignments and packages:
-	assignments	= defaultdict(make_dict)
+	assignments	= assignmentTable()
 	packages	= defaultdict(make_dict)
 
 	# Establish system parameters:
@@ -151,29 +115,19 @@ def solve_tsp_callback(node, vehicle, travel):
 
 	# Callback - use lazy constraints to eliminate sub-tours
 	def subtourelim(model, where):
-		# this tells Gurobi to stop when it finds an integer solution
 		if where == GRB.Callback.MIPSOL:
-			# make a list of edges selected in the solution
-
-			delta_dfs = defaultdict(list)
-
-			for i in N_zero:
-				for j in N_zero:
-					if i != j:
-						x_sol = model.cbGetSolution(x[i,j])
-						if x_sol > 0.5:
-							delta_dfs[i].append(j)
-							delta_dfs[j].append(i)
-
-			# Here goes your DFS code for finding connected components
-			# use edges to construct the adjacency lists
-			component = dfs(N_zero, delta_dfs)
-
-			if (len(component) > 1):
-				# add subtour elimination constraints for every pair of nodes in the
-				# connected components you found. For each component add the cut
-				for k in component:
-					model.cbLazy(quicksum((quicksum(x[i,j] for j in component[k] if j != i)) for i in component[k]) <= len(component[k]) - 1)
+			# Find the connected components of the arcs in the solution.
+			# For each component (if there's more than one), add the cut
+			components = findComponents(N_zero, xArcs, model.cbGetSolution(xVars))
+			if (len(components) > 1):
+				for S in components:
+					model.cbLazy(quicksum((quicksum(x[i,j] for j in S if j != i)) for i in S) <= len(S) - 1)
+
+		elif (where == GRB.Callback.MIPNODE) and (SEPARATE_FRACTIONAL_SUBTOURS):
+			# Cut off the subtours of the LP relaxation at the root node
+			if (model.cbGet(GRB.Callback.MIPNODE_STATUS) == GRB.OPTIMAL) and (model.cbGet(GRB.Callback.MIPNODE_NODCNT) == 0):
+				for S in fractionalSubtours(N_zero, xArcs, model.cbGetNodeRel(xVars)):
+					model.cbLazy(quicksum((quicksum(x[i,j] for j in S if j != i)) for i in S) <= len(S) - 1)
 
 	# Generate a solution via DFJ - Callback:
 	m = Model("dfj_callback")
@@ -189,6 +143,10 @@ def solve_tsp_callback(node, vehicle, travel):
 			if i != j:
 				x[i,j] = m.addVar(lb=0, obj=float(cost[i,j]), vtype=GRB.BINARY, name="x.%f.%f" % (i,j))
 
+	# The callback reads all of the arcs at once:
+	xArcs = [[i,j] for i in N_zero for j in N_zero if i != j]
+	xVars = [x[i,j] for [i,j] in xArcs]
+
 	m.modelSense = GRB.MINIMIZE
 
 	m.Params.timeLimit = 600
@@ -258,12 +216,7 @@ def solve_tsp_callback(node, vehicle, travel):
 			print('\t Quitting Now.')
 			exit()
 
-		if (0 in assignments[1][statusID]):
-			statusIndex = len(assignments[1][statusID])
-		else:
-			statusIndex = 0
-
-		assignments[1][statusID][statusIndex] = make_assignments(vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus)
+		assignments.add(1, statusID, vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus)
 
 		# Now, capture the "service" component:
 		startTime 		= endTime		# When we arrived at j
@@ -290,16 +243,189 @@ def solve_tsp_callback(node, vehicle, travel):
 			pkgIcon 		= packageIcons[1]
 			packages[j] 	= make_packages(packageType, endLatDeg, endLonDeg, endTime, pkgIcon)
 
-		if (0 in assignments[1][statusID]):
-			statusIndex = len(assignments[1][statusID])
-		else:
-			statusIndex = 0
-
-		assignments[1][statusID][statusIndex] = make_assignments(vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus)
+		assignments.add(1, statusID, vehicleType, startTime, startNodeID, startLatDeg, startLonDeg, startAltMeters, endTime, endNodeID, endLatDeg, endLonDeg, endAltMeters, icon, description, UAVsOnBoard, ganttStatus)
 
 		tmpDepart = endTime
 		if (j != c+1):
 			# Go to the next arc
 			i = j
 
-	return (objVal, assignments, packages, myTour)
\ No newline at end of file
+	return (objVal, assignments, packages, myTour)
+
+class tspEngine:
+	# A TSP model over the depot and all customers, which is kept (and modified) between solves.
+	#
+	# solve_tsp_callback() builds a new model every time the set of truck customers changes.
+	# Instead, this model is built once.  Each call to solve() routes the truck through a given
+	# subset of the customers, by fixing the arcs of the other customers to 0 (and their degree
+	# constraints to 0).  The subtour elimination cuts found in earlier solves are kept in the
+	# model, and each solve is warm-started from the previous tour.
+	#
+	# NOTE:  The tours are just as short as solve_tsp_callback()'s, but when several tours are equally short
+	# (e.g., the same tour in the opposite direction), the cuts and the warm start can lead Gurobi to a different one.
+	# Phase I then continues from a different tour, so the heuristic's solutions (and makespans) can change.
+	def __init__(self, node, vehicle, travel):
+		self.C = sorted([nodeID for nodeID in node if (node[nodeID].nodeType == NODE_TYPE_CUST)])
+		self.N_zero = [0] + self.C
+		self.c = max([0] + self.C)
+
+		self.sigma = {}
+		for k in self.C:
+			self.sigma[k] = node[k].serviceTimeTruck
+
+		# cost[i,j] is the truck travel time from i to j.  Node 0 is also the (final) depot.
+		self.cost = {}
+		for vehicleID in vehicle:
+			if (vehicle[vehicleID].vehicleType == TYPE_TRUCK):
+				for i in self.N_zero:
+					for j in self.N_zero:
+						if (i != j):
+							self.cost[i,j] = travel[vehicleID][i][j].totalTime
+
+		self.m = Model("dfj_persistent")
+
+		# Tell Gurobi not to print to a log file
+		self.m.params.OutputFlag = 0
+
+		# Create variables:
+		self.x = {}
+		for i in self.N_zero:
+			for j in self.N_zero:
+				if (i != j):
+					self.x[i,j] = self.m.addVar(lb=0, obj=float(self.cost[i,j]), vtype=GRB.BINARY, name="x.%d.%d" % (i,j))
+
+		self.m.modelSense = GRB.MINIMIZE
+
+		self.m.Params.timeLimit = 600
+
+		self.m.update()
+
+		# Add degree constraints.  We'll set the RHS to 0 for customers that aren't in the tour.
+		self.degreeOut = {}
+		self.degreeIn = {}
+		for i in self.N_zero:
+			self.degreeOut[i] = self.m.addConstr(quicksum(self.x[i,j] for j in self.N_zero if j != i) == 1, "Constr.1.%d" % (i))
+
+		for j in self.N_zero:
+			self.degreeIn[j] = self.m.addConstr(quicksum(self.x[i,j] for i in self.N_zero if i != j) == 1, "Constr.2.%d" % (j))
+
+		self.m.Params.lazyConstraints = 1
+
+		self.active 	= set(self.N_zero)	# Nodes in the current tour
+		self.cuts 		= {}				# cuts[frozenset(S)] = subtour elimination constraint for the nodes in S
+		self.newCuts 	= []				# Cuts found (as lazy constraints) during the current solve
+		self.prevTour 	= None				# [0, ..., last customer]
+
+	def subtourelim(self, model, where):
+		# Callback - use lazy constraints to eliminate sub-tours
+		if where == GRB.Callback.MIPSOL:
+			# Find the connected components of the arcs in the solution.
+			# For each component (if there's more than one), add the cut
+			components = findComponents(self.activeNodes, self.activeArcs, model.cbGetSolution(self.activeVars))
+			if (len(components) > 1):
+				for S in components:
+					self.addLazyCut(model, S)
+
+		elif (where == GRB.Callback.MIPNODE) and (SEPARATE_FRACTIONAL_SUBTOURS):
+			# Cut off the subtours of the LP relaxation at the root node
+			if (model.cbGet(GRB.Callback.MIPNODE_STATUS) == GRB.OPTIMAL) and (model.cbGet(GRB.Callback.MIPNODE_NODCNT) == 0):
+				for S in fractionalSubtours(self.activeNodes, self.activeArcs, model.cbGetNodeRel(self.activeVars)):
+					self.addLazyCut(model, S)
+
+	def addLazyCut(self, model, S):
+		model.cbLazy(quicksum((quicksum(self.x[i,j] for j in S if j != i)) for i in S) <= len(S) - 1)
+		self.newCuts.append(list(S))
+
+	def setActive(self, newActive):
+		# Only route the truck through the nodes in newActive:
+		for i in self.N_zero:
+			if ((i in newActive) != (i in self.active)):
+				self.degreeOut[i].RHS = int(i in newActive)
+				self.degreeIn[i].RHS = int(i in newActive)
+				for j in self.N_zero:
+					if (j != i):
+						self.x[i,j].UB = int((i in newActive) and (j in newActive))
+						self.x[j,i].UB = int((i in newActive) and (j in newActive))
+
+		# A cut on exactly the nodes in the tour would forbid every tour.
+		# (This can only happen for cuts found when more customers were in the tour.)
+		if (frozenset(self.active) in self.cuts):
+			self.cuts[frozenset(self.active)].RHS = len(self.active) - 1
+		if (frozenset(newActive) in self.cuts):
+			self.cuts[frozenset(newActive)].RHS = len(newActive)
+
+		self.active = set(newActive)
+		self.activeNodes = [i for i in self.N_zero if i in self.active]
+		self.activeArcs = [[i,j] for i in self.activeNodes for j in self.activeNodes if j != i]
+		self.activeVars = [self.x[i,j] for [i,j] in self.activeArcs]
+
+	def setStart(self):
+		# Warm-start from the previous tour, without the customers that left the tour,
+		# and with the customers that joined the tour inserted where they're cheapest:
+		if (self.prevTour is None):
+			return
+
+		tour = [i for i in self.prevTour if i in self.active]
+		for j in self.activeNodes:
+			if (j not in tour):
+				bestPosition = None
+				bestCost = float('inf')
+				for p in range(1,len(tour)+1):
+					i = tour[p-1]
+					k = tour[p % len(tour)]
+					tmpCost = self.cost[i,j] + self.cost[j,k] - self.cost.get((i,k), 0)
+					if (tmpCost < bestCost):
+						bestCost = tmpCost
+						bestPosition = p
+				tour.insert(bestPosition, j)
+
+		startArcs = set()
+		for p in range(0,len(tour)):
+			startArcs.add((tour[p], tour[(p+1) % len(tour)]))
+
+		self.m.setAttr("Start", self.activeVars, [int((i,j) in startArcs) for [i,j] in self.activeArcs])
+
+	def solve(self, truckCustomers):
+		# Find the shortest tour from the depot (0), through truckCustomers, and back to the depot (c+1).
+		# Returns [myTour, objVal], where myTour = [0, ..., c+1] and objVal is the time the truck
+		# gets back to the depot (including service times), as in solve_tsp_callback().
+		newActive = set([0] + list(truckCustomers))
+
+		if (len(newActive) == 1):
+			# Truck isn't used
+			return ([0, self.c+1], 0.0)
+
+		self.setActive(newActive)
+		self.setStart()
+
+		self.newCuts = []
+		self.m.optimize(lambda model, where: self.subtourelim(model, where))
+
+		myTour = [0]
+		tmp_i = 0
+		for tmploop in range(1,len(self.activeNodes)):
+			for tmp_j in self.activeNodes:
+				if tmp_i != tmp_j:
+					if self.x[tmp_i,tmp_j].x > 0.9:
+						myTour.append(tmp_j)
+						tmp_i = tmp_j
+						break
+
+		self.prevTour = list(myTour)
+
+		# Keep the cuts we found for the next solve:
+		for S in self.newCuts:
+			if (frozenset(S) not in self.cuts):
+				self.cuts[frozenset(S)] = self.m.addConstr(quicksum((quicksum(self.x[i,j] for j in S if j != i)) for i in S) <= len(S) - 1, "SEC.%d" % (len(self.cuts)))
+		self.m.update()
+
+		# Add up the travel and service times in the same order as solve_tsp_callback(), so objVal is the same:
+		objVal = 0.0
+		for myIndex in range(1,len(myTour)):
+			objVal += self.cost[myTour[myIndex-1], myTour[myIndex]]
+			objVal += self.sigma[myTour[myIndex]]
+		objVal += self.cost[myTour[-1], 0]
+
+		myTour.append(self.c+1)
+
+		return (myTour, objVal)
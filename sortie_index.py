@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+# This file contains an indexed set of UAV sorties [v, i, j, k].
+#
+# The IP builds most of its constraints by summing over the sorties that share a launch node,
+# a customer, or a recovery node.  Rather than testing "[v,i,j,k] in P" against a list for
+# every (v, i, j, k), we keep a hashed copy of P, plus lists of the sorties for each
+# (v, i), (v, j), (v, k), (v, i, j), (v, j, k), and (v, i, k).
+#
+# Each of these lists is kept in the same order the sorties were added to P.
+# Since P is built in (v, i, j, k) order, looping over launchedFrom(v, i) visits the
+# sorties in the same order as looping over j and then k.
+
+
+class sortieSet:
+	def __init__(self, sorties=None):
+		self.sorties 		= []	# sorties = [[v, i, j, k], ...]
+		self.members 		= set()	# members = {(v, i, j, k), ...}
+		self.byLaunch 		= {}	# byLaunch[(v, i)] = [[v, i, j, k], ...]
+		self.byCustomer 	= {}	# byCustomer[(v, j)] = [[v, i, j, k], ...]
+		self.byRecovery 	= {}	# byRecovery[(v, k)] = [[v, i, j, k], ...]
+		self.byLaunchCustomer = {}	# byLaunchCustomer[(v, i, j)] = [[v, i, j, k], ...]
+		self.byCustomerRecovery = {}	# byCustomerRecovery[(v, j, k)] = [[v, i, j, k], ...]
+		self.byLaunchRecovery = {}	# byLaunchRecovery[(v, i, k)] = [[v, i, j, k], ...]
+
+		if (sorties is None):
+			sorties = []
+		for [v,i,j,k] in sorties:
+			self.append([v,i,j,k])
+
+	def append(self, sortie):
+		[v,i,j,k] = sortie
+		if ((v,i,j,k) in self.members):
+			return
+		mySortie = [v,i,j,k]
+		self.sorties.append(mySortie)
+		self.members.add((v,i,j,k))
+		self.byLaunch.setdefault((v,i), []).append(mySortie)
+		self.byCustomer.setdefault((v,j), []).append(mySortie)
+		self.byRecovery.setdefault((v,k), []).append(mySortie)
+		self.byLaunchCustomer.setdefault((v,i,j), []).append(mySortie)
+		self.byCustomerRecovery.setdefault((v,j,k), []).append(mySortie)
+		self.byLaunchRecovery.setdefault((v,i,k), []).append(mySortie)
+
+	def __contains__(self, sortie):
+		return (tuple(sortie) in self.members)
+
+	def __iter__(self):
+		return iter(self.sorties)
+
+	def __len__(self):
+		return len(self.sorties)
+
+	def launchedFrom(self, v, i):
+		# Sorties of vehicle v that launch from node i
+		return self.byLaunch.get((v,i), [])
+
+	def serving(self, v, j):
+		# Sorties of vehicle v that deliver to customer j
+		return self.byCustomer.get((v,j), [])
+
+	def recoveredAt(self, v, k):
+		# Sorties of vehicle v that are recovered at node k
+		return self.byRecovery.get((v,k), [])
+
+	def servingFrom(self, v, i, j):
+		# Sorties of vehicle v that launch from node i to deliver to customer j
+		return self.byLaunchCustomer.get((v,i,j), [])
+
+	def servingTo(self, v, j, k):
+		# Sorties of vehicle v that deliver to customer j and are then recovered at node k
+		return self.byCustomerRecovery.get((v,j,k), [])
+
+	def between(self, v, i, k):
+		# Sorties of vehicle v that launch from node i and are recovered at node k
+		return self.byLaunchRecovery.get((v,i,k), [])
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+from __future__ import division
+from math import *
+import distance_functions
+
+
+# This file contains a simple grid index over node lat/lon coordinates.
+#
+# A UAV sortie [v,i,j,k] can only be feasible if both i and k are within reach of customer j.
+# Rather than checking every (i,j,k) triple, we bucket the nodes into grid cells that are at least
+# as large as the reach of the vehicle, so the nodes within reach of j are found by
+# only looking at j's cell and its 8 neighboring cells.
+
+# NOTE:  We assume that the nodes don't straddle the +/- 180 degree longitude line.
+
+
+class nodeGrid:
+	def __init__(self, node, nodeIDs, radius):
+		# node[nodeID] must have latDeg and lonDeg.
+		# radius [meters] is the largest ground distance we'll ever ask about.
+		self.node 		= node
+		self.radius 	= radius
+		self.cells 		= {}	# cells[(row, col)] = [nodeID, ...]
+		self.cellOf 	= {}	# cellOf[nodeID] = (row, col)
+
+		# Points within radius of each other can't differ by more than radius/radius_of_earth in latitude.
+		# Their longitudes can differ by more, depending on how far from the equator they are:
+		#	hav(radius/R) >= cos(lat1)*cos(lat2)*hav(dLon) >= cos(maxLat)^2 * hav(dLon)
+		# We pad the cell sizes by 1% so rounding can't push a node out of its neighboring cells.
+		maxLatRad = max([abs(node[i].latDeg) for i in nodeIDs])*(pi/180)
+		angle = min(radius/distance_functions.radius_of_earth, pi)
+		self.cellLatDeg = 1.01*angle*(180/pi)
+		sinHalfLon = sin(angle/2)/max(cos(maxLatRad), 1e-12)
+		if (sinHalfLon < 1) and (self.cellLatDeg > 0):
+			self.cellLonDeg = 1.01*2*asin(sinHalfLon)*(180/pi)
+		else:
+			# Cells would be wider than the whole world.
+			self.cellLonDeg = float('inf')
+
+		for i in nodeIDs:
+			myCell = self.whichCell(node[i].latDeg, node[i].lonDeg)
+			self.cellOf[i] = myCell
+			if (myCell not in self.cells):
+				self.cells[myCell] = []
+			self.cells[myCell].append(i)
+
+	def whichCell(self, latDeg, lonDeg):
+		if (self.cellLatDeg == 0):
+			# A zero radius only reaches nodes at the exact same location.
+			return (latDeg, lonDeg)
+		row = int(floor(latDeg/self.cellLatDeg))
+		if (self.cellLonDeg == float('inf')):
+			col = 0
+		else:
+			col = int(floor(lonDeg/self.cellLonDeg))
+		return (row, col)
+
+	def neighbors(self, nodeID):
+		# Returns the (sorted) list of nodes within radius of nodeID, including nodeID itself.
+		# Distances are the same great-circle distances as groundDistanceStraight().
+		[row, col] = self.cellOf[nodeID]
+		lat1 = self.node[nodeID].latDeg*(pi/180)
+		long1 = self.node[nodeID].lonDeg*(pi/180)
+
+		if (self.cellLatDeg == 0):
+			candidates = self.cells[(row, col)]
+		else:
+			candidates = []
+			for myRow in [row-1, row, row+1]:
+				for myCol in [col-1, col, col+1]:
+					candidates += self.cells.get((myRow, myCol), [])
+
+		nearby = []
+		for i in candidates:
+			DIST = distance_functions.groundDistanceStraight(lat1, long1, self.node[i].latDeg*(pi/180), self.node[i].lonDeg*(pi/180))
+			if (DIST <= self.radius):
+				nearby.append(i)
+
+		return sorted(set(nearby))
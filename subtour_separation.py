@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+
+import numpy as np
+
+# This file finds the subtours that the TSP models in solve_tsp_callback.py need to cut off.
+#
+# A solution is given as a list of arcs ([i,j], ...) and the value of x[i,j] for each arc.
+#	- findComponents() returns the connected components of the arcs whose value is above a threshold
+#	  (via union-find, so there's no recursion and no searching of lists).
+#	  Each component of an integer solution that doesn't include every node is a subtour.
+#	- fractionalSubtours() returns sets of nodes S whose subtour elimination constraint,
+#		sum_{i in S} sum_{j in S, j != i} x[i,j] <= |S| - 1,
+#	  is violated by a fractional solution (e.g., the LP relaxation at a node of the branch-and-bound tree).
+#	  Since every node has one arc in and one arc out, the arcs that cross S weigh 2|S| - 2 sum_{i,j in S} x[i,j],
+#	  so S violates its constraint exactly when the cut around S weighs less than 2.
+
+# Cuts around S that weigh less than 2 - SUBTOUR_CUT_TOLERANCE are violated:
+SUBTOUR_CUT_TOLERANCE = 1e-4
+
+
+def findComponents(nodes, arcs, values, threshold=0.5):
+	# Returns a list of the connected components ([[i, ...], ...]) of the arcs with values[n] > threshold.
+	# The components (and the nodes in each component) are in the order of nodes.
+	parent = {}
+	for i in nodes:
+		parent[i] = i
+
+	def root(i):
+		while (parent[i] != i):
+			parent[i] = parent[parent[i]]
+			i = parent[i]
+		return i
+
+	for n in range(0,len(arcs)):
+		if (values[n] > threshold):
+			[i,j] = arcs[n]
+			rootI = root(i)
+			rootJ = root(j)
+			if (rootI != rootJ):
+				parent[rootJ] = rootI
+
+	component = {}
+	for i in nodes:
+		rootI = root(i)
+		if (rootI not in component):
+			component[rootI] = []
+		component[rootI].append(i)
+
+	return list(component.values())
+
+
+def minimumCut(weight):
+	# Stoer-Wagner minimum cut of an undirected graph.
+	# weight is a symmetric (n x n) NumPy array of edge weights.
+	# Returns [cutWeight, side], where side is a list of the (positions of the) nodes on one side of the cut.
+	weight = np.array(weight, dtype=np.float64)
+	n = len(weight)
+	members = [[p] for p in range(0,n)]		# members[p] = nodes that have been merged into p
+	alive = list(range(0,n))
+
+	bestWeight = float('inf')
+	bestSide = None
+	while (len(alive) > 1):
+		# Add the nodes to A, one at a time, choosing the node that is most tightly connected to A:
+		subWeight = weight[np.ix_(alive, alive)]
+		inA = np.zeros(len(alive), dtype=bool)
+		inA[0] = True
+		connection = subWeight[0].copy()
+		prevNode = 0
+		lastNode = 0
+		for step in range(1,len(alive)):
+			nextNode = int(np.argmax(np.where(inA, -np.inf, connection)))
+			cutOfPhase = connection[nextNode]
+			prevNode = lastNode
+			lastNode = nextNode
+			inA[nextNode] = True
+			connection += subWeight[nextNode]
+
+		# The last node, alone, is a cut:
+		s = alive[prevNode]
+		t = alive[lastNode]
+		if (cutOfPhase < bestWeight):
+			bestWeight = float(cutOfPhase)
+			bestSide = list(members[t])
+
+		# Merge t into s:
+		weight[s,:] += weight[t,:]
+		weight[:,s] += weight[:,t]
+		weight[s,s] = 0.0
+		members[s].extend(members[t])
+		alive.remove(t)
+
+	return [bestWeight, bestSide]
+
+
+def fractionalSubtours(nodes, arcs, values):
+	# Returns a list of node sets ([[i, ...], ...]) whose subtour elimination constraints are violated by values.
+	# If the arcs with values > 0 don't connect all of the nodes, each component is violated.
+	# Otherwise, we check the minimum cut.
+	components = findComponents(nodes, arcs, values, threshold=SUBTOUR_CUT_TOLERANCE)
+	if (len(components) > 1):
+		return components
+
+	position = {}
+	for p in range(0,len(nodes)):
+		position[nodes[p]] = p
+	fromPosition = [position[i] for [i,j] in arcs]
+	toPosition = [position[j] for [i,j] in arcs]
+
+	weight = np.zeros((len(nodes), len(nodes)))
+	np.add.at(weight, (fromPosition, toPosition), np.asarray(values, dtype=np.float64))
+	weight = weight + weight.T
+
+	[cutWeight, side] = minimumCut(weight)
+	if (cutWeight >= 2 - SUBTOUR_CUT_TOLERANCE):
+		return []
+
+	# Either side of the cut gives the same constraint.  The smaller side gives a shorter one.
+	if (2*len(side) > len(nodes)):
+		inSide = set(side)
+		side = [p for p in range(0,len(nodes)) if p not in inSide]
+
+	return [[nodes[p] for p in sorted(side)]]
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+
+# This file contains a registry of the truck TSP tours that the heuristic has already seen.
+#
+# The heuristic only wants to try each truck tour once, so it checks every candidate tour
+# against the tours it has seen before.  Checking against a list of lists compares the
+# candidate to every previous tour.  tourRegistry stores each tour as a tuple in a set,
+# so that "tour in prevTSPtours" takes O(1) time.  It can be used like the old list
+# (append(), "in", "not in", len(), and iterating over the tours as lists).
+#
+# In a parallel LTL sweep, each process has its own registry, but the registries also share
+# their tours through a dictionary from a multiprocessing Manager (shared), so a tour tried by
+# one process is not tried again by another.
+
+
+class tourRegistry:
+	def __init__(self, shared=None):
+		self.tours 	= set()		# tours = {(0, ..., c+1), ...}
+		self.order 	= []		# order = [(0, ..., c+1), ...], in the order they were seen
+		self.shared = shared	# shared[(0, ..., c+1)] = True, for the tours seen by every process (or None)
+
+	def append(self, tour):
+		# Register a tour the heuristic is about to try:
+		key = tuple(tour)
+		if (key not in self.tours):
+			self.tours.add(key)
+			self.order.append(key)
+			if (self.shared is not None):
+				self.shared[key] = True
+
+	def __contains__(self, tour):
+		key = tuple(tour)
+		if (key in self.tours):
+			return True
+		return ((self.shared is not None) and (key in self.shared))
+
+	def __iter__(self):
+		for key in self.order:
+			yield list(key)
+
+	def __len__(self):
+		return len(self.order)
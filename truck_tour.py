@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+
+# This file contains a truck tour [0, ..., c+1] that answers questions about the tour in O(1) time.
+#
+# The heuristic often needs to know where a node is in the tour, or how long the truck takes to get from
+# one tour node to a later one (e.g., while a UAV is away between its launch and recovery nodes).  Rather than
+# calling tour.index() and adding up tau and sigma along the tour every time, truckTour keeps:
+#	position[i]	= position of node i in the tour
+#	arrive[p]	= time the truck arrives at tour[p], if it never waits for UAVs
+#	leave[p]	= arrive[p] + sigma[tour[p]]
+# so the time from leaving i until arriving at a later node k is arrive[position[k]] - leave[position[i]].
+#
+# A truckTour is built once per tour (in O(n) time); the tour itself isn't changed.  The moves that remove
+# or insert one customer are evaluated without building the new tour.  Phase I uses these to find the customers
+# to move between the truck and the UAVs, and ImproveMakeSpan uses them to find customers to move to a UAV.
+
+
+class truckTour:
+	def __init__(self, tour, tau, sigma):
+		self.tour = list(tour)
+		self.tau = tau
+		self.sigma = sigma
+
+		self.position = {}
+		self.arrive = []
+		self.leave = []
+		arriveTime = 0.0
+		for p in range(0,len(self.tour)):
+			i = self.tour[p]
+			if (p > 0):
+				arriveTime = self.leave[p-1] + tau[self.tour[p-1]][i]
+			self.position[i] = p
+			self.arrive.append(arriveTime)
+			self.leave.append(arriveTime + sigma[i])
+
+	def __len__(self):
+		return len(self.tour)
+
+	def __contains__(self, i):
+		return (i in self.position)
+
+	def prevNode(self, j):
+		return self.tour[self.position[j] - 1]
+
+	def nextNode(self, j):
+		return self.tour[self.position[j] + 1]
+
+	def isBetween(self, i, j, k):
+		# Does the truck visit j after i and before k?
+		return (self.position[i] < self.position[j] < self.position[k])
+
+	def travelTime(self, i, k):
+		# Time from when the truck leaves i until it arrives at k (k comes after i).
+		# This includes the service times of the customers between i and k.
+		return self.arrive[self.position[k]] - self.leave[self.position[i]]
+
+	def removalSavings(self, j):
+		# How much shorter the tour gets if we remove customer j
+		i = self.prevNode(j)
+		k = self.nextNode(j)
+		return self.tau[i][j] + self.sigma[j] + self.tau[j][k] - self.tau[i][k]
+
+	def insertionCost(self, i, j):
+		# How much longer the tour gets if we insert customer j right after tour node i
+		k = self.nextNode(i)
+		return self.tau[i][j] + self.tau[j][k] + self.sigma[j] - self.tau[i][k]
+
+	def without(self, j):
+		# The tour (as a list), without node j
+		p = self.position[j]
+		return self.tour[:p] + self.tour[p+1:]
@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+
+import os
+import pickle
+import time
+from collections import OrderedDict
+from instance_file import sourceStamps
+
+try:
+	import fcntl
+except ImportError:
+	fcntl = None	# (Windows)
+	import msvcrt
+
+
+# This file contains a cache of the truck's TSP tours, keyed by the set of truck customers.
+#
+# The heuristic's LTL and ITER loops often ask for the TSP tour of a set of truck customers
+# that it has already seen.  tspCache wraps a TSP solver (tspEngine or tspLocalSearch), and
+# has the same solve() interface.  A set of customers that is already in the cache is returned
+# without calling the solver.  The least recently used tours are dropped once the cache is full.
+#
+# If a cacheFile is given, the cache is read from that file when it is created, and written
+# back to it by save().  Since a tour depends only on the truck's travel and service times (and the solver),
+# runs on the same problem (with the same TSP solver) may share the file.  The file also stores the
+# modification time and size of the files those times come from (sourceFiles, as in instance_file.py).
+# If any of them changed, the file's tours are ignored (and replaced by the next save()).
+# save() merges the tours already in the file with ours (holding a lock on cacheFile.lock while it
+# does), so runs (or processes) that share the file don't drop each other's tours.
+#
+# In a parallel LTL sweep, the processes' caches also share their tours through a dictionary
+# from a multiprocessing Manager (shared), so each set of truck customers is only solved once.
+# A process that is solving a set of customers marks it in shared (with None), and the other
+# processes wait for its tour (on sharedLock, a Manager Condition) instead of solving it again.
+
+# Maximum number of tours to keep:
+TSP_CACHE_SIZE = 100000
+
+# Change this whenever the contents of cache files change:
+TSP_CACHE_VERSION = 1
+
+
+class tspCache:
+	def __init__(self, TSPengine, maxSize=TSP_CACHE_SIZE, cacheFile=None, sourceFiles=None, shared=None, sharedLock=None):
+		self.TSPengine 	= TSPengine
+		self.maxSize 	= maxSize
+		self.cacheFile 	= cacheFile
+		self.sourceFiles = list(sourceFiles) if (sourceFiles is not None) else []
+		self.shared 	= shared		# shared[frozenset(truckCustomers)] = [myTour, objVal], or None while a process solves it (or None)
+		self.sharedLock = sharedLock
+		self.tours 		= OrderedDict()		# tours[frozenset(truckCustomers)] = [myTour, objVal], least recently used first
+		self.hits 		= 0
+		self.misses 	= 0
+		self.unsaved 	= 0		# Number of tours we solved since the last save()
+
+		if (cacheFile is not None):
+			for [key, [myTour, objVal]] in self.readFile():
+				self.tours[key] = [myTour, objVal]
+
+			while (len(self.tours) > self.maxSize):
+				self.tours.popitem(last=False)
+
+	def solve(self, truckCustomers):
+		# Returns [myTour, objVal], in the same format as TSPengine.solve()
+		key = frozenset(truckCustomers)
+		if (key in self.tours):
+			self.hits += 1
+			self.tours.move_to_end(key)
+		else:
+			sharedTour = self.readShared(key)
+			if (sharedTour is not None):
+				self.hits += 1
+				[myTour, objVal] = sharedTour
+			else:
+				self.misses += 1
+				try:
+					[myTour, objVal] = self.TSPengine.solve(truckCustomers)
+				except:
+					# Don't leave the other processes waiting for this tour:
+					self.dropShared(key)
+					raise
+				self.writeShared(key, [list(myTour), objVal])
+				self.unsaved += 1
+			self.tours[key] = [list(myTour), objVal]
+			if (len(self.tours) > self.maxSize):
+				self.tours.popitem(last=False)
+
+		[myTour, objVal] = self.tours[key]
+
+		return (list(myTour), objVal)
+
+	def readShared(self, key):
+		# Returns the tour of key from the other processes (waiting for it, if another process is solving it).
+		# If no process has solved key, we mark it as ours to solve, and return None.
+		if (self.shared is None):
+			return None
+
+		with self.sharedLock:
+			while ((key in self.shared) and (self.shared[key] is None)):
+				self.sharedLock.wait()
+			if (key in self.shared):
+				return self.shared[key]
+			self.shared[key] = None
+			return None
+
+	def writeShared(self, key, tour):
+		# Give the other processes the tour of key (which we marked in readShared()):
+		if (self.shared is None):
+			return
+
+		with self.sharedLock:
+			self.shared[key] = tour
+			self.sharedLock.notify_all()
+
+	def dropShared(self, key):
+		# We couldn't solve key (which we marked in readShared()), so another process may solve it:
+		if (self.shared is None):
+			return
+
+		with self.sharedLock:
+			del self.shared[key]
+			self.sharedLock.notify_all()
+
+	def stamps(self):
+		# [[modification time (ns), size (bytes)], ...] of sourceFiles, or None if one is missing
+		stamps = sourceStamps(self.sourceFiles)
+		if (stamps is None):
+			return None
+		return stamps.tolist()
+
+	def readFile(self):
+		# Returns the [[key, [myTour, objVal]], ...] in cacheFile (least recently used first),
+		# or [] if there's no up-to-date cache file.
+		if (not os.path.isfile(self.cacheFile)):
+			return []
+
+		try:
+			myFile = open(self.cacheFile, 'rb')
+			contents = pickle.load(myFile)
+			myFile.close()
+		except (OSError, EOFError, pickle.UnpicklingError):
+			return []
+
+		if ((not isinstance(contents, dict)) or (contents.get('version') != TSP_CACHE_VERSION)):
+			return []
+		if ((contents['sourceStamps'] is None) or (contents['sourceStamps'] != self.stamps())):
+			return []
+
+		return contents['tours']
+
+	def save(self):
+		# Merge the cache into cacheFile (if we have one, and solved any new tours since the last save).
+		# We write to a temporary file first, so another run never reads a partially written cache.
+		if ((self.cacheFile is None) or (self.unsaved == 0)):
+			return
+
+		stamps = self.stamps()
+		if (stamps is None):
+			return
+
+		lockFile = open(self.cacheFile + '.lock', 'a+b')
+		lockFileWait(lockFile)
+		try:
+			# Our tours are more recently used than the ones only in the file:
+			tours = OrderedDict()
+			for [key, [myTour, objVal]] in self.readFile():
+				tours[key] = [myTour, objVal]
+			for key in self.tours:
+				tours.pop(key, None)
+				tours[key] = self.tours[key]
+			while (len(tours) > self.maxSize):
+				tours.popitem(last=False)
+
+			tmpFile = '%s.%d.tmp' % (self.cacheFile, os.getpid())
+			myFile = open(tmpFile, 'wb')
+			pickle.dump({'version': TSP_CACHE_VERSION, 'sourceStamps': stamps, 'tours': list(tours.items())}, myFile)
+			myFile.close()
+			os.replace(tmpFile, self.cacheFile)
+		finally:
+			lockFileRelease(lockFile)
+			lockFile.close()
+
+		self.unsaved = 0
+
+
+def lockFileWait(lockFile):
+	# Wait until we hold the lock on (the first byte of) lockFile
+	if (fcntl is not None):
+		fcntl.flock(lockFile.fileno(), fcntl.LOCK_EX)
+	else:
+		lockFile.seek(0)
+		while (True):
+			try:
+				msvcrt.locking(lockFile.fileno(), msvcrt.LK_LOCK, 1)
+				return
+			except OSError:
+				time.sleep(0.1)	# LK_LOCK only tries for 10 seconds
+
+def lockFileRelease(lockFile):
+	if (fcntl is not None):
+		fcntl.flock(lockFile.fileno(), fcntl.LOCK_UN)
+	else:
+		lockFile.seek(0)
+		msvcrt.locking(lockFile.fileno(), msvcrt.LK_UNLCK, 1)
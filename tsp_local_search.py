@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+
+import numpy as np
+
+
+NODE_TYPE_DEPOT		= 0
+NODE_TYPE_CUST		= 1
+
+TYPE_TRUCK 			= 1
+TYPE_UAV 			= 2
+
+
+# This file contains a heuristic TSP solver for the truck, which may be used
+# (instead of tspEngine in solve_tsp_callback.py) to find the TSP tours in Phase I.
+#
+# The tour is seeded by a nearest-neighbor tour from the depot (and by the previous tour, when
+# there is one), and is then improved with 2-opt and Or-opt moves until neither move type can shorten it.
+# Each pass evaluates every move of a type at once (with NumPy), and applies the best one.
+# The truck's travel times may be asymmetric, so reversing a segment of the tour
+# (in a 2-opt move, or when re-inserting an Or-opt segment backwards) also accounts for the
+# change in the travel times within that segment.
+
+# Only accept moves that shorten the tour by more than this amount [seconds]:
+IMPROVEMENT_TOL = 1e-7
+
+# Or-opt moves relocate segments of up to this many customers:
+OR_OPT_MAX_LENGTH = 3
+
+
+class tspLocalSearch:
+	def __init__(self, node, vehicle, travel):
+		self.C = sorted([nodeID for nodeID in node if (node[nodeID].nodeType == NODE_TYPE_CUST)])
+		self.N_zero = [0] + self.C
+		self.c = max([0] + self.C)
+
+		self.sigma = {}
+		for k in self.C:
+			self.sigma[k] = node[k].serviceTimeTruck
+
+		# cost[a][b] is the truck travel time from N_zero[a] to N_zero[b].  Index 0 is the depot.
+		self.index = {}
+		for a in range(0,len(self.N_zero)):
+			self.index[self.N_zero[a]] = a
+
+		self.cost = np.zeros((len(self.N_zero), len(self.N_zero)))
+		for vehicleID in vehicle:
+			if (vehicle[vehicleID].vehicleType == TYPE_TRUCK):
+				for a in range(0,len(self.N_zero)):
+					for b in range(0,len(self.N_zero)):
+						if (a != b):
+							self.cost[a][b] = travel[vehicleID][self.N_zero[a]][self.N_zero[b]].totalTime
+
+		self.prevTour = None	# [0, ..., 0] (indices into cost) of the last tour we found
+
+	def nearestNeighbor(self, customers):
+		# Build a tour [0, ..., 0] (of indices into cost) by always driving to the closest unvisited customer:
+		unvisited = list(customers)
+		tour = [0]
+		while (len(unvisited) > 0):
+			nextPos = int(np.argmin(self.cost[tour[-1], unvisited]))
+			tour.append(unvisited.pop(nextPos))
+		tour.append(0)
+
+		return np.array(tour)
+
+	def fromPrevious(self, customers):
+		# Build a tour [0, ..., 0] from the previous tour, without the customers that left the tour,
+		# and with the customers that joined the tour inserted where they're cheapest:
+		tour = [a for a in self.prevTour if (a == 0) or (a in customers)]
+		for b in customers:
+			if (b not in tour):
+				tour = np.array(tour)
+				insertCost = self.cost[tour[:-1], b] + self.cost[b, tour[1:]] - self.cost[tour[:-1], tour[1:]]
+				p = int(np.argmin(insertCost))
+				tour = tour[:p+1].tolist() + [b] + tour[p+1:].tolist()
+
+		return np.array(tour)
+
+	def improve(self, tour):
+		# Apply improving 2-opt and Or-opt moves until there are none left:
+		while True:
+			newTour = self.twoOpt(tour)
+			if (newTour is None):
+				newTour = self.orOpt(tour)
+			if (newTour is None):
+				return tour
+			tour = newTour
+
+	def twoOpt(self, tour):
+		# Find the best move that reverses tour[i+1..j].  Returns the new tour, or None if there's no improving move.
+		L = len(tour)
+		if (L < 4):
+			return None
+
+		# fwd[p] (bwd[p]) is the time to drive tour[0..p] forwards (backwards)
+		fwd = np.concatenate(([0.0], np.cumsum(self.cost[tour[:-1], tour[1:]])))
+		bwd = np.concatenate(([0.0], np.cumsum(self.cost[tour[1:], tour[:-1]])))
+
+		i = np.arange(0, L-2)[:, None]
+		j = np.arange(0, L-1)[None, :]
+		valid = (j >= i+2)
+		i = np.broadcast_to(i, valid.shape)[valid]
+		j = np.broadcast_to(j, valid.shape)[valid]
+
+		delta = self.cost[tour[i], tour[j]] + self.cost[tour[i+1], tour[j+1]] - self.cost[tour[i], tour[i+1]] - self.cost[tour[j], tour[j+1]]
+		delta += (bwd[j] - bwd[i+1]) - (fwd[j] - fwd[i+1])
+
+		best = int(np.argmin(delta))
+		if (delta[best] >= -IMPROVEMENT_TOL):
+			return None
+
+		[i, j] = [i[best], j[best]]
+		return np.concatenate((tour[:i+1], tour[j:i:-1], tour[j+1:]))
+
+	def orOpt(self, tour):
+		# Find the best move that relocates tour[s..s+length-1] (possibly reversed) between two other nodes.
+		# Returns the new tour, or None if there's no improving move.
+		L = len(tour)
+
+		fwd = np.concatenate(([0.0], np.cumsum(self.cost[tour[:-1], tour[1:]])))
+		bwd = np.concatenate(([0.0], np.cumsum(self.cost[tour[1:], tour[:-1]])))
+
+		# Arc p goes from tour[p] to tour[p+1]:
+		arcFrom = tour[:-1]
+		arcTo = tour[1:]
+		arcCost = self.cost[arcFrom, arcTo]
+		positions = np.arange(0, L-1)
+
+		bestDelta = -IMPROVEMENT_TOL
+		bestMove = None
+		for length in range(1, OR_OPT_MAX_LENGTH+1):
+			for s in range(1, L-length):
+				e = s + length - 1
+				[first, last] = [tour[s], tour[e]]
+				[prev, nxt] = [tour[s-1], tour[e+1]]
+
+				removeDelta = self.cost[prev, nxt] - self.cost[prev, first] - self.cost[last, nxt]
+				reverseDelta = (bwd[e] - bwd[s]) - (fwd[e] - fwd[s])
+
+				# We can't insert the segment into the arcs that touch it:
+				valid = (positions < s-1) | (positions > e)
+
+				insertDelta = self.cost[arcFrom, first] + self.cost[last, arcTo] - arcCost
+				insertReversedDelta = self.cost[arcFrom, last] + self.cost[first, arcTo] - arcCost + reverseDelta
+
+				for [reverse, tmpDelta] in [[False, insertDelta], [True, insertReversedDelta]]:
+					tmpDelta = np.where(valid, tmpDelta, np.inf)
+					p = int(np.argmin(tmpDelta))
+					if (removeDelta + tmpDelta[p] < bestDelta):
+						bestDelta = removeDelta + tmpDelta[p]
+						bestMove = [s, e, p, reverse]
+
+		if (bestMove is None):
+			return None
+
+		[s, e, p, reverse] = bestMove
+		segment = tour[s:e+1]
+		if (reverse):
+			segment = segment[::-1]
+		if (p < s):
+			return np.concatenate((tour[:p+1], segment, tour[p+1:s], tour[e+1:]))
+		else:
+			return np.concatenate((tour[:s], tour[e+1:p+1], segment, tour[p+1:]))
+
+	def solve(self, truckCustomers):
+		# Find a short tour from the depot (0), through truckCustomers, and back to the depot (c+1).
+		# Returns [myTour, objVal], in the same format as tspEngine.solve().
+		if (len(truckCustomers) == 0):
+			# Truck isn't used
+			return ([0, self.c+1], 0.0)
+
+		customers = sorted([self.index[j] for j in truckCustomers])
+
+		# Phase I usually asks for tours that differ from the previous one by a few customers,
+		# so we also improve the previous tour, and keep whichever local optimum is shorter:
+		tour = self.improve(self.nearestNeighbor(customers))
+		if (self.prevTour is not None):
+			tmpTour = self.improve(self.fromPrevious(set(customers)))
+			if (self.cost[tmpTour[:-1], tmpTour[1:]].sum() < self.cost[tour[:-1], tour[1:]].sum()):
+				tour = tmpTour
+
+		self.prevTour = tour.tolist()
+
+		myTour = [self.N_zero[a] for a in tour.tolist()]
+
+		objVal = 0.0
+		for myIndex in range(1,len(myTour)-1):
+			objVal += self.cost[self.index[myTour[myIndex-1]]][self.index[myTour[myIndex]]] + self.sigma[myTour[myIndex]]
+		objVal += self.cost[self.index[myTour[-2]]][0]
+
+		myTour[-1] = self.c+1
+
+		return (myTour, objVal)
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+
+# This file contains functions for grouping vehicles into "vehicle classes".
+#
+# Vehicles with identical kinematic parameters have identical travel matrices.
+# If they also have the same battery and capacity, they have identical endurance
+# tables (and identical sets of feasible sorties).
+# Rather than building these tables once per vehicle, we build them once per class,
+# and let every member of the class share the same (read-only) table.
+
+
+def kinematicFingerprint(vehicle):
+	# Parameters that determine travel[v][i][j] (and tauprime[v][i][j]):
+	return (vehicle.vehicleType, vehicle.takeoffSpeed, vehicle.cruiseSpeed, vehicle.landingSpeed, vehicle.yawRateDeg, vehicle.cruiseAlt)
+
+
+def enduranceFingerprint(vehicle):
+	# Parameters that determine eee[v][i][j][k], eeePrime[v][i][k], and the sorties of v in P:
+	return kinematicFingerprint(vehicle) + (vehicle.batteryPower, vehicle.capacityLbs, vehicle.flightRange)
+
+
+class vehicleClasses:
+	def __init__(self, vehicle, fingerprint=kinematicFingerprint):
+		# Group the vehicles in vehicle[vehicleID] by their fingerprint.
+		# The first (lowest) vehicleID in each class is the class representative.
+		self.classOf 	= {}	# classOf[vehicleID] = fingerprint
+		self.members 	= {}	# members[fingerprint] = [vehicleID, ...]
+
+		for vehicleID in sorted(vehicle):
+			myFingerprint = fingerprint(vehicle[vehicleID])
+			self.classOf[vehicleID] = myFingerprint
+			if (myFingerprint not in self.members):
+				self.members[myFingerprint] = []
+			self.members[myFingerprint].append(vehicleID)
+
+	def representative(self, vehicleID):
+		# Which vehicle owns the tables that vehicleID shares?
+		return self.members[self.classOf[vehicleID]][0]
+
+	def isRepresentative(self, vehicleID):
+		return (self.representative(vehicleID) == vehicleID)
+
+	def numClasses(self):
+		return len(self.members)